@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Company, Category, ClassificationKeyword, Transaction, ProcessingLog
+from django.db.models import Q
+from .models import Company, Category, ClassificationKeyword, Transaction, ProcessingLog, ImportJob, DescriptionMemo
+from .search import description_search_q
 
 @admin.register(Company)
 class CompanyAdmin(admin.ModelAdmin):
@@ -50,27 +52,45 @@ class TransactionAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+    
+    def get_search_results(self, request, queryset, search_term):
+        """적요는 전문 검색 인덱스로, 회사/계정과목명은 해당 ID 목록으로 검색 (거래 테이블 전체 LIKE 방지)"""
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        
+        condition = description_search_q(search_term)
+        company_ids = list(Company.objects.filter(company_name__icontains=search_term).values_list('pk', flat=True))
+        if company_ids:
+            condition |= Q(company_id__in=company_ids)
+        category_ids = list(Category.objects.filter(category_name__icontains=search_term).values_list('pk', flat=True))
+        if category_ids:
+            condition |= Q(category_id__in=category_ids)
+        return queryset.filter(condition), False
 
 @admin.register(ProcessingLog)
 class ProcessingLogAdmin(admin.ModelAdmin):
     list_display = [
-        'log_id', 'process_type', 'file_name', 'records_processed',
-        'records_successful', 'records_failed', 'created_at'
+        'log_id', 'process_type', 'status', 'file_name', 'records_processed',
+        'records_successful', 'records_failed', 'rows_per_second', 'created_at'
     ]
-    list_filter = ['process_type', 'created_at']
+    list_filter = ['process_type', 'status', 'created_at']
     search_fields = ['file_name', 'error_message']
     ordering = ['-created_at']
     readonly_fields = ['created_at']
     
     fieldsets = (
         ('처리 정보', {
-            'fields': ('process_type', 'file_name')
+            'fields': ('process_type', 'status', 'file_name')
         }),
         ('결과 정보', {
-            'fields': ('records_processed', 'records_successful', 'records_failed')
+            'fields': ('records_processed', 'records_successful', 'records_failed', 'records_skipped', 'records_flagged')
+        }),
+        ('성능 정보', {
+            'fields': ('duration_seconds', 'rows_per_second', 'metrics')
         }),
         ('오류 정보', {
-            'fields': ('error_message',),
+            'fields': ('error_message', 'error_details'),
             'classes': ('collapse',)
         }),
         ('시스템 정보', {
@@ -78,3 +98,19 @@ class ProcessingLogAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ['job_id', 'file_name', 'import_mode', 'status', 'worker', 'created_at', 'finished_at']
+    list_filter = ['status', 'import_mode']
+    search_fields = ['file_name']
+    ordering = ['-job_id']
+    readonly_fields = ['created_at', 'started_at', 'finished_at']
+
+@admin.register(DescriptionMemo)
+class DescriptionMemoAdmin(admin.ModelAdmin):
+    list_display = ['description', 'keyword', 'created_at']
+    list_filter = ['keyword__category']
+    search_fields = ['description']
+    ordering = ['description']
+    readonly_fields = ['description_hash', 'description', 'keyword', 'created_at']
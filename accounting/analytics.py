@@ -0,0 +1,406 @@
+import logging
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Company, Category, Transaction
+from .versions import DATA_VERSION, DELETES_VERSION, get_version
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+COLUMN_DTYPES = {
+    'transaction_id': np.int64,
+    'day': np.int32,
+    'month': np.int32,
+    'company': np.int32,
+    'category': np.int32,
+    'type': np.int8,
+    'amount': np.int64,
+}
+COLUMNS = list(COLUMN_DTYPES)
+TYPE_CODES = {'income': 0, 'expense': 1}
+# net: 입금 - 출금, income/expense: 해당 유형 금액 합계, count: 건수
+METRICS = ['net', 'income', 'expense', 'count']
+DIMENSIONS = ['company', 'category', 'month', 'day', 'type']
+EPOCH = date(1970, 1, 1)
+
+_loaded = None
+_loaded_lock = threading.Lock()
+
+
+class Snapshot:
+    """거래 내역 컬럼형 스냅샷 (각 컬럼은 메모리 매핑된 NumPy 배열, 거래 ID 순)
+
+    - day: 1970-01-01부터의 일수 (현재 시간대 기준)
+    - month: 연도 * 12 + (월 - 1)
+    - company/category: 코드 (-1은 없음), 코드 -> ID 목록은 meta에 저장
+    - amount: 원 단위 금액 * 100 (정수)
+    """
+
+    def __init__(self, columns, meta):
+        self.columns = columns
+        self.meta = meta
+
+    def __len__(self):
+        return len(self.columns['transaction_id'])
+
+    @property
+    def company_ids(self):
+        return self.meta['company_ids']
+
+    @property
+    def category_ids(self):
+        return self.meta['category_ids']
+
+
+def _snapshot_dir():
+    return getattr(settings, 'ANALYTICS_SNAPSHOT_DIR', os.path.join(settings.BASE_DIR, 'media', 'analytics'))
+
+
+def _pointer_path():
+    return os.path.join(_snapshot_dir(), 'current.json')
+
+
+def _encode_rows(rows, company_codes, category_codes, company_ids, category_ids):
+    """조회 행 목록을 컬럼 배열로 변환 (새 회사/계정과목은 코드 사전에 추가)"""
+    tz = timezone.get_current_timezone()
+    count = len(rows)
+    columns = {column: np.empty(count, dtype=dtype) for column, dtype in COLUMN_DTYPES.items()}
+    
+    def code_of(codes, ids, value):
+        if value is None:
+            return -1
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(ids)
+            ids.append(value)
+        return code
+    
+    for position, (transaction_id, transaction_date, company_id, category_id, transaction_type, amount) in enumerate(rows):
+        local = transaction_date.astimezone(tz).date()
+        columns['transaction_id'][position] = transaction_id
+        columns['day'][position] = (local - EPOCH).days
+        columns['month'][position] = local.year * 12 + local.month - 1
+        columns['company'][position] = code_of(company_codes, company_ids, company_id)
+        columns['category'][position] = code_of(category_codes, category_ids, category_id)
+        columns['type'][position] = TYPE_CODES.get(transaction_type, 1)
+        columns['amount'][position] = int(amount * 100)
+    return columns
+
+
+def _iter_encoded(queryset, meta, chunk_size=20000):
+    """조회 결과를 청크 단위 컬럼 배열로 변환 (거래 ID 순, 새 회사/계정과목은 meta 코드 목록에 추가)"""
+    company_ids = meta['company_ids']
+    category_ids = meta['category_ids']
+    company_codes = {value: code for code, value in enumerate(company_ids)}
+    category_codes = {value: code for code, value in enumerate(category_ids)}
+    
+    rows = []
+    values = queryset.order_by('transaction_id').values_list(
+        'transaction_id', 'transaction_date', 'company_id', 'category_id', 'transaction_type', 'amount'
+    )
+    for row in values.iterator(chunk_size=chunk_size):
+        rows.append(row)
+        if len(rows) >= chunk_size:
+            yield _encode_rows(rows, company_codes, category_codes, company_ids, category_ids)
+            rows = []
+    if rows:
+        yield _encode_rows(rows, company_codes, category_codes, company_ids, category_ids)
+
+
+def _fetch(queryset, meta):
+    """조회 결과 전체를 컬럼 배열로 (변경된 거래처럼 적은 행에 사용)"""
+    parts = list(_iter_encoded(queryset, meta))
+    if not parts:
+        return {column: np.empty(0, dtype=dtype) for column, dtype in COLUMN_DTYPES.items()}
+    return {column: np.concatenate([part[column] for part in parts]) for column in COLUMNS}
+
+
+def _column_path(version_dir, column):
+    return os.path.join(version_dir, f'{column}.bin')
+
+
+def _map_column(version_dir, column, row_count, mode='r'):
+    """컬럼 파일 앞 row_count 행을 메모리 매핑 (이후에 이어 쓴 행은 보이지 않음)"""
+    dtype = COLUMN_DTYPES[column]
+    if not row_count:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(_column_path(version_dir, column), dtype=dtype, mode=mode, shape=(row_count,))
+
+
+def _append_rows(version_dir, meta, queryset):
+    """조회 결과를 컬럼 파일 끝에 이어 쓰고 meta의 행 수/최대 거래 ID 갱신
+
+    중단된 이전 쓰기의 꼬리는 먼저 잘라내므로 파일은 항상 meta의 행 수에서 이어집니다.
+    """
+    with ExitStack() as stack:
+        files = {}
+        for column, dtype in COLUMN_DTYPES.items():
+            files[column] = stack.enter_context(open(_column_path(version_dir, column), 'ab'))
+            files[column].truncate(meta['row_count'] * np.dtype(dtype).itemsize)
+        for part in _iter_encoded(queryset, meta):
+            for column in COLUMNS:
+                files[column].write(part[column].tobytes())
+            meta['row_count'] += len(part['transaction_id'])
+            meta['max_transaction_id'] = int(part['transaction_id'][-1])
+
+
+def _write_pointer(meta):
+    """포인터 파일(현재 버전과 meta)을 원자적으로 교체"""
+    pointer_tmp = _pointer_path() + '.tmp'
+    with open(pointer_tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(pointer_tmp, _pointer_path())
+
+
+@contextmanager
+def _refresh_lock():
+    """스냅샷 갱신은 한 프로세스씩 (fcntl이 없으면 잠그지 않음)"""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(_snapshot_dir(), '.lock'), 'w') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def load_snapshot():
+    """현재 스냅샷을 메모리 매핑으로 열기 (포인터의 meta가 바뀌었을 때만 다시 엶, 없으면 None)"""
+    global _loaded
+    try:
+        with open(_pointer_path(), encoding='utf-8') as f:
+            meta = json.load(f)
+        version_dir = os.path.join(_snapshot_dir(), meta['version'])
+        row_count = meta['row_count']
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+    
+    with _loaded_lock:
+        if _loaded is not None and _loaded.meta == meta:
+            return _loaded
+        try:
+            columns = {column: _map_column(version_dir, column, row_count) for column in COLUMNS}
+        except FileNotFoundError:
+            return _loaded
+        _loaded = Snapshot(columns, meta)
+        return _loaded
+
+
+def _build_snapshot(meta):
+    """새 버전 디렉터리에 전체 거래를 쓰고, 포인터 교체 후 이전 버전 정리"""
+    base_dir = _snapshot_dir()
+    version = f"v{int(time.time() * 1000)}"
+    version_dir = os.path.join(base_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+    
+    meta.update(version=version, company_ids=[], category_ids=[], row_count=0, max_transaction_id=0)
+    _append_rows(version_dir, meta, Transaction.objects.all())
+    _write_pointer(meta)
+    
+    # 이전 버전 정리 (이미 매핑 중인 프로세스는 삭제된 파일도 계속 읽을 수 있음)
+    for name in os.listdir(base_dir):
+        path = os.path.join(base_dir, name)
+        if name.startswith('v') and name != version and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _safety_margin():
+    """증분 갱신 시 이전 갱신 시각보다 앞당겨 다시 읽는 시간 (갱신 중 진행 중이던 쓰기 트랜잭션 대비)"""
+    return timedelta(seconds=getattr(settings, 'ANALYTICS_SNAPSHOT_SAFETY_MARGIN', 600))
+
+
+def _update_snapshot(snapshot, meta):
+    """변경된 거래는 제자리 수정, 새 거래는 파일 끝에 추가 (기존 행은 다시 쓰지 않음)
+
+    updated_at은 커밋 전에 기록되므로 이전 갱신 시각에서 안전 여유만큼 앞당겨 다시 읽습니다.
+    스냅샷 최대 ID 이하인데 스냅샷에 없는 거래(ID 순서와 다르게 늦게 커밋된 거래)가 보이면
+    제자리에 끼워 넣을 수 없으므로 아무것도 쓰지 않고 False를 반환합니다 (전체 재생성).
+    """
+    version_dir = os.path.join(_snapshot_dir(), meta['version'])
+    since = datetime.fromisoformat(snapshot.meta['refreshed_at']) - _safety_margin()
+    changed = _fetch(Transaction.objects.filter(
+        updated_at__gte=since,
+        transaction_id__lte=meta['max_transaction_id']
+    ), meta)
+    
+    # 변경된 거래는 ID 정렬 배열에서 위치를 찾아 해당 위치만 덮어씀
+    changed_ids = changed['transaction_id']
+    if len(changed_ids):
+        ids = snapshot.columns['transaction_id']
+        positions = np.searchsorted(ids, changed_ids)
+        found = positions < len(ids)
+        found[found] = ids[positions[found]] == changed_ids[found]
+        if not found.all():
+            return False
+        for column in COLUMNS:
+            mapped = _map_column(version_dir, column, meta['row_count'], mode='r+')
+            mapped[positions] = changed[column]
+            mapped.flush()
+            del mapped
+    
+    _append_rows(version_dir, meta, Transaction.objects.filter(transaction_id__gt=meta['max_transaction_id']))
+    _write_pointer(meta)
+    return True
+
+
+def refresh_snapshot(full=False):
+    """스냅샷 갱신
+
+    장부 데이터 버전(쓰기 트랜잭션 안에서 증가)이 마지막 갱신 때와 같으면 아무것도 하지 않습니다.
+    새 거래는 컬럼 파일 끝에 이어 쓰고 변경된 거래(updated_at 기준)는 해당 위치만 수정합니다.
+    마지막 갱신 이후 거래 삭제나 회사/계정과목 삭제(거래의 FK가 updated_at 없이 NULL로 바뀜)가 있었거나
+    (삭제 카운터 변경) 늦게 커밋된 거래가 보이면 새 버전으로 전체 재생성합니다.
+    """
+    os.makedirs(_snapshot_dir(), exist_ok=True)
+    with _refresh_lock():
+        # 조회보다 먼저 읽어 두므로 조회 중 변경/삭제가 있으면 다음 갱신에서 반영됨
+        meta = {
+            'refreshed_at': timezone.now().isoformat(),
+            'data_version': get_version(DATA_VERSION),
+            'delete_version': get_version(DELETES_VERSION),
+        }
+        snapshot = None if full else load_snapshot()
+        if snapshot is not None and snapshot.meta.get('delete_version') == meta['delete_version']:
+            if snapshot.meta.get('data_version') == meta['data_version']:
+                # 이전 갱신 시각을 그대로 두어 다음 증분 갱신이 같은 기준에서 다시 읽도록 함
+                return snapshot
+            incremental = dict(
+                snapshot.meta, **meta,
+                company_ids=list(snapshot.company_ids),
+                category_ids=list(snapshot.category_ids)
+            )
+            if _update_snapshot(snapshot, incremental):
+                meta = incremental
+        # 증분 갱신을 하지 않았거나 실패한 경우 (meta에 버전이 없음)
+        if 'version' not in meta:
+            _build_snapshot(meta)
+    logger.info("분석 스냅샷 갱신: %d행 (%s)", meta['row_count'], meta['version'])
+    return load_snapshot()
+
+
+def refresh_snapshot_if_present():
+    """스냅샷을 사용 중인 경우에만 증분 갱신 (가져오기/분류 후 호출)"""
+    if os.path.exists(_pointer_path()):
+        refresh_snapshot()
+
+
+def get_snapshot():
+    """스냅샷 반환 (없으면 처음 한 번 생성)"""
+    return load_snapshot() or refresh_snapshot(full=True)
+
+
+def _mask(snapshot, date_from=None, date_to=None, company=None, category=None, transaction_type=None):
+    """필터 조건을 불리언 배열로 계산"""
+    columns = snapshot.columns
+    mask = np.ones(len(snapshot), dtype=bool)
+    if date_from:
+        mask &= columns['day'] >= (date_from - EPOCH).days
+    if date_to:
+        mask &= columns['day'] <= (date_to - EPOCH).days
+    if company:
+        code = snapshot.company_ids.index(company) if company in snapshot.company_ids else -2
+        mask &= columns['company'] == code
+    if category:
+        code = snapshot.category_ids.index(category) if category in snapshot.category_ids else -2
+        mask &= columns['category'] == code
+    if transaction_type:
+        mask &= columns['type'] == TYPE_CODES[transaction_type]
+    return mask
+
+
+def _dimension_codes(snapshot, dimension, mask):
+    """차원별 (0부터 시작하는 코드 배열, 라벨 목록)"""
+    values = np.asarray(snapshot.columns[dimension])[mask]
+    
+    if dimension in ('company', 'category'):
+        ids = snapshot.company_ids if dimension == 'company' else snapshot.category_ids
+        model = Company if dimension == 'company' else Category
+        name_field = 'company_name' if dimension == 'company' else 'category_name'
+        names = dict(model.objects.filter(pk__in=ids).values_list('pk', name_field))
+        labels = [names.get(value, value) for value in ids] + ['미분류']
+        return np.where(values < 0, len(ids), values).astype(np.int64), labels
+    
+    if dimension == 'type':
+        return values.astype(np.int64), ['income', 'expense']
+    
+    if not len(values):
+        return values.astype(np.int64), []
+    low, high = int(values.min()), int(values.max())
+    if dimension == 'month':
+        labels = [f'{month // 12:04d}-{month % 12 + 1:02d}' for month in range(low, high + 1)]
+    else:
+        labels = [(EPOCH + timedelta(days=day)).isoformat() for day in range(low, high + 1)]
+    return (values - low).astype(np.int64), labels
+
+
+def _metric_weights(snapshot, metric, mask):
+    """np.bincount 가중치 (count는 None): net은 입금 +, 출금 -, income/expense는 해당 유형만"""
+    if metric == 'count':
+        return None
+    amounts = np.asarray(snapshot.columns['amount'])[mask] / 100.0
+    types = np.asarray(snapshot.columns['type'])[mask]
+    if metric == 'net':
+        return np.where(types == TYPE_CODES['income'], amounts, -amounts)
+    return np.where(types == TYPE_CODES[metric], amounts, 0.0)
+
+
+def pivot(rows, columns, metric='net', **filters):
+    """rows × columns 피벗 (np.bincount 기반 벡터화 group-by)"""
+    snapshot = get_snapshot()
+    mask = _mask(snapshot, **filters)
+    row_codes, row_labels = _dimension_codes(snapshot, rows, mask)
+    column_codes, column_labels = _dimension_codes(snapshot, columns, mask)
+    
+    size = len(row_labels) * len(column_labels)
+    if size == 0:
+        return {'rows': row_labels, 'columns': column_labels, 'values': [], 'row_count': 0}
+    
+    cells = np.bincount(
+        row_codes * len(column_labels) + column_codes,
+        weights=_metric_weights(snapshot, metric, mask),
+        minlength=size
+    ).reshape(len(row_labels), len(column_labels))
+    
+    values = cells.astype(np.int64) if metric == 'count' else np.round(cells).astype(np.int64)
+    return {
+        'rows': row_labels,
+        'columns': column_labels,
+        'values': values.tolist(),
+        'row_count': int(mask.sum()),
+        'snapshot_version': snapshot.meta['version'],
+    }
+
+
+def top_n(by, n=10, metric='net', **filters):
+    """차원별 합계/건수 상위 N개 (net은 순입금이 큰 순, 지출 상위는 metric='expense')"""
+    snapshot = get_snapshot()
+    mask = _mask(snapshot, **filters)
+    codes, labels = _dimension_codes(snapshot, by, mask)
+    if not labels:
+        return {'items': [], 'snapshot_version': snapshot.meta['version']}
+    
+    totals = np.bincount(codes, weights=_metric_weights(snapshot, metric, mask), minlength=len(labels))
+    order = np.argsort(-totals, kind='stable')[:n]
+    return {
+        'items': [
+            {'label': labels[code], 'value': int(round(totals[code]))}
+            for code in order if totals[code]
+        ],
+        'snapshot_version': snapshot.meta['version'],
+    }
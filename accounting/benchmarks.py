@@ -0,0 +1,124 @@
+import os
+import statistics
+import tempfile
+import time
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import DescriptionMemo, ProcessingLog, Transaction
+from .importer import iter_csv_chunks, import_transactions
+from .classifier import classify_transactions
+from .memo import clear_description_lru
+from .cache import bump_data_version
+from .synthetic import write_ledger_csv
+
+
+def _timed_request(client, url, params=None):
+    """요청 한 번의 (상태 코드, 소요 ms, SQL 쿼리 수, 응답)"""
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        response = client.get(url, params or {})
+        elapsed = (time.perf_counter() - started) * 1000
+    return response.status_code, elapsed, len(queries), response
+
+
+def _request_stats(client, url, params=None, repeat=3):
+    """캐시가 비어 있을 때(cold) 한 번, 채워진 뒤(warm) repeat번 측정"""
+    bump_data_version()
+    status, cold_ms, cold_queries, _ = _timed_request(client, url, params)
+    warm = [_timed_request(client, url, params) for _ in range(repeat)]
+    return {
+        'status': status,
+        'cold_ms': round(cold_ms, 2),
+        'cold_queries': cold_queries,
+        'warm_ms': round(statistics.median(elapsed for _, elapsed, _, _ in warm), 2),
+        'warm_queries': warm[-1][2],
+    }
+
+
+def _listing_stats(client, pages=10, page_size=100):
+    """거래 목록 첫 페이지부터 next 링크를 따라 pages개 페이지 측정"""
+    url = reverse('transaction-list')
+    params = {'page_size': page_size}
+    timings = []
+    queries = []
+    status = None
+    for _ in range(pages):
+        status, elapsed, query_count, response = _timed_request(client, url, params)
+        timings.append(elapsed)
+        queries.append(query_count)
+        next_link = response.json().get('next') if status == 200 else None
+        if not next_link:
+            break
+        url, params = next_link, None
+    return {
+        'status': status,
+        'pages': len(timings),
+        'page_size': page_size,
+        'first_page_ms': round(timings[0], 2),
+        'median_page_ms': round(statistics.median(timings), 2),
+        'max_queries': max(queries),
+    }
+
+
+def _throughput(rows, seconds):
+    return round(rows / seconds, 1) if seconds > 0 else None
+
+
+def benchmark_scale(rows, workdir, hit_rate=0.8, seed=42, repeat=3, pages=10):
+    """한 규모(행 수)에 대해 CSV 가져오기, 분류, 요약 API, 대시보드, 거래 목록을 측정"""
+    result = {'rows': rows, 'hit_rate': hit_rate, 'seed': seed}
+    
+    # 입력 파일 생성 (측정 대상 아님)
+    path = os.path.join(workdir, f'ledger_{rows}.csv')
+    started = time.perf_counter()
+    write_ledger_csv(path, rows, hit_rate=hit_rate, seed=seed)
+    result['generate_seconds'] = round(time.perf_counter() - started, 3)
+    
+    # 규모마다 같은 조건에서 시작 (분류 메모 비우기)
+    DescriptionMemo.objects.all().delete()
+    clear_description_lru()
+    
+    # CSV 가져오기 (전체 교체)
+    log = ProcessingLog.objects.create(process_type='import', file_name=os.path.basename(path))
+    started = time.perf_counter()
+    import_transactions(iter_csv_chunks(path), log, mode='replace')
+    elapsed = time.perf_counter() - started
+    result['import'] = {
+        'seconds': round(elapsed, 3),
+        'rows_per_second': _throughput(rows, elapsed),
+        'successful': log.records_successful,
+        'failed': log.records_failed,
+        'flagged': log.records_flagged,
+    }
+    
+    # 자동 분류
+    started = time.perf_counter()
+    classification_log = classify_transactions()
+    elapsed = time.perf_counter() - started
+    result['classify'] = {
+        'seconds': round(elapsed, 3),
+        'rows_per_second': _throughput(rows, elapsed),
+        'successful': classification_log.records_successful,
+        'failed': classification_log.records_failed,
+        'memo_hit_rate': classification_log.metrics['description_memo']['hit_rate'],
+    }
+    
+    client = Client()
+    result['api_summary'] = _request_stats(client, reverse('api_summary'), repeat=repeat)
+    result['api_summary_ledger'] = _request_stats(client, reverse('api_summary'), {'source': 'ledger'}, repeat=repeat)
+    result['dashboard'] = _request_stats(client, reverse('dashboard'), repeat=repeat)
+    result['transactions_list'] = _listing_stats(client, pages=pages)
+    result['stored_rows'] = Transaction.objects.count()
+    
+    os.remove(path)
+    return result
+
+
+def run_benchmarks(scales, workdir=None, **options):
+    """여러 규모를 차례로 측정 (규모마다 전체 교체 가져오기로 시작)"""
+    with tempfile.TemporaryDirectory(dir=workdir) as tempdir:
+        return [benchmark_scale(rows, tempdir, **options) for rows in scales]
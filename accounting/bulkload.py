@@ -0,0 +1,135 @@
+import io
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import Transaction, description_hash
+from .rollups import RollupDeltas
+
+# COPY로 임시 테이블에 넣는 컬럼 (정규화된 청크 컬럼과 같은 이름)
+STAGING_COLUMNS = [
+    'transaction_date', 'description', 'income_amount', 'expense_amount', 'balance_after',
+    'branch_name', 'transaction_type', 'amount', 'fingerprint', 'description_hash',
+]
+STAGING_TABLE = 'import_staging'
+
+
+def copy_supported(using=connection):
+    """COPY 기반 저장 사용 여부 (PostgreSQL이고 IMPORT_USE_COPY 설정이 켜져 있을 때)"""
+    return using.vendor == 'postgresql' and getattr(settings, 'IMPORT_USE_COPY', True)
+
+
+def executemany_supported(using=connection):
+    """executemany 기반 저장 사용 여부 (SQLite이고 IMPORT_USE_EXECUTEMANY 설정이 켜져 있을 때)"""
+    return using.vendor == 'sqlite' and getattr(settings, 'IMPORT_USE_EXECUTEMANY', True)
+
+
+def executemany_insert_transactions(new_rows):
+    """SQLite: 중복을 제외한 정규화 청크를 컬럼 단위로 DB 값으로 변환해 executemany 한 번으로 저장
+
+    bulk_create의 모델 인스턴스 생성과 행·필드별 값 변환(DecimalField 반올림, 시간대 변환)을
+    생략하고 같은 결과 문자열을 pandas로 만듭니다. 중복 판별 키 충돌은 INSERT OR IGNORE로 건너뜁니다.
+    반환값: 실제로 저장된 건수 (sqlite3의 executemany rowcount는 모든 행의 변경 건수 합계)
+    """
+    if new_rows.empty:
+        return 0
+    
+    # DateTimeField: DB 시간대(UTC) 기준 naive 'YYYY-MM-DD HH:MM:SS', DecimalField: 소수점 2자리 문자열
+    dates = new_rows['transaction_date'].dt.tz_convert(connection.timezone).dt.strftime('%Y-%m-%d %H:%M:%S')
+    amount_format = '{:.2f}'.format
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    columns = {
+        'transaction_date': dates.tolist(),
+        'description': new_rows['description'].tolist(),
+        'income_amount': new_rows['income_amount'].map(amount_format).tolist(),
+        'expense_amount': new_rows['expense_amount'].map(amount_format).tolist(),
+        'balance_after': new_rows['balance_after'].map(amount_format).tolist(),
+        'branch_name': new_rows['branch_name'].tolist(),
+        'transaction_type': new_rows['transaction_type'].tolist(),
+        'amount': new_rows['amount'].map(amount_format).tolist(),
+        'fingerprint': new_rows['fingerprint'].tolist(),
+        'description_hash': new_rows['description'].map(description_hash).tolist(),
+    }
+    names = list(columns) + ['is_classified', 'created_at', 'updated_at']
+    constants = (False, now, now)
+    params = [values + constants for values in zip(*columns.values())]
+    
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT OR IGNORE INTO {Transaction._meta.db_table} ({', '.join(names)}) "
+            f"VALUES ({', '.join(['%s'] * len(names))})",
+            params
+        )
+        return cursor.rowcount
+
+
+def _create_staging_table(cursor):
+    """트랜잭션 종료 시 비워지는 세션 임시 테이블"""
+    cursor.execute(f"""
+        CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+            transaction_date timestamptz NOT NULL,
+            description varchar(200) NOT NULL,
+            income_amount numeric(15, 2) NOT NULL,
+            expense_amount numeric(15, 2) NOT NULL,
+            balance_after numeric(15, 2) NOT NULL,
+            branch_name varchar(100),
+            transaction_type varchar(10) NOT NULL,
+            amount numeric(15, 2) NOT NULL,
+            fingerprint varchar(64),
+            description_hash varchar(64) NOT NULL
+        ) ON COMMIT DELETE ROWS
+    """)
+
+
+def _copy_from_buffer(cursor, sql, buffer):
+    """psycopg 3 (cursor.copy) / psycopg2 (copy_expert) 모두 지원"""
+    raw_cursor = cursor.cursor
+    if hasattr(raw_cursor, 'copy'):
+        with raw_cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+    else:
+        raw_cursor.copy_expert(sql, buffer)
+
+
+def copy_insert_transactions(normalized):
+    """정규화된 청크를 COPY로 임시 테이블에 넣고, INSERT ... SELECT 한 번으로 저장
+
+    이미 있는 거래(중복 판별 키 충돌)는 ON CONFLICT DO NOTHING으로 건너뛰며,
+    실제로 저장된 행의 일자·유형별 합계를 RETURNING으로 받아 집계 증감으로 반환합니다.
+    반환값: (저장 건수, RollupDeltas)
+    트랜잭션 안에서 호출해야 합니다.
+    """
+    deltas = RollupDeltas()
+    if normalized.empty:
+        return 0, deltas
+    
+    frame = normalized.assign(description_hash=normalized['description'].map(description_hash))
+    buffer = io.StringIO()
+    frame[STAGING_COLUMNS].to_csv(buffer, header=False, index=False, na_rep='', date_format='%Y-%m-%d %H:%M:%S%z')
+    buffer.seek(0)
+    
+    table = Transaction._meta.db_table
+    columns = ', '.join(STAGING_COLUMNS)
+    with connection.cursor() as cursor:
+        _create_staging_table(cursor)
+        _copy_from_buffer(cursor, f"COPY {STAGING_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        cursor.execute(f"""
+            WITH inserted AS (
+                INSERT INTO {table} ({columns}, is_classified, created_at, updated_at)
+                SELECT {columns}, false, now(), now() FROM {STAGING_TABLE}
+                ON CONFLICT (fingerprint) DO NOTHING
+                RETURNING transaction_date, transaction_type, amount
+            )
+            SELECT (transaction_date AT TIME ZONE %s)::date, transaction_type, SUM(amount), COUNT(*)
+            FROM inserted
+            GROUP BY 1, 2
+        """, [settings.TIME_ZONE])
+        rows = cursor.fetchall()
+        cursor.execute(f"TRUNCATE {STAGING_TABLE}")
+    
+    inserted_count = 0
+    for day, transaction_type, amount, count in rows:
+        deltas.add(day, '', '', transaction_type, amount, count)
+        inserted_count += count
+    return inserted_count, deltas
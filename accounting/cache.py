@@ -0,0 +1,59 @@
+import hashlib
+import json
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .versions import DATA_VERSION, bump_version, get_version
+
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def get_data_version():
+    """현재 데이터 버전 (DB 카운터이므로 모든 프로세스가 같은 값을 봄)"""
+    return get_version(DATA_VERSION)
+
+
+def bump_data_version(**kwargs):
+    """가져오기/분류 등으로 데이터가 바뀌었음을 기록 (현재 트랜잭션과 함께 커밋)"""
+    bump_version(DATA_VERSION)
+
+
+def _record(hit):
+    with _stats_lock:
+        _stats['hits' if hit else 'misses'] += 1
+
+
+def cache_stats():
+    """캐시 적중/실패 횟수 (프로세스 단위)"""
+    with _stats_lock:
+        hits, misses = _stats['hits'], _stats['misses']
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total else None,
+        'data_version': get_data_version(),
+    }
+
+
+def get_or_build(name, builder, **params):
+    """데이터 버전과 파라미터로 키를 만들어 결과를 캐시 (TTL: SUMMARY_CACHE_TIMEOUT)"""
+    # 기본값(None) 파라미터는 키에서 제외하여 같은 요청이 같은 항목을 공유
+    key_params = {name: value for name, value in params.items() if value is not None}
+    params_key = hashlib.md5(
+        json.dumps(key_params, sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+    key = f'accounting:{name}:v{get_data_version()}:{params_key}'
+    
+    value = cache.get(key)
+    if value is not None:
+        _record(hit=True)
+        return value
+    
+    _record(hit=False)
+    value = builder(**params)
+    cache.set(key, value, timeout=getattr(settings, 'SUMMARY_CACHE_TIMEOUT', 300))
+    return value
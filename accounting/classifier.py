@@ -0,0 +1,441 @@
+import logging
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+import threading
+import time
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import ClassificationKeyword, Transaction, ProcessingLog
+from .cache import bump_data_version
+from .analytics import refresh_snapshot_if_present
+from .rollups import RollupDeltas, apply_rollup_deltas, local_date
+from .memo import DescriptionResolver, clear_description_lru
+from .versions import RULES_VERSION, get_version
+from .profiling import PipelineProfiler
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordMatcher:
+    """분류 키워드 다중 패턴 매처 (Aho-Corasick 오토마톤)
+
+    키워드는 ClassificationKeyword의 기본키 순서로 우선순위를 가지며,
+    적요에 여러 키워드가 포함되어 있으면 우선순위가 가장 높은 키워드가 선택됩니다.
+    (기존 '키워드를 순서대로 검사하여 첫 매칭 사용' 방식과 동일한 결과)
+    """
+
+    def __init__(self, entries):
+        # entries: (keyword, payload) 목록, 순서가 곧 우선순위
+        self.entries = list(entries)
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None]
+
+        for rank, (keyword, _) in enumerate(self.entries):
+            node = 0
+            for char in keyword:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                node = next_node
+            if self._best[node] is None or rank < self._best[node]:
+                self._best[node] = rank
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        """실패 링크를 구성하고, 각 노드의 최우선 출력을 실패 경로까지 합칩니다."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                candidate = self._goto[fail].get(char, 0)
+                self._fail[child] = candidate if candidate != child else 0
+                inherited = self._best[self._fail[child]]
+                if inherited is not None and (self._best[child] is None or inherited < self._best[child]):
+                    self._best[child] = inherited
+
+    def __len__(self):
+        return len(self.entries)
+
+    def match(self, text):
+        """적요를 한 번 스캔하여 최우선 매칭 키워드의 payload를 반환 (없으면 None)"""
+        if not text:
+            rank = self._best[0]
+            return self.entries[rank][1] if rank is not None else None
+
+        goto = self._goto
+        fail = self._fail
+        best_at = self._best
+        best = best_at[0]
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            rank = best_at[node]
+            if rank is not None and (best is None or rank < best):
+                best = rank
+                if best == 0:
+                    break
+
+        return self.entries[best][1] if best is not None else None
+
+
+# (분류 규칙 버전, 매처)
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def build_keyword_matcher():
+    """전체 분류 키워드로 매처를 생성"""
+    keywords = ClassificationKeyword.objects.select_related(
+        'category', 'category__company'
+    ).order_by('pk')
+    return KeywordMatcher((keyword_obj.keyword, keyword_obj) for keyword_obj in keywords)
+
+
+def get_keyword_matcher():
+    """캐시된 키워드 매처 반환
+
+    호출마다 DB의 분류 규칙 버전을 확인하여, 다른 프로세스(관리자 화면, API 등)에서
+    키워드/계정과목이 바뀌었으면 매처를 다시 만들고 프로세스 내 적요 LRU도 비웁니다.
+    """
+    global _matcher
+    version = get_version(RULES_VERSION)
+    cached = _matcher
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    with _matcher_lock:
+        if _matcher is None or _matcher[0] != version:
+            if _matcher is not None:
+                clear_description_lru()
+            _matcher = (version, build_keyword_matcher())
+        return _matcher[1]
+
+
+def invalidate_keyword_matcher(**kwargs):
+    """키워드/계정과목 변경 시 이 프로세스에 캐시된 매처 폐기 (다른 프로세스는 규칙 버전으로 감지)"""
+    global _matcher
+    with _matcher_lock:
+        _matcher = None
+
+
+def _write_assignments(assignments):
+    """분류 결과를 (회사, 계정과목, 매칭 키워드)별로 묶어 한 번의 UPDATE로 반영 (계정과목이 None이면 미분류로)"""
+    for (company_id, category_id, keyword_id), transaction_ids in assignments.items():
+        for start in range(0, len(transaction_ids), 500):
+            Transaction.objects.filter(transaction_id__in=transaction_ids[start:start + 500]).update(
+                company_id=company_id,
+                category_id=category_id,
+                matched_keyword_id=keyword_id,
+                is_classified=category_id is not None,
+                updated_at=timezone.now()
+            )
+
+
+def _target_queryset(reclassify_all):
+    """분류 대상 (기본: 미분류 거래, reclassify_all이면 전체 거래)"""
+    if reclassify_all:
+        return Transaction.objects.all()
+    return Transaction.objects.filter(is_classified=False)
+
+
+ROW_FIELDS = [
+    'transaction_id', 'description', 'transaction_date', 'transaction_type',
+    'amount', 'company_id', 'category_id', 'matched_keyword_id', 'is_classified'
+]
+
+
+def _iter_batches(queryset, batch_size, after_id=0):
+    """거래 ID 기준 keyset 배치 읽기"""
+    while True:
+        rows = list(
+            queryset.filter(transaction_id__gt=after_id)
+            .order_by('transaction_id')
+            .values_list(*ROW_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return
+        after_id = rows[-1][0]
+        yield rows
+
+
+def _classify_rows(rows, resolver, assignments, deltas):
+    """배치 하나를 매칭하여 assignments/deltas에 누적하고 (성공, 실패) 건수 반환"""
+    matched = 0
+    unmatched = 0
+    keyword_objs = resolver.resolve([row[1] for row in rows])
+    for row, keyword_obj in zip(rows, keyword_objs):
+        transaction_id, _, transaction_date, transaction_type, amount, company_id, category_id, keyword_id, is_classified = row
+        if keyword_obj is None:
+            unmatched += 1
+            # 다시 분류할 때 더 이상 매칭되지 않는 거래는 미분류로 되돌림
+            if is_classified:
+                assignments.setdefault((None, None, None), []).append(transaction_id)
+                deltas.move(local_date(transaction_date), transaction_type, amount, (company_id, category_id), (None, None))
+            continue
+        matched += 1
+        category = keyword_obj.category
+        new_key = (category.company_id, category.pk, keyword_obj.pk)
+        # 결과가 같은 거래는 다시 쓰지 않음
+        if is_classified and new_key == (company_id, category_id, keyword_id):
+            continue
+        assignments.setdefault(new_key, []).append(transaction_id)
+        deltas.move(local_date(transaction_date), transaction_type, amount, (company_id, category_id), new_key[:2])
+    return matched, unmatched
+
+
+def _shard_ranges(queryset, shard_size):
+    """대상 거래를 거래 ID 범위(shard_size 단위)로 분할"""
+    bounds = queryset.aggregate(first=Min('transaction_id'), last=Max('transaction_id'))
+    if bounds['first'] is None:
+        return []
+    return [
+        (start, min(start + shard_size - 1, bounds['last']))
+        for start in range(bounds['first'], bounds['last'] + 1, shard_size)
+    ]
+
+
+def _init_worker():
+    """작업 프로세스 초기화 (spawn 방식이면 Django 설정 로드, DB 연결은 프로세스마다 새로 생성)"""
+    if not apps.ready:
+        django.setup()
+
+
+def _classify_shard(shard):
+    """작업 프로세스: 거래 ID 범위 하나를 읽어 매칭만 수행하고 결과를 반환 (쓰기는 부모 프로세스)"""
+    start_id, end_id, reclassify_all, batch_size = shard
+    resolver = DescriptionResolver(get_keyword_matcher())
+    assignments = {}
+    deltas = RollupDeltas()
+    matched = 0
+    unmatched = 0
+    queryset = _target_queryset(reclassify_all).filter(transaction_id__lte=end_id)
+    try:
+        for rows in _iter_batches(queryset, batch_size, after_id=start_id - 1):
+            shard_matched, shard_unmatched = _classify_rows(rows, resolver, assignments, deltas)
+            matched += shard_matched
+            unmatched += shard_unmatched
+    finally:
+        connections.close_all()
+    return assignments, dict(deltas.entries), matched, unmatched, resolver.pending, resolver.stats
+
+
+def _classify_serial(queryset, resolver, batch_size, on_batch=None):
+    """단일 프로세스 분류 (전체를 하나의 트랜잭션으로 반영)
+
+    on_batch를 넘기면 배치마다 커밋한 뒤 호출합니다 (작업 하트비트가 다른 프로세스에 보이도록).
+    중간에 실패하면 커밋된 배치는 분류된 채 남고, 나머지는 다음 분류에서 이어서 처리됩니다.
+    """
+    success_count = 0
+    failed_count = 0
+    with transaction.atomic() if on_batch is None else nullcontext():
+        for rows in _iter_batches(queryset, batch_size):
+            assignments = {}
+            deltas = RollupDeltas()
+            matched, unmatched = _classify_rows(rows, resolver, assignments, deltas)
+            success_count += matched
+            failed_count += unmatched
+            with transaction.atomic(savepoint=False):
+                _write_assignments(assignments)
+                # 일별/월별 집계에서 이전 귀속 -> 새 계정과목으로 이동
+                apply_rollup_deltas(deltas)
+                resolver.flush()
+            if on_batch is not None:
+                on_batch()
+    return success_count, failed_count
+
+
+def _classify_parallel(queryset, resolver, reclassify_all, batch_size, workers, shard_size, on_batch=None):
+    """거래 ID 범위별로 작업 프로세스에서 매칭하고, 결과는 부모 프로세스에서 범위마다 일괄 반영"""
+    shards = [
+        (start_id, end_id, reclassify_all, batch_size)
+        for start_id, end_id in _shard_ranges(queryset, shard_size)
+    ]
+    # fork 시 매처(resolver 생성 시 만들어짐)를 물려받고, 부모의 DB 연결은 공유하지 않도록 닫음
+    connections.close_all()
+    
+    success_count = 0
+    failed_count = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        for assignments, delta_entries, matched, unmatched, pending, stats in executor.map(_classify_shard, shards):
+            success_count += matched
+            failed_count += unmatched
+            deltas = RollupDeltas()
+            deltas.merge(delta_entries)
+            resolver.merge(pending, stats)
+            with transaction.atomic():
+                _write_assignments(assignments)
+                apply_rollup_deltas(deltas)
+                resolver.flush()
+            if on_batch is not None:
+                on_batch()
+    return success_count, failed_count
+
+
+def classify_transactions(batch_size=None, workers=None, shard_size=None, reclassify_all=False, on_batch=None):
+    """거래 내역 자동 분류
+
+    workers가 2 이상이면 거래 ID 범위별로 여러 프로세스에서 병렬 매칭합니다.
+    reclassify_all이면 이미 분류된 거래도 현재 키워드로 다시 분류합니다.
+    on_batch()는 배치(병렬 분류는 ID 범위)를 커밋할 때마다 호출됩니다 (작업 하트비트 등).
+    """
+    batch_size = batch_size or getattr(settings, 'CLASSIFICATION_BATCH_SIZE', 500)
+    workers = workers or getattr(settings, 'CLASSIFICATION_WORKERS', 1)
+    shard_size = shard_size or getattr(settings, 'CLASSIFICATION_SHARD_SIZE', 50000)
+    # 분류 대상 조회
+    target_transactions = _target_queryset(reclassify_all)
+    total_count = target_transactions.count()
+    logger.info("분류 시작: 대상 거래 %d건 (작업 프로세스 %d개)", total_count, workers)
+    
+    # 처리 로그 시작
+    log = ProcessingLog.objects.create(
+        process_type='classification',
+        status='running',
+        records_processed=total_count
+    )
+    
+    started = time.perf_counter()
+    
+    # 단계별 시간 (병렬 분류 시 작업 프로세스의 SQL 시간은 제외됨)
+    profiler = PipelineProfiler()
+    with profiler.track():
+        try:
+            # 적요 분류 메모 (LRU -> 메모 테이블 -> 키워드 매처)
+            resolver = DescriptionResolver(get_keyword_matcher())
+            with profiler.stage('classify'):
+                if workers > 1 and total_count > shard_size:
+                    success_count, failed_count = _classify_parallel(
+                        target_transactions, resolver, reclassify_all, batch_size, workers, shard_size, on_batch
+                    )
+                else:
+                    success_count, failed_count = _classify_serial(
+                        target_transactions, resolver, batch_size, on_batch
+                    )
+        except Exception as e:
+            # 분류 결과는 트랜잭션 단위로 롤백되므로 실패를 기록하고 호출한 쪽에 알림
+            logger.exception("분류 오류: %s", e)
+            log.status = 'failed'
+            log.error_message = str(e)
+            log.duration_seconds = time.perf_counter() - started
+            log.save(update_fields=['status', 'error_message', 'duration_seconds'])
+            raise
+        
+        # 요약 캐시 무효화
+        with profiler.stage('cache'):
+            bump_data_version()
+        
+        elapsed = time.perf_counter() - started
+        
+        # 로그 업데이트
+        log.records_successful = success_count
+        log.records_failed = failed_count
+        log.duration_seconds = elapsed
+        log.rows_per_second = total_count / elapsed if elapsed > 0 else None
+        log.metrics = {'description_memo': resolver.metrics()}
+        log.status = 'completed'
+        log.save()
+        
+        # 분석 스냅샷을 사용 중이면 증분 갱신
+        with profiler.stage('snapshot'):
+            refresh_snapshot_if_present()
+    profiler.save(log)
+    
+    logger.info("분류 완료: 성공 %d건, 실패 %d건 (%.3f초)", success_count, failed_count, elapsed)
+    return log
+
+
+def unassign_transactions(transaction_ids, batch_size=500):
+    """지정한 거래를 미분류로 되돌리고 집계에서도 이동 (계정과목 삭제 전 호출)"""
+    transaction_ids = list(transaction_ids)
+    with transaction.atomic():
+        for start in range(0, len(transaction_ids), batch_size):
+            rows = Transaction.objects.filter(
+                transaction_id__in=transaction_ids[start:start + batch_size]
+            ).values_list('transaction_id', 'transaction_date', 'transaction_type', 'amount', 'company_id', 'category_id')
+            deltas = RollupDeltas()
+            unassigned = []
+            for transaction_id, transaction_date, transaction_type, amount, company_id, category_id in rows:
+                unassigned.append(transaction_id)
+                deltas.move(local_date(transaction_date), transaction_type, amount, (company_id, category_id), (None, None))
+            _write_assignments({(None, None, None): unassigned})
+            apply_rollup_deltas(deltas)
+
+
+def reclassify_transactions(transaction_ids=(), description_hashes=(), trigger=None, batch_size=None):
+    """지정한 거래(거래 ID 또는 적요 해시)만 현재 키워드로 다시 분류
+
+    키워드/계정과목 변경 시 영향받는 거래만 다시 평가하므로 비용이 원장 크기가 아닌 영향 범위에 비례합니다.
+    """
+    batch_size = batch_size or getattr(settings, 'CLASSIFICATION_BATCH_SIZE', 500)
+    
+    # 적요 해시 인덱스로 대상 거래 ID 수집
+    target_ids = set(transaction_ids)
+    description_hashes = list(description_hashes)
+    for start in range(0, len(description_hashes), batch_size):
+        target_ids.update(
+            Transaction.objects.filter(description_hash__in=description_hashes[start:start + batch_size])
+            .values_list('transaction_id', flat=True)
+        )
+    if not target_ids:
+        return None
+    target_ids = sorted(target_ids)
+    
+    log = ProcessingLog.objects.create(
+        process_type='classification',
+        records_processed=len(target_ids)
+    )
+    started = time.perf_counter()
+    resolver = DescriptionResolver(get_keyword_matcher())
+    success_count = 0
+    failed_count = 0
+    
+    with transaction.atomic():
+        for start in range(0, len(target_ids), batch_size):
+            rows = list(
+                Transaction.objects.filter(transaction_id__in=target_ids[start:start + batch_size])
+                .values_list(*ROW_FIELDS)
+            )
+            assignments = {}
+            deltas = RollupDeltas()
+            matched, unmatched = _classify_rows(rows, resolver, assignments, deltas)
+            success_count += matched
+            failed_count += unmatched
+            _write_assignments(assignments)
+            apply_rollup_deltas(deltas)
+            resolver.flush()
+    
+    # 요약 캐시 무효화
+    bump_data_version()
+    
+    elapsed = time.perf_counter() - started
+    log.records_successful = success_count
+    log.records_failed = failed_count
+    log.duration_seconds = elapsed
+    log.rows_per_second = len(target_ids) / elapsed if elapsed > 0 else None
+    log.metrics = {'trigger': trigger, 'description_memo': resolver.metrics()}
+    log.save()
+    
+    refresh_snapshot_if_present()
+    
+    logger.info(
+        "재분류 완료 (%s): 대상 %d건, 성공 %d건, 실패 %d건 (%.3f초)",
+        trigger, len(target_ids), success_count, failed_count, elapsed
+    )
+    return log
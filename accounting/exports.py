@@ -0,0 +1,140 @@
+import csv
+import io
+import json
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Transaction, ProcessingLog
+
+# (CSV 헤더, JSON 키, 조회 컬럼) - 앞 6개 컬럼은 가져오기 CSV와 같은 구성
+EXPORT_COLUMNS = [
+    ('거래일시', 'transaction_date', 'transaction_date'),
+    ('적요', 'description', 'description'),
+    ('입금액', 'income_amount', 'income_amount'),
+    ('출금액', 'expense_amount', 'expense_amount'),
+    ('거래후잔액', 'balance_after', 'balance_after'),
+    ('거래점', 'branch_name', 'branch_name'),
+    ('거래ID', 'transaction_id', 'transaction_id'),
+    ('거래유형', 'transaction_type', 'transaction_type'),
+    ('회사', 'company_name', 'company__company_name'),
+    ('계정과목', 'category_name', 'category__category_name'),
+    ('분류여부', 'is_classified', 'is_classified'),
+]
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'jsonl': ('application/x-ndjson; charset=utf-8', 'jsonl'),
+}
+AMOUNT_KEYS = {'income_amount', 'expense_amount', 'balance_after'}
+
+
+def _iter_rows(queryset, chunk_size):
+    """서버 측 커서로 조회하여 행을 (JSON 키 -> 값) dict로 변환"""
+    tz = timezone.get_current_timezone()
+    columns = [column for _, _, column in EXPORT_COLUMNS]
+    keys = [key for _, key, _ in EXPORT_COLUMNS]
+    rows = queryset.order_by('transaction_date', 'transaction_id').values_list(*columns)
+    for values in rows.iterator(chunk_size=chunk_size):
+        row = dict(zip(keys, values))
+        row['transaction_date'] = row['transaction_date'].astimezone(tz).strftime('%Y-%m-%d %H:%M:%S')
+        for key in AMOUNT_KEYS:
+            row[key] = int(row[key]) if row[key] else 0
+        yield row
+
+
+def _encode_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [row[key] if row[key] is not None else '' for _, key, _ in EXPORT_COLUMNS]
+        for row in rows
+    )
+    return buffer.getvalue()
+
+
+def _encode_jsonl(rows):
+    return ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+
+
+def _generate_export(queryset, export_format, log, chunk_size=None):
+    """필터링된 거래 내역을 청크 단위로 인코딩 (끝까지 보내지 못하면 보낸 건수까지만 기록하고 실패 처리)"""
+    chunk_size = chunk_size or getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+    encode = _encode_csv if export_format == 'csv' else _encode_jsonl
+    started = time.perf_counter()
+    exported = 0
+    
+    try:
+        if export_format == 'csv':
+            # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+            yield '\ufeff' + _encode_csv([{key: header for header, key, _ in EXPORT_COLUMNS}])
+        
+        batch = []
+        for row in _iter_rows(queryset, chunk_size):
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield encode(batch)
+                exported += len(batch)
+                batch = []
+        if batch:
+            yield encode(batch)
+            exported += len(batch)
+        
+        log.status = 'completed'
+    except GeneratorExit:
+        log.status = 'failed'
+        log.error_message = '내보내기 도중 클라이언트 연결이 종료되었습니다.'
+        raise
+    except Exception as e:
+        log.status = 'failed'
+        log.error_message = f'내보내기 오류: {e}'
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        log.records_processed = exported
+        log.records_successful = exported
+        log.duration_seconds = elapsed
+        log.rows_per_second = exported / elapsed if elapsed > 0 else None
+        log.save()
+
+
+class ExportStream:
+    """내보내기 스트림 (StreamingHttpResponse가 응답을 닫을 때 close() 호출)
+
+    제너레이터는 처음 next() 전에 닫히면 finally가 실행되지 않으므로,
+    첫 청크를 보내기 전에 응답이 닫힌 경우에는 여기서 처리 로그를 실패로 마무리합니다.
+    """
+
+    def __init__(self, queryset, export_format, log, chunk_size=None):
+        self.log = log
+        self._chunks = _generate_export(queryset, export_format, log, chunk_size)
+        self._started = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self._started = True
+        return next(self._chunks)
+
+    def close(self):
+        if not self._started:
+            self._started = True
+            self.log.status = 'failed'
+            self.log.error_message = '내보내기를 시작하기 전에 응답이 닫혔습니다.'
+            self.log.save(update_fields=['status', 'error_message'])
+        self._chunks.close()
+
+
+def stream_export(queryset, export_format, log, chunk_size=None):
+    """필터링된 거래 내역 스트리밍 (처리 로그에 건수/소요 시간과 완료/실패 기록)"""
+    return ExportStream(queryset, export_format, log, chunk_size)
+
+
+def create_export_log(export_format):
+    filename = f"transactions_{timezone.localtime().strftime('%Y%m%d_%H%M%S')}.{EXPORT_FORMATS[export_format][1]}"
+    return ProcessingLog.objects.create(
+        process_type='export',
+        file_name=filename,
+        status='running'
+    )
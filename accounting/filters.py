@@ -0,0 +1,63 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Transaction
+from .search import search_transactions
+
+
+def parse_date_param(params, name):
+    """YYYY-MM-DD 형식의 날짜 파라미터 파싱 (없으면 None)"""
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f'{name} 값은 YYYY-MM-DD 형식이어야 합니다: {value}')
+    return parsed
+
+
+def _local_day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+
+def filter_transactions(queryset, params):
+    """기간/회사/계정과목/유형/분류 여부/적요 검색(q) 필터 (거래일시는 범위 조건으로 인덱스 사용)
+
+    잘못된 값은 ValueError로 알립니다.
+    """
+    date_from = parse_date_param(params, 'date_from')
+    date_to = parse_date_param(params, 'date_to')
+    if date_from:
+        queryset = queryset.filter(transaction_date__gte=_local_day_start(date_from))
+    if date_to:
+        queryset = queryset.filter(transaction_date__lt=_local_day_start(date_to + timedelta(days=1)))
+    
+    company = params.get('company')
+    if company:
+        queryset = queryset.filter(company_id=company)
+    
+    category = params.get('category')
+    if category:
+        queryset = queryset.filter(category_id=category)
+    
+    transaction_type = params.get('transaction_type')
+    if transaction_type:
+        if transaction_type not in dict(Transaction.TRANSACTION_TYPES):
+            raise ValueError(f'transaction_type 값은 income 또는 expense 이어야 합니다: {transaction_type}')
+        queryset = queryset.filter(transaction_type=transaction_type)
+    
+    is_classified = params.get('is_classified')
+    if is_classified:
+        if is_classified.lower() not in ('true', 'false', '1', '0'):
+            raise ValueError(f'is_classified 값은 true 또는 false 이어야 합니다: {is_classified}')
+        queryset = queryset.filter(is_classified=is_classified.lower() in ('true', '1'))
+    
+    # 적요 부분 문자열 검색 (전문 검색 인덱스 사용)
+    queryset = search_transactions(queryset, params.get('q'))
+    
+    return queryset
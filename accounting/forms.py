@@ -1,6 +1,8 @@
 from django import forms
 from django.core.exceptions import ValidationError
 
+from .importer import IMPORT_MODES
+
 class TransactionUploadForm(forms.Form):
     file = forms.FileField(
         label='은행 거래 내역 CSV 파일',
@@ -11,6 +13,20 @@ class TransactionUploadForm(forms.Form):
             'required': True
         })
     )
+    import_mode = forms.ChoiceField(
+        label='가져오기 방식',
+        choices=IMPORT_MODES,
+        initial='incremental',
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    
+    run_async = forms.BooleanField(
+        label='백그라운드에서 처리',
+        help_text='대용량 파일은 작업으로 등록한 뒤 처리 로그에서 진행 상황을 확인할 수 있습니다',
+        required=False,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
     
     def clean_file(self):
         file = self.cleaned_data.get('file')
@@ -23,4 +39,7 @@ class TransactionUploadForm(forms.Form):
             if file.size > 10 * 1024 * 1024:
                 raise ValidationError('파일 크기는 10MB 이하여야 합니다.')
         
-        return file 
\ No newline at end of file
+        return file
+    
+    def clean_import_mode(self):
+        return self.cleaned_data.get('import_mode') or 'incremental'
@@ -0,0 +1,398 @@
+import logging
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import StagedTransaction, Transaction, description_hash
+from .cache import bump_data_version
+from .rollups import RollupDeltas, apply_rollup_deltas, clear_rollups, deltas_from_frame
+from .reconcile import BalanceChainChecker
+from .bulkload import (
+    copy_insert_transactions, copy_supported, executemany_insert_transactions, executemany_supported
+)
+from .profiling import PipelineProfiler
+from .versions import DELETES_VERSION, bump_version
+
+logger = logging.getLogger(__name__)
+
+
+def iter_csv_chunks(source, chunk_size=None):
+    """CSV 파일을 고정 크기 청크 단위로 읽기 (파일 크기와 무관하게 메모리 일정)"""
+    chunk_size = chunk_size or getattr(settings, 'IMPORT_CHUNK_SIZE', 5000)
+    return pd.read_csv(source, chunksize=chunk_size)
+
+
+CSV_COLUMNS = ['거래일시', '적요', '입금액', '출금액', '거래후잔액', '거래점']
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+DESCRIPTION_MAX_LENGTH = Transaction._meta.get_field('description').max_length
+
+IMPORT_MODES = [
+    ('incremental', '증분 가져오기 (이미 있는 거래는 건너뜀)'),
+    ('replace', '전체 교체 (기존 거래 내역 삭제 후 저장)'),
+]
+
+
+def normalize_chunk(chunk):
+    """청크 전체를 컬럼 단위로 정규화
+
+    반환값: (정규화된 DataFrame, [(행 번호, 실패 사유), ...])
+    """
+    missing_columns = [column for column in CSV_COLUMNS if column not in chunk.columns]
+    if missing_columns:
+        reason = f"필수 컬럼 누락: {', '.join(missing_columns)}"
+        return chunk.iloc[0:0], [(int(index), reason) for index in chunk.index]
+    
+    # 날짜 파싱 (Asia/Seoul 등 현재 시간대로 지역화)
+    dates = pd.to_datetime(chunk['거래일시'], format=DATE_FORMAT, errors='coerce')
+    dates = dates.dt.tz_localize(settings.TIME_ZONE, ambiguous='NaT', nonexistent='NaT')
+    
+    income = pd.to_numeric(chunk['입금액'], errors='coerce')
+    expense = pd.to_numeric(chunk['출금액'], errors='coerce')
+    balance = pd.to_numeric(chunk['거래후잔액'], errors='coerce')
+    description = chunk['적요']
+    branch = chunk['거래점'].astype(object).where(chunk['거래점'].notna(), None)
+    
+    # 실패 사유 (먼저 해당하는 사유 하나만 기록)
+    checks = [
+        (dates.isna(), '거래일시 형식 오류'),
+        (description.isna() | (description.astype(str).str.strip() == ''), '적요 누락'),
+        (description.astype(str).str.len() > DESCRIPTION_MAX_LENGTH, '적요 길이 초과'),
+        (income.isna() | expense.isna(), '입출금액 형식 오류'),
+        (balance.isna(), '거래후잔액 형식 오류'),
+    ]
+    reasons = pd.Series(None, index=chunk.index, dtype=object)
+    for mask, reason in checks:
+        reasons = reasons.mask(mask & reasons.isna(), reason)
+    invalid = reasons.notna()
+    errors = [(int(index), reason) for index, reason in reasons[invalid].items()]
+    
+    # 거래 유형 및 금액 결정
+    is_income = income > 0
+    normalized = pd.DataFrame({
+        'transaction_date': dates,
+        'description': description.astype(str),
+        'income_amount': income,
+        'expense_amount': expense,
+        'balance_after': balance,
+        'branch_name': branch,
+        'transaction_type': np.where(is_income, 'income', 'expense'),
+        'amount': income.where(is_income, expense),
+    }, index=chunk.index)
+    normalized = normalized[~invalid]
+    normalized['fingerprint'] = compute_fingerprints(normalized)
+    return normalized, errors
+
+
+def compute_fingerprints(normalized):
+    """거래일시, 적요, 금액, 거래후잔액, 거래점으로 만든 중복 판별 키 (SHA-256)"""
+    if normalized.empty:
+        return pd.Series([], index=normalized.index, dtype=object)
+    
+    amount_format = '{:.2f}'.format
+    keys = (
+        normalized['transaction_date'].dt.strftime(DATE_FORMAT)
+        + '|' + normalized['description']
+        + '|' + normalized['income_amount'].map(amount_format)
+        + '|' + normalized['expense_amount'].map(amount_format)
+        + '|' + normalized['balance_after'].map(amount_format)
+        + '|' + normalized['branch_name'].fillna('').astype(str)
+    )
+    return keys.map(lambda key: hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+
+def _exclude_existing(normalized, batch_size):
+    """파일 내 중복 행과 이미 저장된 거래를 제외 (새 파일 크기에 비례하는 인덱스 조회)"""
+    deduplicated = normalized.drop_duplicates('fingerprint')
+    fingerprints = deduplicated['fingerprint'].tolist()
+    
+    existing = set()
+    for start in range(0, len(fingerprints), batch_size):
+        existing.update(
+            Transaction.objects.filter(fingerprint__in=fingerprints[start:start + batch_size])
+            .values_list('fingerprint', flat=True)
+        )
+    return deduplicated[~deduplicated['fingerprint'].isin(existing)]
+
+
+def _insert_new_rows(new_rows, batch_size, use_executemany):
+    """중복을 제외한 청크 저장 -> 실제로 저장된 행 (집계 증감은 이 행들로만 계산)
+
+    조회 이후 다른 프로세스가 같은 거래를 먼저 저장했다면 그 행은 충돌로 무시됩니다.
+    executemany는 rowcount로 저장 건수를 확인하고, 건수가 모자라거나 알 수 없으면(bulk_create)
+    이번에 새로 생긴 거래 ID 범위에서 중복 판별 키를 다시 조회하여 저장된 행만 남깁니다.
+    """
+    if new_rows.empty:
+        return new_rows
+    
+    last_id = Transaction.objects.aggregate(last=Max('transaction_id'))['last'] or 0
+    if use_executemany:
+        # SQLite: 컬럼 단위 값 변환 후 executemany (bulk_create의 행별 변환 생략)
+        inserted_count = executemany_insert_transactions(new_rows)
+    else:
+        Transaction.objects.bulk_create(
+            _build_transactions(new_rows), batch_size=batch_size, ignore_conflicts=True
+        )
+        inserted_count = None
+    if inserted_count == len(new_rows):
+        return new_rows
+    
+    fingerprints = new_rows['fingerprint'].tolist()
+    stored = set()
+    for start in range(0, len(fingerprints), batch_size):
+        stored.update(
+            Transaction.objects.filter(
+                transaction_id__gt=last_id, fingerprint__in=fingerprints[start:start + batch_size]
+            ).values_list('fingerprint', flat=True)
+        )
+    return new_rows[new_rows['fingerprint'].isin(stored)]
+
+
+def _exclude_staged(normalized, log, batch_size):
+    """파일 내 중복 행과 같은 교체 가져오기에서 이미 교체 대기 테이블에 저장한 거래를 제외"""
+    deduplicated = normalized.drop_duplicates('fingerprint')
+    fingerprints = deduplicated['fingerprint'].tolist()
+    
+    staged = set()
+    for start in range(0, len(fingerprints), batch_size):
+        staged.update(
+            StagedTransaction.objects.filter(log=log, fingerprint__in=fingerprints[start:start + batch_size])
+            .values_list('fingerprint', flat=True)
+        )
+    return deduplicated[~deduplicated['fingerprint'].isin(staged)]
+
+
+def _build_transactions(normalized, model=Transaction, **constants):
+    """정규화된 청크를 Transaction(또는 StagedTransaction) 객체 목록으로 변환 (constants는 모든 행에 같은 값)"""
+    if normalized.empty:
+        return []
+    
+    columns = {
+        'transaction_date': pd.DatetimeIndex(normalized['transaction_date']).to_pydatetime(),
+        'description': normalized['description'].tolist(),
+        'income_amount': normalized['income_amount'].tolist(),
+        'expense_amount': normalized['expense_amount'].tolist(),
+        'balance_after': normalized['balance_after'].tolist(),
+        'branch_name': normalized['branch_name'].tolist(),
+        'transaction_type': normalized['transaction_type'].tolist(),
+        'amount': normalized['amount'].tolist(),
+        'fingerprint': normalized['fingerprint'].tolist(),
+        'description_hash': normalized['description'].map(description_hash).tolist(),
+    }
+    names = list(columns)
+    return [
+        model(**constants, **dict(zip(names, values)))
+        for values in zip(*columns.values())
+    ]
+
+
+def import_transactions(chunks, log, mode='incremental', batch_size=None, profiler=None, on_chunk=None):
+    """청크 단위로 거래 내역을 일괄 저장하고 청크마다 처리 로그 갱신
+
+    mode='incremental'이면 중복 판별 키가 이미 있는 거래는 건너뛰고,
+    mode='replace'이면 모든 청크를 저장한 뒤 기존 거래 내역과 한 번에 교체합니다.
+    단계별(parse, normalize, insert, rollup ...) 시간/SQL 시간은 log.metrics에 기록하며,
+    profiler를 넘기면 호출한 쪽에서 분류 등 이후 단계를 같은 기록에 이어 측정할 수 있습니다.
+    on_chunk(log)는 청크를 저장할 때마다 호출됩니다 (작업 하트비트 등).
+    """
+    if profiler is None:
+        profiler = PipelineProfiler()
+        with profiler.track():
+            return import_transactions(chunks, log, mode, batch_size, profiler, on_chunk)
+    
+    def normalized_chunks():
+        source = iter(chunks)
+        while True:
+            # CSV 읽기 (청크 단위 지연 파싱이므로 다음 청크를 꺼내는 시간이 파싱 시간)
+            with profiler.stage('parse'):
+                chunk = next(source, None)
+            if chunk is None:
+                return
+            with profiler.stage('normalize'):
+                normalized, errors = normalize_chunk(chunk)
+            yield len(chunk), normalized, errors
+    
+    return import_normalized(normalized_chunks(), log, mode, batch_size, profiler, on_chunk)
+
+
+def parse_statement(source, chunk_size=None, sink=None):
+    """CSV 파일 하나를 읽어 정규화된 청크 목록으로 변환 (DB 접근 없음, 작업 프로세스에서 실행 가능)
+
+    sink를 넘기면 청크를 모아 두지 않고 청크마다 sink((원본 행 수, DataFrame, 실패 목록))를 호출하여
+    그 반환값을 목록에 담습니다 (임시 파일로 내보내기 등, 메모리에는 청크 하나만 유지).
+
+    반환값: ([(원본 행 수, 정규화된 DataFrame, 실패 목록) 또는 sink 반환값, ...], 파싱 시간, 정규화 시간)
+    """
+    parse_seconds = 0.0
+    normalize_seconds = 0.0
+    parsed = []
+    source = iter(iter_csv_chunks(source, chunk_size))
+    while True:
+        started = time.perf_counter()
+        chunk = next(source, None)
+        parse_seconds += time.perf_counter() - started
+        if chunk is None:
+            return parsed, parse_seconds, normalize_seconds
+        started = time.perf_counter()
+        normalized, errors = normalize_chunk(chunk)
+        normalize_seconds += time.perf_counter() - started
+        piece = (len(chunk), normalized, errors)
+        parsed.append(sink(piece) if sink is not None else piece)
+
+
+def _delete_all_transactions():
+    """거래 내역 전체를 DELETE 한 번으로 삭제 (행별 삭제 신호의 집계 반영 없이, 집계는 호출한 쪽에서 비움)"""
+    connection = connections[Transaction.objects.db]
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {connection.ops.quote_name(Transaction._meta.db_table)}')
+        deleted_count = cursor.rowcount
+    bump_version(DELETES_VERSION)
+    return deleted_count
+
+
+# 교체 대기 테이블에서 거래 내역으로 옮기는 컬럼
+STAGED_COLUMNS = [
+    field.column for field in StagedTransaction._meta.concrete_fields if field.name not in ('id', 'log')
+]
+
+
+def _replace_with_staged(log, deltas):
+    """교체 대기 거래로 거래 내역 전체를 한 트랜잭션에서 교체하고 집계를 새로 채움 -> 삭제한 기존 거래 수"""
+    connection = connections[Transaction.objects.db]
+    quote_name = connection.ops.quote_name
+    columns = ', '.join(quote_name(column) for column in STAGED_COLUMNS)
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    with transaction.atomic():
+        deleted_count = _delete_all_transactions()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {quote_name(Transaction._meta.db_table)} ({columns}, is_classified, created_at, updated_at) "
+                f"SELECT {columns}, %s, %s, %s FROM {quote_name(StagedTransaction._meta.db_table)} "
+                f"WHERE log_id = %s ORDER BY id",
+                [False, now, now, log.pk]
+            )
+        StagedTransaction.objects.filter(log=log).delete()
+        clear_rollups()
+        apply_rollup_deltas(deltas)
+    return deleted_count
+
+
+def import_normalized(parsed_chunks, log, mode='incremental', batch_size=None, profiler=None, on_chunk=None):
+    """정규화된 청크 ((원본 행 수, DataFrame, 실패 목록) 순서열)를 일괄 저장하고 청크마다 처리 로그 갱신"""
+    if profiler is None:
+        profiler = PipelineProfiler()
+        with profiler.track():
+            return import_normalized(parsed_chunks, log, mode, batch_size, profiler, on_chunk)
+    
+    batch_size = batch_size or getattr(settings, 'IMPORT_BATCH_SIZE', 500)
+    started = time.perf_counter()
+    
+    log.records_processed = 0
+    log.records_successful = 0
+    log.records_failed = 0
+    log.records_skipped = 0
+    
+    if mode == 'replace':
+        # 새 거래는 청크마다 교체 대기 테이블에 커밋하고(청크별 진행 상황과 작업 하트비트가 바로 보임)
+        # 마지막에 한 트랜잭션으로 교체 (도중에 실패하면 기존 거래 내역과 집계가 그대로 남음)
+        StagedTransaction.objects.filter(log=log).delete()
+        try:
+            return _insert_chunks(parsed_chunks, log, batch_size, profiler, on_chunk, started, replace=True)
+        finally:
+            StagedTransaction.objects.filter(log=log).delete()
+    return _insert_chunks(parsed_chunks, log, batch_size, profiler, on_chunk, started)
+
+
+def _insert_chunks(parsed_chunks, log, batch_size, profiler, on_chunk, started, replace=False):
+    """import_normalized 본문: 청크마다 검사/저장/집계 반영 후 처리 로그 갱신 (replace면 교체 대기 테이블에 저장)"""
+    log.error_details = []
+    log.records_flagged = 0
+    max_error_details = getattr(settings, 'IMPORT_MAX_ERROR_DETAILS', 1000)
+    
+    # 거래후잔액 연속성 검사 (청크 경계를 넘어 직전 행을 이어받음)
+    balance_checker = None
+    if getattr(settings, 'IMPORT_CHECK_BALANCES', True):
+        # 전체 교체는 기존 거래 내역과 이어지지 않으므로 파일 첫 행부터 검사
+        balance_checker = BalanceChainChecker(seed_from_ledger=not replace)
+    
+    use_copy = copy_supported()
+    use_executemany = executemany_supported()
+    replaced_deltas = RollupDeltas()
+    
+    for row_count, normalized, errors in parsed_chunks:
+        with profiler.stage('reconcile'):
+            balance_issues = balance_checker.check(normalized) if balance_checker else []
+        
+        with transaction.atomic():
+            with profiler.stage('insert'):
+                if replace:
+                    # 기존 거래 내역과 집계는 교체할 때까지 그대로 둠
+                    new_rows = _exclude_staged(normalized, log, batch_size)
+                    StagedTransaction.objects.bulk_create(
+                        _build_transactions(new_rows, StagedTransaction, log=log), batch_size=batch_size
+                    )
+                    inserted_count, deltas = len(new_rows), deltas_from_frame(new_rows)
+                elif use_copy:
+                    # PostgreSQL: COPY -> 임시 테이블 -> INSERT ... SELECT (중복은 ON CONFLICT로 건너뜀)
+                    inserted_count, deltas = copy_insert_transactions(normalized)
+                else:
+                    new_rows = _exclude_existing(normalized, batch_size)
+                    inserted_rows = _insert_new_rows(new_rows, batch_size, use_executemany)
+                    inserted_count, deltas = len(inserted_rows), deltas_from_frame(inserted_rows)
+            # 일별/월별 집계에 새 거래 반영 (전체 교체는 교체할 때 한 번에)
+            if replace:
+                replaced_deltas.merge(deltas.entries)
+            else:
+                with profiler.stage('rollup'):
+                    apply_rollup_deltas(deltas)
+        
+        # 실패 행 번호와 사유 기록 (최대 개수까지)
+        if errors and logger.isEnabledFor(logging.DEBUG):
+            for index, reason in errors:
+                logger.debug("행 %s 처리 실패: %s", index, reason)
+        remaining = max_error_details - len(log.error_details)
+        if remaining > 0:
+            log.error_details.extend({'row': index, 'reason': reason} for index, reason in errors[:remaining])
+        # 잔액 연속성 오류 행은 저장하되 경고로 기록
+        remaining = max_error_details - len(log.error_details)
+        if remaining > 0:
+            log.error_details.extend(
+                {'row': int(index), 'reason': reason} for index, reason in balance_issues[:remaining]
+            )
+        
+        # 청크별 진행 상황 기록
+        log.records_processed += row_count
+        log.records_successful += inserted_count
+        log.records_failed += len(errors)
+        log.records_skipped += len(normalized) - inserted_count
+        log.records_flagged += len(balance_issues)
+        elapsed = time.perf_counter() - started
+        log.rows_per_second = log.records_processed / elapsed if elapsed > 0 else None
+        log.save(update_fields=[
+            'records_processed', 'records_successful', 'records_failed', 'records_skipped',
+            'records_flagged', 'error_details', 'rows_per_second'
+        ])
+        logger.debug("청크 저장 완료: 누적 %d행", log.records_processed)
+        if on_chunk is not None:
+            on_chunk(log)
+    
+    if replace:
+        with profiler.stage('replace'):
+            deleted_count = _replace_with_staged(log, replaced_deltas)
+        logger.info("기존 거래 내역 %d건을 새 거래 %d건으로 교체", deleted_count, log.records_successful)
+    
+    # 요약 캐시 무효화
+    with profiler.stage('cache'):
+        bump_data_version()
+    
+    elapsed = time.perf_counter() - started
+    log.duration_seconds = elapsed
+    log.rows_per_second = log.records_processed / elapsed if elapsed > 0 else None
+    log.save(update_fields=['duration_seconds', 'rows_per_second'])
+    profiler.save(log)
+    return log
@@ -0,0 +1,182 @@
+import logging
+import os
+import socket
+import uuid
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ImportJob, ProcessingLog
+from .classifier import classify_transactions, invalidate_keyword_matcher
+from .memo import clear_description_lru
+from .importer import iter_csv_chunks, import_transactions
+from .profiling import PipelineProfiler
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_import(uploaded_file, import_mode='incremental'):
+    """업로드 파일을 디스크에 저장하고 가져오기 작업을 대기열에 등록"""
+    upload_dir = getattr(settings, 'IMPORT_UPLOAD_DIR', os.path.join(settings.BASE_DIR, 'media', 'imports'))
+    os.makedirs(upload_dir, exist_ok=True)
+    file_path = os.path.join(upload_dir, f'{uuid.uuid4().hex}_{os.path.basename(uploaded_file.name)}')
+    
+    with open(file_path, 'wb') as destination:
+        for chunk in uploaded_file.chunks():
+            destination.write(chunk)
+    
+    log = ProcessingLog.objects.create(
+        process_type='import',
+        file_name=uploaded_file.name,
+        status='pending'
+    )
+    return ImportJob.objects.create(
+        file_path=file_path,
+        file_name=uploaded_file.name,
+        import_mode=import_mode,
+        log=log
+    )
+
+
+class JobLeaseLost(Exception):
+    """하트비트가 끊겨 다른 작업자가 작업을 다시 가져감"""
+
+
+def reclaim_stale_jobs(lease_seconds=None, max_attempts=None):
+    """하트비트가 끊긴 처리 중 작업(작업자 비정상 종료 등)을 다시 대기 상태로 (시도 횟수 초과 시 실패)
+
+    반환값: (다시 대기, 실패 처리) 작업 수
+    """
+    lease_seconds = lease_seconds or getattr(settings, 'IMPORT_JOB_LEASE_SECONDS', 600)
+    max_attempts = max_attempts or getattr(settings, 'IMPORT_JOB_MAX_ATTEMPTS', 3)
+    stale = ImportJob.objects.filter(
+        status='running', heartbeat_at__lt=timezone.now() - timedelta(seconds=lease_seconds)
+    )
+    
+    failed_ids = list(stale.filter(attempts__gte=max_attempts).values_list('job_id', flat=True))
+    failed = ImportJob.objects.filter(job_id__in=failed_ids, status='running').update(
+        status='failed', finished_at=timezone.now()
+    )
+    ProcessingLog.objects.filter(job__job_id__in=failed_ids).update(
+        status='failed', error_message=f'작업자 응답 없음 ({max_attempts}회 시도)'
+    )
+    
+    requeue_ids = list(stale.filter(attempts__lt=max_attempts).values_list('job_id', flat=True))
+    requeued = ImportJob.objects.filter(job_id__in=requeue_ids, status='running').update(
+        status='pending', worker=None
+    )
+    ProcessingLog.objects.filter(job__job_id__in=requeue_ids).update(status='pending')
+    
+    if failed or requeued:
+        logger.warning("응답 없는 작업 정리: 다시 대기 %d건, 실패 %d건", requeued, failed)
+    return requeued, failed
+
+
+def retry_failed_jobs():
+    """실패한 작업 중 업로드 파일이 남아 있는 작업을 다시 대기 상태로"""
+    job_ids = [
+        job.job_id for job in ImportJob.objects.filter(status='failed')
+        if os.path.exists(job.file_path)
+    ]
+    ImportJob.objects.filter(job_id__in=job_ids).update(status='pending', worker=None, attempts=0, finished_at=None)
+    ProcessingLog.objects.filter(job__job_id__in=job_ids).update(status='pending', error_message=None)
+    return len(job_ids)
+
+
+def claim_next_job(worker_name):
+    """가장 오래된 대기 작업을 선점 (다른 작업자와 경합 시 조건부 UPDATE로 하나만 성공)"""
+    reclaim_stale_jobs()
+    while True:
+        job_id = (
+            ImportJob.objects.filter(status='pending')
+            .order_by('job_id')
+            .values_list('job_id', flat=True)
+            .first()
+        )
+        if job_id is None:
+            return None
+        
+        now = timezone.now()
+        claimed = ImportJob.objects.filter(job_id=job_id, status='pending').update(
+            status='running',
+            worker=worker_name,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=F('attempts') + 1
+        )
+        if claimed:
+            return ImportJob.objects.select_related('log').get(job_id=job_id)
+
+
+def heartbeat(job):
+    """작업 점유 갱신 (이미 다른 작업자가 가져갔으면 JobLeaseLost)"""
+    alive = ImportJob.objects.filter(job_id=job.job_id, status='running', worker=job.worker).update(
+        heartbeat_at=timezone.now()
+    )
+    if not alive:
+        raise JobLeaseLost(f'작업 {job.job_id}의 점유가 만료되었습니다.')
+
+
+def run_job(job):
+    """가져오기 및 자동 분류 실행, 진행 상황과 오류는 처리 로그에 기록
+
+    분류까지 성공해야 완료로 기록하며, 실패한 작업은 업로드 파일을 남겨 retry_failed_jobs()로 다시 실행할 수 있습니다.
+    """
+    log = job.log or ProcessingLog.objects.create(process_type='import', file_name=job.file_name)
+    log.status = 'running'
+    log.save(update_fields=['status'])
+    
+    # 장기 실행 작업자: 다른 프로세스의 키워드 변경이 반영되도록 작업마다 매처와 적요 LRU를 새로 만듦
+    invalidate_keyword_matcher()
+    clear_description_lru()
+    
+    profiler = PipelineProfiler()
+    try:
+        with profiler.track():
+            with open(job.file_path, 'rb') as source:
+                import_transactions(
+                    iter_csv_chunks(source), log, mode=job.import_mode, profiler=profiler,
+                    on_chunk=lambda log: heartbeat(job)
+                )
+            
+            heartbeat(job)
+            logger.info("작업 %s 자동 분류 시작", job.job_id)
+            with profiler.stage('classify'):
+                # 분류 배치를 커밋할 때마다 점유 갱신 (분류가 길어도 다른 작업자가 가져가지 않도록)
+                classify_transactions(on_batch=lambda: heartbeat(job))
+        profiler.save(log)
+        
+        job.status = log.status = 'completed'
+    except JobLeaseLost as e:
+        # 다른 작업자가 이어서 처리하므로 상태는 건드리지 않음
+        logger.warning("작업 %s 중단: %s", job.job_id, e)
+        return job
+    except Exception as e:
+        logger.exception("작업 %s 실패: %s", job.job_id, e)
+        job.status = log.status = 'failed'
+        log.error_message = str(e)
+    
+    # 아직 이 작업자가 점유하고 있을 때만 결과를 기록 (조건부 UPDATE가 0건이면 다른 작업자가 가져감)
+    job.finished_at = timezone.now()
+    with transaction.atomic():
+        finished = ImportJob.objects.filter(job_id=job.job_id, status='running', worker=job.worker).update(
+            status=job.status, finished_at=job.finished_at
+        )
+        if finished:
+            log.save(update_fields=['status', 'error_message'])
+    if not finished:
+        logger.warning("작업 %s: 점유가 만료되어 결과(%s)를 기록하지 않음", job.job_id, job.status)
+        job.refresh_from_db()
+        return job
+    
+    if job.status == 'completed' and os.path.exists(job.file_path):
+        os.remove(job.file_path)
+    return job
+
+
+def default_worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
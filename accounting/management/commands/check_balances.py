@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from accounting.models import ProcessingLog
+from accounting.reconcile import check_ledger_balances
+
+class Command(BaseCommand):
+    help = '저장된 거래 내역의 거래후잔액 연속성(직전 잔액 + 입금액 - 출금액 = 거래후잔액)을 검사합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=50000,
+            help='한 번에 읽어 검사할 거래 건수'
+        )
+        parser.add_argument(
+            '--log',
+            action='store_true',
+            help='검사 결과를 처리 로그(잔액 검증)로 저장합니다.'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('거래후잔액 연속성을 검사합니다...')
+        started = time.perf_counter()
+        checker, issues = check_ledger_balances(chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+        
+        for transaction_id, reason in issues[:20]:
+            self.stdout.write(f'  거래 {transaction_id}: {reason}')
+        if len(issues) > 20:
+            self.stdout.write(f'  ... 외 {len(issues) - 20}건')
+        
+        if options['log']:
+            max_error_details = getattr(settings, 'IMPORT_MAX_ERROR_DETAILS', 1000)
+            log = ProcessingLog.objects.create(
+                process_type='reconciliation',
+                records_processed=checker.checked,
+                records_successful=checker.checked - len(issues),
+                records_flagged=len(issues),
+                error_details=[
+                    {'transaction_id': int(transaction_id), 'reason': reason}
+                    for transaction_id, reason in issues[:max_error_details]
+                ],
+                duration_seconds=elapsed,
+                rows_per_second=checker.checked / elapsed if elapsed > 0 else None
+            )
+            self.stdout.write(f'처리 로그 {log.log_id}번에 결과를 저장했습니다.')
+        
+        if issues:
+            raise CommandError(f'거래후잔액 연속성 오류 {len(issues)}건 (검사 {checker.checked}건, {elapsed:.3f}초)')
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'거래후잔액 연속성 검사 완료: {checker.checked}건 이상 없음 ({elapsed:.3f}초)')
+        )
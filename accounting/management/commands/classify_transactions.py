@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from accounting.classifier import classify_transactions
+
+class Command(BaseCommand):
+    help = '거래 내역을 분류 키워드로 자동 분류합니다. (--workers로 병렬 처리)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='작업 프로세스 수 (기본: CLASSIFICATION_WORKERS)'
+        )
+        parser.add_argument(
+            '--shard-size',
+            type=int,
+            help='작업 프로세스 하나가 맡는 거래 ID 범위 크기 (기본: CLASSIFICATION_SHARD_SIZE)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='한 번에 읽는 거래 건수 (기본: CLASSIFICATION_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='이미 분류된 거래도 현재 키워드로 다시 분류합니다.'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('거래 내역을 분류합니다...')
+        try:
+            log = classify_transactions(
+                batch_size=options['batch_size'],
+                workers=options['workers'],
+                shard_size=options['shard_size'],
+                reclassify_all=options['all']
+            )
+        except Exception as e:
+            raise CommandError(f'분류 중 오류가 발생했습니다: {e}')
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'분류 완료: 대상 {log.records_processed}건, 성공 {log.records_successful}건, '
+                f'실패 {log.records_failed}건 ({log.duration_seconds:.3f}초, 처리 로그 {log.log_id}번)'
+            )
+        )
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from accounting.synthetic import parse_scale, write_ledger_csv
+
+class Command(BaseCommand):
+    help = '기존 은행 CSV 형식의 합성 거래 내역 파일을 생성합니다. (예: --rows 1m)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='저장할 CSV 파일 경로')
+        parser.add_argument(
+            '--rows',
+            default='10k',
+            help='생성할 행 수 (예: 10k, 1m, 10m)'
+        )
+        parser.add_argument(
+            '--hit-rate',
+            type=float,
+            default=0.8,
+            help='분류 키워드가 포함된 적요 비율 (0 ~ 1)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='난수 시드 (같은 시드면 같은 파일)'
+        )
+        parser.add_argument(
+            '--start',
+            default='2024-01-01 09:00:00',
+            help='첫 거래일시'
+        )
+
+    def handle(self, *args, **options):
+        if not 0 <= options['hit_rate'] <= 1:
+            raise CommandError('--hit-rate 값은 0 ~ 1 사이여야 합니다.')
+        try:
+            rows = parse_scale(options['rows'])
+            started = time.perf_counter()
+            written = write_ledger_csv(
+                options['output'], rows,
+                hit_rate=options['hit_rate'], seed=options['seed'], start=options['start']
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"합성 거래 내역 생성 완료: {written}행 -> {options['output']} ({elapsed:.1f}초)")
+        )
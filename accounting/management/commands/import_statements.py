@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+from accounting.statements import import_statements
+
+class Command(BaseCommand):
+    help = '디렉터리 또는 glob 패턴의 거래 내역 CSV 파일들을 병렬 파싱하여 한 번에 가져옵니다. (이미 가져온 파일은 건너뜀)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'sources',
+            nargs='+',
+            help='CSV 파일, 디렉터리(바로 아래 *.csv) 또는 glob 패턴 (예: "statements/2026-09/*.csv")'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='파싱 작업 프로세스 수 (기본: IMPORT_PARSE_WORKERS)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='이미 가져오기가 완료된 파일(같은 체크섬)도 다시 처리합니다.'
+        )
+        parser.add_argument(
+            '--no-classify',
+            action='store_true',
+            help='가져오기 후 자동 분류를 실행하지 않습니다.'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('거래 내역 파일을 가져옵니다...')
+        try:
+            summary = import_statements(
+                options['sources'],
+                workers=options['workers'],
+                force=options['force'],
+                classify=not options['no_classify'],
+                stdout=self.stdout
+            )
+        except FileNotFoundError as e:
+            raise CommandError(str(e))
+        
+        files = summary.metrics['files']
+        skipped_files = sum(1 for item in files if item['status'] == 'skipped')
+        if skipped_files:
+            self.stdout.write(f'이미 가져온 파일 {skipped_files}개를 건너뛰었습니다. (--force로 다시 처리)')
+        
+        message = (
+            f'파일 {len(files) - skipped_files}개, {summary.records_processed}행: '
+            f'성공 {summary.records_successful}건, 실패 {summary.records_failed}건, '
+            f'중복 {summary.records_skipped}건 ({summary.duration_seconds:.3f}초, 처리 로그 {summary.log_id}번)'
+        )
+        if summary.status == 'failed':
+            raise CommandError(f'{summary.error_message}: {message}')
+        self.stdout.write(self.style.SUCCESS(f'일괄 가져오기 완료: {message}'))
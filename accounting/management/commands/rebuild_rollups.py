@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from accounting.rollups import check_rollups, rebuild_rollups
+
+class Command(BaseCommand):
+    help = '일별/월별 집계를 원본 거래 내역으로부터 다시 생성하거나 검증합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='다시 생성하지 않고 저장된 집계와 원본 거래 내역만 비교합니다.'
+        )
+
+    def handle(self, *args, **options):
+        if not options['check']:
+            self.stdout.write('집계를 다시 생성합니다...')
+            rebuild_rollups()
+            self.stdout.write('✓ 집계 재생성 완료')
+        
+        self.stdout.write('집계를 원본 거래 내역과 비교합니다...')
+        mismatches = check_rollups()
+        mismatch_count = 0
+        for model_name, problems in mismatches.items():
+            if not problems:
+                self.stdout.write(f'✓ {model_name}: 일치')
+                continue
+            mismatch_count += len(problems)
+            self.stdout.write(self.style.ERROR(f'✗ {model_name}: 불일치 {len(problems)}건'))
+            for key, stored, expected in problems[:20]:
+                self.stdout.write(f'  {key}: 저장값 {stored} / 원본 {expected}')
+        
+        if mismatch_count:
+            raise CommandError(f'집계 불일치 {mismatch_count}건 (--check 없이 실행하면 다시 생성합니다)')
+        
+        self.stdout.write(
+            self.style.SUCCESS('집계 검증이 완료되었습니다!')
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from accounting.analytics import refresh_snapshot
+
+class Command(BaseCommand):
+    help = '분석용 컬럼형 스냅샷을 생성하거나 증분 갱신합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='기존 스냅샷을 무시하고 전체를 다시 생성합니다.'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('분석 스냅샷을 갱신합니다...')
+        snapshot = refresh_snapshot(full=options['full'])
+        self.stdout.write(
+            self.style.SUCCESS(f"분석 스냅샷 갱신 완료: {len(snapshot)}행 ({snapshot.meta['version']})")
+        )
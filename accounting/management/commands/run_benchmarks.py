@@ -0,0 +1,129 @@
+import json
+import os
+import platform
+import subprocess
+import tempfile
+from datetime import datetime
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from accounting import analytics
+from accounting.benchmarks import run_benchmarks
+from accounting.synthetic import parse_scale
+
+class Command(BaseCommand):
+    help = '합성 거래 내역으로 가져오기/분류/요약/대시보드/거래 목록 성능을 측정하여 JSON으로 저장합니다. (테스트 DB 사용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scales',
+            default='10k',
+            help='측정할 행 수 목록 (쉼표 구분, 예: 10k,1m,10m)'
+        )
+        parser.add_argument(
+            '--hit-rate',
+            type=float,
+            default=0.8,
+            help='분류 키워드가 포함된 적요 비율 (0 ~ 1)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='난수 시드'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='요청 측정 반복 횟수 (캐시가 채워진 상태)'
+        )
+        parser.add_argument(
+            '--pages',
+            type=int,
+            default=10,
+            help='거래 목록에서 따라갈 페이지 수'
+        )
+        parser.add_argument(
+            '--output',
+            help='결과 JSON 경로 (기본: media/benchmarks/benchmark-<시각>.json)'
+        )
+
+    def _git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def handle(self, *args, **options):
+        try:
+            scales = [parse_scale(value) for value in options['scales'].split(',') if value.strip()]
+        except ValueError as e:
+            raise CommandError(str(e))
+        if not 0 <= options['hit_rate'] <= 1:
+            raise CommandError('--hit-rate 값은 0 ~ 1 사이여야 합니다.')
+        
+        output = options['output'] or os.path.join(
+            settings.BASE_DIR, 'media', 'benchmarks', f"benchmark-{datetime.now():%Y%m%d-%H%M%S}.json"
+        )
+        
+        # 실제 데이터와 분리된 테스트 DB에서 측정 (SQLite는 메모리 DB 대신 파일 사용)
+        if connection.vendor == 'sqlite' and not connection.settings_dict['TEST'].get('NAME'):
+            connection.settings_dict['TEST']['NAME'] = os.path.join(settings.BASE_DIR, 'benchmark.sqlite3')
+        # 분석 스냅샷/업로드 파일/캐시도 임시 위치를 사용하여 운영 스냅샷과 캐시 키를 건드리지 않음
+        with tempfile.TemporaryDirectory(prefix='benchmark-') as workdir, override_settings(
+            ANALYTICS_SNAPSHOT_DIR=os.path.join(workdir, 'analytics'),
+            IMPORT_UPLOAD_DIR=os.path.join(workdir, 'imports'),
+            CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'accounting-benchmark',
+                'TIMEOUT': settings.CACHES['default'].get('TIMEOUT', 300),
+            }},
+        ):
+            analytics._loaded = None
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                call_command('init_data', stdout=open(os.devnull, 'w'))
+                self.stdout.write(f"측정 시작: {', '.join(str(rows) for rows in scales)}행 (DB: {connection.vendor})")
+                results = run_benchmarks(
+                    scales, hit_rate=options['hit_rate'], seed=options['seed'],
+                    repeat=options['repeat'], pages=options['pages']
+                )
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                analytics._loaded = None
+        
+        report = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': self._git_commit(),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'database': connection.vendor,
+                'import_chunk_size': getattr(settings, 'IMPORT_CHUNK_SIZE', None),
+                'classification_workers': getattr(settings, 'CLASSIFICATION_WORKERS', None),
+            },
+            'results': results,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        
+        for result in results:
+            self.stdout.write(
+                f"{result['rows']:>10}행  가져오기 {result['import']['rows_per_second']}행/초  "
+                f"분류 {result['classify']['rows_per_second']}행/초  "
+                f"요약 {result['api_summary']['cold_ms']}ms/{result['api_summary']['warm_ms']}ms  "
+                f"대시보드 {result['dashboard']['cold_ms']}ms  "
+                f"목록 {result['transactions_list']['median_page_ms']}ms"
+            )
+        self.stdout.write(self.style.SUCCESS(f'측정 결과 저장: {output}'))
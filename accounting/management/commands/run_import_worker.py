@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from accounting.jobs import claim_next_job, default_worker_name, retry_failed_jobs, run_job
+
+class Command(BaseCommand):
+    help = '대기 중인 가져오기 작업을 처리하는 작업자를 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=getattr(settings, 'IMPORT_WORKER_POLL_INTERVAL', 2.0),
+            help='대기 작업이 없을 때 다시 확인하기까지의 간격(초)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='현재 대기 중인 작업만 처리하고 종료합니다.'
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='업로드 파일이 남아 있는 실패 작업을 다시 대기열에 넣고 시작합니다.'
+        )
+
+    def handle(self, *args, **options):
+        worker_name = default_worker_name()
+        self.stdout.write(f'가져오기 작업자를 시작합니다: {worker_name}')
+        if options['retry_failed']:
+            self.stdout.write(f'실패 작업 {retry_failed_jobs()}건을 다시 대기열에 넣었습니다.')
+        
+        try:
+            while True:
+                close_old_connections()
+                job = claim_next_job(worker_name)
+                
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+                
+                self.stdout.write(f'작업 {job.job_id} 처리 시작: {job.file_name}')
+                run_job(job)
+                if job.status == 'completed':
+                    self.stdout.write(self.style.SUCCESS(f'✓ 작업 {job.job_id} 완료'))
+                elif job.status == 'running':
+                    self.stdout.write(self.style.WARNING(f'작업 {job.job_id} 점유 만료: 다른 작업자가 이어서 처리합니다.'))
+                else:
+                    self.stdout.write(self.style.ERROR(f'✗ 작업 {job.job_id} 실패 (처리 로그 {job.log_id} 참고)'))
+        except KeyboardInterrupt:
+            self.stdout.write('작업자를 종료합니다.')
@@ -0,0 +1,175 @@
+from collections import OrderedDict
+import threading
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import DescriptionMemo, description_hash, normalize_description
+from .search import memo_description_q
+
+# LRU에 저장하는 '매칭 없음' 표시 (키워드 pk는 1부터 시작)
+NO_MATCH = 0
+_MISSING = object()
+
+
+class DescriptionLRU:
+    """정규화된 적요 해시 -> 키워드 pk(또는 NO_MATCH) 프로세스 내 LRU"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._items.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            if len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+_lru = None
+_lru_lock = threading.Lock()
+
+
+def get_description_lru():
+    global _lru
+    if _lru is None:
+        with _lru_lock:
+            if _lru is None:
+                _lru = DescriptionLRU(getattr(settings, 'CLASSIFICATION_MEMO_LRU_SIZE', 100000))
+    return _lru
+
+
+def clear_description_lru(**kwargs):
+    """키워드/계정과목 변경 시 프로세스 내 LRU 비우기 (영구 메모는 선택적으로 무효화)"""
+    if _lru is not None:
+        _lru.clear()
+
+
+def invalidate_memos_for_keyword(keyword_obj):
+    """키워드 추가/수정 시 결과가 바뀔 수 있는 메모만 삭제하고 해당 적요 해시 목록 반환
+
+    - 이 키워드로 매칭된 메모 (키워드 문자열이 바뀌었을 수 있음)
+    - 적요에 키워드가 포함되고, 매칭 없음이거나 우선순위가 더 낮은 키워드로 매칭된 메모
+      (메모 테이블 전체 LIKE 대신 search.memo_description_q의 trigram 인덱스 사용)
+    """
+    memos = DescriptionMemo.objects.filter(
+        Q(keyword=keyword_obj) |
+        memo_description_q(keyword_obj.keyword) & (Q(keyword__isnull=True) | Q(keyword_id__gt=keyword_obj.pk))
+    )
+    hashes = list(memos.values_list('description_hash', flat=True))
+    for start in range(0, len(hashes), 500):
+        DescriptionMemo.objects.filter(description_hash__in=hashes[start:start + 500]).delete()
+    return hashes
+
+
+class DescriptionResolver:
+    """적요 -> 분류 키워드 조회 (프로세스 내 LRU -> 메모 테이블 -> 키워드 매처 순)
+
+    매처로 새로 계산한 결과는 pending에 모았다가 flush()로 메모 테이블에 저장합니다.
+    """
+
+    def __init__(self, matcher, lru=None, batch_size=500):
+        self.matcher = matcher
+        self.keywords = {keyword_obj.pk: keyword_obj for _, keyword_obj in matcher.entries}
+        self.lru = lru if lru is not None else get_description_lru()
+        self.batch_size = batch_size
+        self.pending = {}
+        self.stats = {'lru_hits': 0, 'memo_hits': 0, 'matched': 0}
+
+    def _payload(self, keyword_id):
+        return None if keyword_id == NO_MATCH else self.keywords[keyword_id]
+
+    def _is_current(self, keyword_id):
+        return keyword_id == NO_MATCH or keyword_id in self.keywords
+
+    def resolve(self, descriptions):
+        """적요 목록에 대한 매칭 키워드 목록 (매칭 없으면 None)"""
+        results = [None] * len(descriptions)
+        misses = {}
+        for position, description in enumerate(descriptions):
+            key = description_hash(description)
+            keyword_id = self.lru.get(key, _MISSING)
+            if keyword_id is not _MISSING and self._is_current(keyword_id):
+                results[position] = self._payload(keyword_id)
+                self.stats['lru_hits'] += 1
+            else:
+                misses.setdefault(key, []).append(position)
+        
+        # 메모 테이블 일괄 조회
+        keys = list(misses)
+        for start in range(0, len(keys), self.batch_size):
+            memos = DescriptionMemo.objects.filter(
+                description_hash__in=keys[start:start + self.batch_size]
+            ).values_list('description_hash', 'keyword_id')
+            for key, keyword_id in memos:
+                keyword_id = keyword_id or NO_MATCH
+                if not self._is_current(keyword_id):
+                    continue
+                positions = misses.pop(key)
+                for position in positions:
+                    results[position] = self._payload(keyword_id)
+                self.lru.put(key, keyword_id)
+                self.stats['memo_hits'] += len(positions)
+        
+        # 남은 적요만 키워드 매처로 계산 (같은 적요는 한 번만)
+        for key, positions in misses.items():
+            normalized = normalize_description(descriptions[positions[0]])
+            keyword_obj = self.matcher.match(normalized)
+            keyword_id = keyword_obj.pk if keyword_obj is not None else NO_MATCH
+            for position in positions:
+                results[position] = keyword_obj
+            self.lru.put(key, keyword_id)
+            self.pending[key] = (normalized, keyword_id)
+            self.stats['matched'] += len(positions)
+        
+        return results
+
+    def merge(self, pending, stats):
+        """다른 프로세스에서 계산한 메모/통계 합치기"""
+        self.pending.update(pending)
+        for name, value in stats.items():
+            self.stats[name] += value
+
+    def flush(self):
+        """새로 계산한 결과를 메모 테이블에 저장"""
+        if not self.pending:
+            return
+        DescriptionMemo.objects.bulk_create(
+            [
+                DescriptionMemo(description_hash=key, description=description, keyword_id=keyword_id or None)
+                for key, (description, keyword_id) in self.pending.items()
+            ],
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['description_hash'],
+            update_fields=['description', 'keyword']
+        )
+        self.pending = {}
+
+    def metrics(self):
+        """분류 처리 로그에 남길 메모 적중률과 크기"""
+        total = sum(self.stats.values())
+        hits = self.stats['lru_hits'] + self.stats['memo_hits']
+        return {
+            **self.stats,
+            'hit_rate': round(hits / total, 4) if total else None,
+            'lru_size': len(self.lru),
+            'memo_size': DescriptionMemo.objects.count(),
+        }
@@ -0,0 +1,91 @@
+from collections import defaultdict
+import threading
+
+# 요청 처리 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _RequestStats:
+    """URL 이름 하나의 누적 통계"""
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.latency_sum = 0.0
+        self.query_count = 0
+        self.query_seconds = 0.0
+        self.status_counts = defaultdict(int)
+
+
+class RequestMetrics:
+    """URL 이름별 요청 지연 시간/SQL 쿼리 수/SQL 시간 (프로세스 단위 누적)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = defaultdict(_RequestStats)
+
+    def record(self, view, method, status, seconds, query_count, query_seconds):
+        with self._lock:
+            stats = self._stats[(view, method)]
+            for position, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    stats.bucket_counts[position] += 1
+            stats.count += 1
+            stats.latency_sum += seconds
+            stats.query_count += query_count
+            stats.query_seconds += query_seconds
+            stats.status_counts[f'{status // 100}xx'] += 1
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 형식 (version 0.0.4)"""
+        with self._lock:
+            items = sorted(self._stats.items())
+            lines = [
+                '# HELP accounting_request_duration_seconds 요청 처리 시간',
+                '# TYPE accounting_request_duration_seconds histogram',
+            ]
+            for (view, method), stats in items:
+                labels = f'view="{_escape(view)}",method="{method}"'
+                for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts):
+                    lines.append(f'accounting_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'accounting_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+                lines.append(f'accounting_request_duration_seconds_sum{{{labels}}} {stats.latency_sum:.6f}')
+                lines.append(f'accounting_request_duration_seconds_count{{{labels}}} {stats.count}')
+            
+            lines += [
+                '# HELP accounting_requests_total 응답 상태별 요청 수',
+                '# TYPE accounting_requests_total counter',
+            ]
+            for (view, method), stats in items:
+                for status_class, count in sorted(stats.status_counts.items()):
+                    lines.append(
+                        f'accounting_requests_total{{view="{_escape(view)}",method="{method}",status="{status_class}"}} {count}'
+                    )
+            
+            lines += [
+                '# HELP accounting_db_queries_total 요청 중 실행된 SQL 쿼리 수',
+                '# TYPE accounting_db_queries_total counter',
+            ]
+            for (view, method), stats in items:
+                lines.append(f'accounting_db_queries_total{{view="{_escape(view)}",method="{method}"}} {stats.query_count}')
+            
+            lines += [
+                '# HELP accounting_db_query_seconds_total 요청 중 SQL 실행 시간',
+                '# TYPE accounting_db_query_seconds_total counter',
+            ]
+            for (view, method), stats in items:
+                lines.append(
+                    f'accounting_db_query_seconds_total{{view="{_escape(view)}",method="{method}"}} {stats.query_seconds:.6f}'
+                )
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+request_metrics = RequestMetrics()
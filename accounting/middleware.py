@@ -0,0 +1,52 @@
+from contextlib import ExitStack
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import request_metrics
+from .profiling import QueryTimer
+
+logger = logging.getLogger(__name__)
+
+
+class PerformanceMiddleware:
+    """요청별 처리 시간, SQL 쿼리 수/시간을 URL 이름 기준으로 기록 (/metrics, Server-Timing 헤더, 로그)
+
+    스트리밍 응답은 응답 본문을 보내기 전까지만 측정합니다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_threshold = getattr(settings, 'SLOW_REQUEST_THRESHOLD', 1.0)
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+        
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unmatched'
+        request_metrics.record(view, request.method, response.status_code, elapsed, timer.count, timer.seconds)
+        
+        response['Server-Timing'] = f'app;dur={elapsed * 1000:.1f}, db;dur={timer.seconds * 1000:.1f}'
+        level = logging.WARNING if elapsed >= self.slow_threshold else logging.DEBUG
+        if logger.isEnabledFor(level):
+            logger.log(
+                level,
+                '%s %s %s %.1fms (SQL %d건, %.1fms)',
+                request.method, request.path, response.status_code, elapsed * 1000, timer.count, timer.seconds * 1000,
+                extra={
+                    'view': view,
+                    'status': response.status_code,
+                    'duration_ms': round(elapsed * 1000, 1),
+                    'db_queries': timer.count,
+                    'db_ms': round(timer.seconds * 1000, 1),
+                }
+            )
+        return response
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processinglog',
+            name='duration_seconds',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='processinglog',
+            name='rows_per_second',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
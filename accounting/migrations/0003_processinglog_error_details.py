@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0002_processinglog_throughput'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processinglog',
+            name='error_details',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
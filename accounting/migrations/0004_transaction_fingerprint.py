@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:31
+
+import hashlib
+import zoneinfo
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_fingerprints(apps, schema_editor):
+    """기존 거래 내역의 중복 판별 키 채우기 (동일 키가 여러 건이면 첫 건만)"""
+    Transaction = apps.get_model('accounting', 'Transaction')
+    local_tz = zoneinfo.ZoneInfo(settings.TIME_ZONE)
+    seen = set()
+    updates = []
+
+    for transaction in Transaction.objects.order_by('transaction_id').iterator(chunk_size=2000):
+        key = '|'.join([
+            transaction.transaction_date.astimezone(local_tz).strftime('%Y-%m-%d %H:%M:%S'),
+            transaction.description,
+            format(transaction.income_amount, '.2f'),
+            format(transaction.expense_amount, '.2f'),
+            format(transaction.balance_after, '.2f'),
+            transaction.branch_name or '',
+        ])
+        fingerprint = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        transaction.fingerprint = fingerprint
+        updates.append(transaction)
+
+    Transaction.objects.bulk_update(updates, ['fingerprint'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0003_processinglog_error_details'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processinglog',
+            name='records_skipped',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:33
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def populate_rollups(apps, schema_editor):
+    """기존 거래 내역으로 일별/월별 집계 생성"""
+    Transaction = apps.get_model('accounting', 'Transaction')
+    DailyRollup = apps.get_model('accounting', 'DailyRollup')
+    MonthlyRollup = apps.get_model('accounting', 'MonthlyRollup')
+    daily = defaultdict(lambda: [Decimal('0'), 0])
+    monthly = defaultdict(lambda: [Decimal('0'), 0])
+
+    rows = Transaction.objects.values_list(
+        'transaction_date', 'company_id', 'category_id', 'transaction_type', 'amount'
+    ).iterator(chunk_size=2000)
+    for transaction_date, company_id, category_id, transaction_type, amount in rows:
+        day = timezone.localtime(transaction_date).date()
+        for totals, period in ((daily, day), (monthly, day.replace(day=1))):
+            entry = totals[(period, company_id or '', category_id or '', transaction_type)]
+            entry[0] += amount
+            entry[1] += 1
+
+    for model, totals in ((DailyRollup, daily), (MonthlyRollup, monthly)):
+        model.objects.bulk_create([
+            model(
+                period=period,
+                company_id=company_id,
+                category_id=category_id,
+                transaction_type=transaction_type,
+                total_amount=amount,
+                transaction_count=count
+            )
+            for (period, company_id, category_id, transaction_type), (amount, count) in totals.items()
+        ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0004_transaction_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField()),
+                ('company_id', models.CharField(blank=True, default='', max_length=20)),
+                ('category_id', models.CharField(blank=True, default='', max_length=20)),
+                ('transaction_type', models.CharField(choices=[('income', '입금'), ('expense', '출금')], max_length=10)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0.0, max_digits=18)),
+                ('transaction_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '월별 집계',
+                'verbose_name_plural': '월별 집계들',
+                'db_table': 'monthly_rollups',
+                'abstract': False,
+                'unique_together': {('period', 'company_id', 'category_id', 'transaction_type')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField()),
+                ('company_id', models.CharField(blank=True, default='', max_length=20)),
+                ('category_id', models.CharField(blank=True, default='', max_length=20)),
+                ('transaction_type', models.CharField(choices=[('income', '입금'), ('expense', '출금')], max_length=10)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0.0, max_digits=18)),
+                ('transaction_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '일별 집계',
+                'verbose_name_plural': '일별 집계들',
+                'db_table': 'daily_rollups',
+                'abstract': False,
+                'unique_together': {('period', 'company_id', 'category_id', 'transaction_type')},
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
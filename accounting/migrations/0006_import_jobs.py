@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0005_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processinglog',
+            name='status',
+            field=models.CharField(choices=[('pending', '대기'), ('running', '처리 중'), ('completed', '완료'), ('failed', '실패')], default='completed', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('job_id', models.AutoField(primary_key=True, serialize=False)),
+                ('file_path', models.CharField(max_length=500)),
+                ('file_name', models.CharField(max_length=200)),
+                ('import_mode', models.CharField(default='incremental', max_length=20)),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '처리 중'), ('completed', '완료'), ('failed', '실패')], default='pending', max_length=10)),
+                ('worker', models.CharField(blank=True, max_length=100, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('log', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='job', to='accounting.processinglog')),
+            ],
+            options={
+                'verbose_name': '가져오기 작업',
+                'verbose_name_plural': '가져오기 작업들',
+                'db_table': 'import_jobs',
+                'indexes': [models.Index(fields=['status', 'job_id'], name='import_jobs_status_8ac9c3_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0006_import_jobs'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='transaction_company_e2b105_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='transaction_categor_bf503b_idx',
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['transaction_date', 'transaction_id'], name='transactions_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['company', 'transaction_date', 'transaction_id'], name='transactions_company_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['category', 'transaction_date', 'transaction_id'], name='transactions_category_date_idx'),
+        ),
+    ]
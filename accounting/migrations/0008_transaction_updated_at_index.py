@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0007_transaction_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['updated_at'], name='transactions_updated_at_idx'),
+        ),
+    ]
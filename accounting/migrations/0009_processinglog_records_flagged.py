@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0008_transaction_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processinglog',
+            name='records_flagged',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='processinglog',
+            name='process_type',
+            field=models.CharField(choices=[('import', '가져오기'), ('classification', '분류'), ('export', '내보내기'), ('reconciliation', '잔액 검증')], max_length=20),
+        ),
+    ]
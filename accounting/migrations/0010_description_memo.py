@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:47
+
+import hashlib
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_description_hashes(apps, schema_editor):
+    """기존 거래 내역의 정규화된 적요 해시 채우기"""
+    Transaction = apps.get_model('accounting', 'Transaction')
+    updates = []
+
+    for transaction in Transaction.objects.only('transaction_id', 'description').iterator(chunk_size=2000):
+        normalized = ' '.join(str(transaction.description).split())
+        transaction.description_hash = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        updates.append(transaction)
+        if len(updates) >= 2000:
+            Transaction.objects.bulk_update(updates, ['description_hash'], batch_size=500)
+            updates = []
+
+    Transaction.objects.bulk_update(updates, ['description_hash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0009_processinglog_records_flagged'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processinglog',
+            name='metrics',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='description_hash',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=64),
+        ),
+        migrations.CreateModel(
+            name='DescriptionMemo',
+            fields=[
+                ('description_hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('description', models.CharField(max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('keyword', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='memos', to='accounting.classificationkeyword')),
+            ],
+            options={
+                'verbose_name': '적요 분류 메모',
+                'verbose_name_plural': '적요 분류 메모들',
+                'db_table': 'description_memos',
+            },
+        ),
+        migrations.RunPython(backfill_description_hashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0010_description_memo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='matched_keyword',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='matched_transactions', to='accounting.classificationkeyword'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+from django.db import migrations
+
+FTS_TABLE = 'transactions_fts'
+
+CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        description, content='transactions', content_rowid='transaction_id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.transaction_id, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.transaction_id, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF description ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.transaction_id, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.transaction_id, new.description);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_STATEMENTS = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def _supports_trigram(schema_editor):
+    """SQLite이고 FTS5 trigram 토크나이저(SQLite 3.34+)를 쓸 수 있는지"""
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.fts_trigram_probe USING fts5(value, tokenize='trigram')")
+            cursor.execute("DROP TABLE temp.fts_trigram_probe")
+        except Exception:
+            return False
+    return True
+
+
+def create_fts_index(apps, schema_editor):
+    """적요 전문 검색 인덱스와 동기화 트리거 생성 (지원하지 않는 DB에서는 건너뜀, 검색은 LIKE 사용)"""
+    if not _supports_trigram(schema_editor):
+        return
+    for statement in CREATE_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0011_transaction_matched_keyword'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
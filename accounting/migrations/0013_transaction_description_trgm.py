@@ -0,0 +1,39 @@
+from django.db import migrations, transaction
+
+INDEX_NAME = 'transactions_description_trgm_idx'
+
+
+def create_trgm_index(apps, schema_editor):
+    """PostgreSQL: 적요 icontains 검색용 pg_trgm GIN 인덱스 (확장을 만들 권한이 없으면 건너뜀)
+
+    Django의 icontains는 UPPER(description::text) LIKE UPPER(...)로 변환되므로 같은 식에 인덱스를 만듭니다.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    try:
+        with transaction.atomic(using=connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except Exception:
+        return
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON transactions '
+        f'USING gin ((UPPER(description::text)) gin_trgm_ops)'
+    )
+
+
+def drop_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0012_transaction_description_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trgm_index, drop_trgm_index),
+    ]
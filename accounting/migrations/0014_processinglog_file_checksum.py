@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0013_transaction_description_trgm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processinglog',
+            name='file_checksum',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AlterField(
+            model_name='processinglog',
+            name='process_type',
+            field=models.CharField(choices=[('import', '가져오기'), ('classification', '분류'), ('export', '내보내기'), ('reconciliation', '잔액 검증'), ('batch_import', '일괄 가져오기')], max_length=20),
+        ),
+    ]
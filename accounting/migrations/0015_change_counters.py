@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0014_processinglog_file_checksum'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeCounter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '변경 카운터',
+                'verbose_name_plural': '변경 카운터들',
+                'db_table': 'change_counters',
+            },
+        ),
+    ]
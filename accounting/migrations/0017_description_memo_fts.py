@@ -0,0 +1,94 @@
+from django.db import migrations, transaction
+
+FTS_TABLE = 'description_memos_fts'
+TRGM_INDEX_NAME = 'description_memos_description_trgm_idx'
+
+CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        description, content='description_memos', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON description_memos BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.rowid, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON description_memos BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.rowid, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF description ON description_memos BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.rowid, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.rowid, new.description);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_STATEMENTS = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def _supports_trigram(schema_editor):
+    """SQLite이고 FTS5 trigram 토크나이저(SQLite 3.34+)를 쓸 수 있는지"""
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.fts_trigram_probe USING fts5(value, tokenize='trigram')")
+            cursor.execute("DROP TABLE temp.fts_trigram_probe")
+        except Exception:
+            return False
+    return True
+
+
+def create_memo_index(apps, schema_editor):
+    """적요 메모 부분 문자열 검색 인덱스 (키워드 변경 시 메모 무효화용)
+
+    SQLite: FTS5 trigram 인덱스와 동기화 트리거, PostgreSQL: contains(description::text LIKE)용 pg_trgm GIN 인덱스.
+    지원하지 않으면 건너뛰며 무효화는 LIKE 검색을 사용합니다.
+    """
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        try:
+            with transaction.atomic(using=connection.alias):
+                schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        except Exception:
+            return
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {TRGM_INDEX_NAME} ON description_memos '
+            f'USING gin ((description::text) gin_trgm_ops)'
+        )
+        return
+    if not _supports_trigram(schema_editor):
+        return
+    for statement in CREATE_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+def drop_memo_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {TRGM_INDEX_NAME}')
+    elif vendor == 'sqlite':
+        for statement in DROP_STATEMENTS:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0016_import_job_lease'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_memo_index, drop_memo_index),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0017_description_memo_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StagedTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transaction_date', models.DateTimeField()),
+                ('description', models.CharField(max_length=200)),
+                ('income_amount', models.DecimalField(decimal_places=2, default=0.0, max_digits=15)),
+                ('expense_amount', models.DecimalField(decimal_places=2, default=0.0, max_digits=15)),
+                ('balance_after', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('branch_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('transaction_type', models.CharField(choices=[('income', '입금'), ('expense', '출금')], max_length=10)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('description_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('log', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='staged_transactions', to='accounting.processinglog')),
+            ],
+            options={
+                'verbose_name': '교체 대기 거래',
+                'verbose_name_plural': '교체 대기 거래들',
+                'db_table': 'staged_transactions',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='stagedtransaction',
+            constraint=models.UniqueConstraint(fields=('log', 'fingerprint'), name='staged_transactions_log_fingerprint'),
+        ),
+    ]
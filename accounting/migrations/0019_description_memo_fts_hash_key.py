@@ -0,0 +1,104 @@
+from django.db import migrations
+
+FTS_TABLE = 'description_memos_fts'
+
+# 0017의 외부 콘텐츠 인덱스는 description_memos의 암시적 rowid를 키로 써서
+# VACUUM 등으로 rowid가 다시 매겨지면 인덱스가 엉뚱한 메모를 가리킬 수 있습니다.
+# 적요를 직접 저장하는 독립 FTS 테이블로 바꾸고 메모 해시(기본 키)로 연결합니다.
+# 해시 열도 trigram으로 색인해 삭제/수정 트리거가 전체 검색 없이 해당 행을 찾습니다.
+DROP_OLD_STATEMENTS = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        description_hash, description, tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON description_memos BEGIN
+        INSERT INTO {FTS_TABLE}(description_hash, description) VALUES (new.description_hash, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON description_memos BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid IN (
+            SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH 'description_hash : "' || old.description_hash || '"'
+        );
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF description_hash, description ON description_memos BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid IN (
+            SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH 'description_hash : "' || old.description_hash || '"'
+        );
+        INSERT INTO {FTS_TABLE}(description_hash, description) VALUES (new.description_hash, new.description);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}(description_hash, description) SELECT description_hash, description FROM description_memos",
+]
+
+# 되돌리기: 0017의 외부 콘텐츠 인덱스로 복원
+OLD_CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        description, content='description_memos', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON description_memos BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.rowid, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON description_memos BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.rowid, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF description ON description_memos BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.rowid, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.rowid, new.description);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+
+def _has_memo_index(schema_editor):
+    """0017에서 SQLite 메모 인덱스를 만들었는지 (trigram 미지원이면 만들지 않음)"""
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        return FTS_TABLE in connection.introspection.table_names(cursor)
+
+
+def rekey_memo_index(apps, schema_editor):
+    """적요 메모 인덱스를 메모 해시 기준 독립 FTS 테이블로 재생성"""
+    if not _has_memo_index(schema_editor):
+        return
+    for statement in DROP_OLD_STATEMENTS + CREATE_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+def restore_rowid_index(apps, schema_editor):
+    if not _has_memo_index(schema_editor):
+        return
+    for statement in DROP_OLD_STATEMENTS + OLD_CREATE_STATEMENTS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0018_staged_transactions'),
+    ]
+
+    operations = [
+        migrations.RunPython(rekey_memo_index, restore_rowid_index),
+    ]
@@ -0,0 +1,69 @@
+import hashlib
+
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def backfill_memos_and_matched_keywords(apps, schema_editor):
+    """0010/0011 이전에 저장·분류된 거래의 적요 메모와 매칭 키워드 채우기
+
+    키워드 추가/수정/삭제 시 다시 분류할 거래는 적요 메모(적요 해시)와 matched_keyword로 찾으므로,
+    비어 있으면 기존 거래가 재분류 대상에서 빠집니다.
+    현재 키워드로 한 번 매칭하여 (키워드 pk 순서가 우선순위, 분류기와 동일)
+    - 아직 메모가 없는 적요 해시마다 메모(매칭 없음 포함)를 만들고
+    - 분류된 거래 중 매칭 키워드가 비어 있고 매칭 결과가 현재 계정과목과 같은 거래에 매칭 키워드를 기록합니다.
+    계정과목은 바꾸지 않습니다.
+    """
+    Transaction = apps.get_model('accounting', 'Transaction')
+    ClassificationKeyword = apps.get_model('accounting', 'ClassificationKeyword')
+    DescriptionMemo = apps.get_model('accounting', 'DescriptionMemo')
+
+    keywords = list(ClassificationKeyword.objects.order_by('pk').values_list('pk', 'keyword', 'category_id'))
+    known = set(DescriptionMemo.objects.values_list('description_hash', flat=True))
+    matches = {}
+
+    def match(normalized):
+        for keyword_id, keyword, category_id in keywords:
+            if keyword in normalized:
+                return keyword_id, category_id
+        return None, None
+
+    memos = []
+    updates = []
+    transactions = Transaction.objects.only(
+        'transaction_id', 'description', 'description_hash', 'category_id', 'matched_keyword_id', 'is_classified'
+    ).order_by('transaction_id')
+    for transaction in transactions.iterator(chunk_size=BATCH_SIZE):
+        normalized = ' '.join(str(transaction.description).split())
+        key = transaction.description_hash or hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        if key not in matches:
+            matches[key] = match(normalized)
+            if key not in known:
+                memos.append(DescriptionMemo(description_hash=key, description=normalized, keyword_id=matches[key][0]))
+        keyword_id, category_id = matches[key]
+        if (transaction.is_classified and transaction.matched_keyword_id is None
+                and keyword_id is not None and category_id == transaction.category_id):
+            transaction.matched_keyword_id = keyword_id
+            updates.append(transaction)
+
+        if len(memos) >= BATCH_SIZE:
+            DescriptionMemo.objects.bulk_create(memos, batch_size=500, ignore_conflicts=True)
+            memos = []
+        if len(updates) >= BATCH_SIZE:
+            Transaction.objects.bulk_update(updates, ['matched_keyword'], batch_size=500)
+            updates = []
+
+    DescriptionMemo.objects.bulk_create(memos, batch_size=500, ignore_conflicts=True)
+    Transaction.objects.bulk_update(updates, ['matched_keyword'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0019_description_memo_fts_hash_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_memos_and_matched_keywords, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,18 @@
+import hashlib
+
 from django.db import models
 from django.utils import timezone
 
+
+def normalize_description(description):
+    """적요 정규화 (앞뒤 공백 제거, 연속 공백은 하나로)"""
+    return ' '.join(str(description).split())
+
+
+def description_hash(description):
+    """정규화된 적요의 SHA-256 (분류 메모 조회 키)"""
+    return hashlib.sha256(normalize_description(description).encode('utf-8')).hexdigest()
+
 class Company(models.Model):
     """회사 정보 모델"""
     company_id = models.CharField(max_length=20, primary_key=True)
@@ -73,6 +85,12 @@ class Transaction(models.Model):
     transaction_type = models.CharField(max_length=10, choices=TRANSACTION_TYPES)
     amount = models.DecimalField(max_digits=15, decimal_places=2)
     is_classified = models.BooleanField(default=False)
+    matched_keyword = models.ForeignKey(
+        ClassificationKeyword, on_delete=models.SET_NULL, null=True, blank=True, editable=False,
+        related_name='matched_transactions'
+    )
+    fingerprint = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
+    description_hash = models.CharField(max_length=64, blank=True, default='', db_index=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -82,29 +100,117 @@ class Transaction(models.Model):
         verbose_name_plural = '거래 내역들'
         indexes = [
             models.Index(fields=['transaction_date']),
-            models.Index(fields=['company']),
-            models.Index(fields=['category']),
+            models.Index(fields=['transaction_date', 'transaction_id'], name='transactions_date_id_idx'),
+            models.Index(fields=['company', 'transaction_date', 'transaction_id'], name='transactions_company_date_idx'),
+            models.Index(fields=['category', 'transaction_date', 'transaction_id'], name='transactions_category_date_idx'),
             models.Index(fields=['is_classified']),
+            models.Index(fields=['updated_at'], name='transactions_updated_at_idx'),
         ]
 
     def __str__(self):
         return f"{self.transaction_date.strftime('%Y-%m-%d')} - {self.description}"
 
+    def save(self, *args, **kwargs):
+        self.description_hash = description_hash(self.description)
+        super().save(*args, **kwargs)
+
+class DescriptionMemo(models.Model):
+    """적요 분류 메모 모델 (정규화된 적요 해시 -> 매칭 키워드, 매칭 없음은 키워드 없이 기록)"""
+    description_hash = models.CharField(max_length=64, primary_key=True)
+    description = models.CharField(max_length=200)
+    keyword = models.ForeignKey(
+        ClassificationKeyword, on_delete=models.CASCADE, null=True, blank=True, related_name='memos'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'description_memos'
+        verbose_name = '적요 분류 메모'
+        verbose_name_plural = '적요 분류 메모들'
+
+    def __str__(self):
+        return f"{self.description} -> {self.keyword.keyword if self.keyword_id else '매칭 없음'}"
+
+class ChangeCounter(models.Model):
+    """프로세스 간 공유하는 변경 카운터 (분류 규칙 버전 등, accounting.versions 참고)"""
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'change_counters'
+        verbose_name = '변경 카운터'
+        verbose_name_plural = '변경 카운터들'
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+class RollupBase(models.Model):
+    """기간별 집계 공통 모델 (회사/계정과목이 없으면 빈 문자열)"""
+    period = models.DateField()
+    company_id = models.CharField(max_length=20, blank=True, default='')
+    category_id = models.CharField(max_length=20, blank=True, default='')
+    transaction_type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPES)
+    total_amount = models.DecimalField(max_digits=18, decimal_places=2, default=0.00)
+    transaction_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+        unique_together = ['period', 'company_id', 'category_id', 'transaction_type']
+
+    def __str__(self):
+        return f"{self.period} - {self.company_id or '-'}/{self.category_id or '-'} - {self.transaction_type}"
+
+class DailyRollup(RollupBase):
+    """일별 집계 모델"""
+
+    class Meta(RollupBase.Meta):
+        db_table = 'daily_rollups'
+        verbose_name = '일별 집계'
+        verbose_name_plural = '일별 집계들'
+
+class MonthlyRollup(RollupBase):
+    """월별 집계 모델 (period는 해당 월의 1일)"""
+
+    class Meta(RollupBase.Meta):
+        db_table = 'monthly_rollups'
+        verbose_name = '월별 집계'
+        verbose_name_plural = '월별 집계들'
+
 class ProcessingLog(models.Model):
     """처리 로그 모델"""
     PROCESS_TYPES = [
         ('import', '가져오기'),
         ('classification', '분류'),
         ('export', '내보내기'),
+        ('reconciliation', '잔액 검증'),
+        ('batch_import', '일괄 가져오기'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('pending', '대기'),
+        ('running', '처리 중'),
+        ('completed', '완료'),
+        ('failed', '실패'),
     ]
     
     log_id = models.AutoField(primary_key=True)
     process_type = models.CharField(max_length=20, choices=PROCESS_TYPES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='completed')
     file_name = models.CharField(max_length=200, blank=True, null=True)
+    # 가져온 파일의 SHA-256 (python manage.py import_statements 재실행 시 완료된 파일 건너뛰기)
+    file_checksum = models.CharField(max_length=64, blank=True, null=True, db_index=True)
     records_processed = models.IntegerField(default=0)
     records_successful = models.IntegerField(default=0)
     records_failed = models.IntegerField(default=0)
+    records_skipped = models.IntegerField(default=0)
+    records_flagged = models.IntegerField(default=0)
     error_message = models.TextField(blank=True, null=True)
+    error_details = models.JSONField(default=list, blank=True)
+    duration_seconds = models.FloatField(blank=True, null=True)
+    rows_per_second = models.FloatField(blank=True, null=True)
+    metrics = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -114,3 +220,55 @@ class ProcessingLog(models.Model):
 
     def __str__(self):
         return f"{self.process_type} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+
+class ImportJob(models.Model):
+    """비동기 가져오기 작업 모델 (DB 기반 작업 큐)"""
+    job_id = models.AutoField(primary_key=True)
+    file_path = models.CharField(max_length=500)
+    file_name = models.CharField(max_length=200)
+    import_mode = models.CharField(max_length=20, default='incremental')
+    status = models.CharField(max_length=10, choices=ProcessingLog.STATUS_CHOICES, default='pending')
+    log = models.OneToOneField(ProcessingLog, on_delete=models.SET_NULL, null=True, blank=True, related_name='job')
+    worker = models.CharField(max_length=100, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    # 처리 중인 작업자가 청크마다 갱신 (오래 갱신되지 않으면 다른 작업자가 다시 가져감)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    attempts = models.IntegerField(default=0)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'import_jobs'
+        verbose_name = '가져오기 작업'
+        verbose_name_plural = '가져오기 작업들'
+        indexes = [
+            models.Index(fields=['status', 'job_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} - {self.file_name} ({self.status})"
+
+class StagedTransaction(models.Model):
+    """전체 교체 가져오기 중인 새 거래 (청크마다 커밋해 두었다가 마지막에 거래 내역과 한 번에 교체)"""
+    log = models.ForeignKey(ProcessingLog, on_delete=models.CASCADE, related_name='staged_transactions')
+    transaction_date = models.DateTimeField()
+    description = models.CharField(max_length=200)
+    income_amount = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
+    expense_amount = models.DecimalField(max_digits=15, decimal_places=2, default=0.00)
+    balance_after = models.DecimalField(max_digits=15, decimal_places=2)
+    branch_name = models.CharField(max_length=100, blank=True, null=True)
+    transaction_type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPES)
+    amount = models.DecimalField(max_digits=15, decimal_places=2)
+    fingerprint = models.CharField(max_length=64)
+    description_hash = models.CharField(max_length=64, blank=True, default='')
+
+    class Meta:
+        db_table = 'staged_transactions'
+        verbose_name = '교체 대기 거래'
+        verbose_name_plural = '교체 대기 거래들'
+        constraints = [
+            models.UniqueConstraint(fields=['log', 'fingerprint'], name='staged_transactions_log_fingerprint'),
+        ]
+
+    def __str__(self):
+        return f"{self.log_id} - {self.description}"
@@ -0,0 +1,109 @@
+import base64
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class TransactionKeysetPagination(BasePagination):
+    """(거래일시, 거래 ID) 기준 키셋 페이지네이션
+
+    OFFSET과 COUNT(*) 없이 마지막 행의 키 다음부터 조회하므로
+    깊은 페이지도 첫 페이지와 같은 비용으로 조회됩니다.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('transaction_date', 'transaction_id')
+
+    def get_page_size(self, request):
+        page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 20
+        try:
+            requested = int(request.query_params.get(self.page_size_query_param, page_size))
+        except (TypeError, ValueError):
+            return page_size
+        return max(1, min(requested, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            return datetime.fromisoformat(data['d']), int(data['i']), bool(data.get('r'))
+        except (ValueError, KeyError, TypeError):
+            raise NotFound('잘못된 커서 값입니다.')
+
+    def encode_cursor(self, row, reverse):
+        # 모델 객체와 값 조회(dict) 결과 모두 지원
+        if isinstance(row, dict):
+            position_date, position_id = row['transaction_date'], row['transaction_id']
+        else:
+            position_date, position_id = row.transaction_date, row.transaction_id
+        data = {'d': position_date.isoformat(), 'i': position_id}
+        if reverse:
+            data['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(data).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        cursor = self.decode_cursor(request)
+        
+        if cursor is None:
+            reverse = False
+            queryset = queryset.order_by(*self.ordering)
+        else:
+            position_date, position_id, reverse = cursor
+            # 범위 조건(>=, <=)을 함께 주어 인덱스 탐색으로 시작 위치를 찾도록 함
+            if reverse:
+                queryset = queryset.filter(transaction_date__lte=position_date).filter(
+                    Q(transaction_date__lt=position_date)
+                    | Q(transaction_date=position_date, transaction_id__lt=position_id)
+                ).order_by('-transaction_date', '-transaction_id')
+            else:
+                queryset = queryset.filter(transaction_date__gte=position_date).filter(
+                    Q(transaction_date__gt=position_date)
+                    | Q(transaction_date=position_date, transaction_id__gt=position_id)
+                ).order_by(*self.ordering)
+        
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+        
+        # 정방향이면 다음 페이지는 더 있을 때만, 이전 페이지는 커서가 있을 때만 존재
+        has_next = has_more if not reverse else True
+        has_previous = cursor is not None if not reverse else has_more
+        self.next_link = self.encode_cursor(rows[-1], reverse=False) if rows and has_next else None
+        if rows and has_previous:
+            self.previous_link = self.encode_cursor(rows[0], reverse=True)
+        elif cursor is not None and not rows:
+            self.previous_link = remove_query_param(self.base_url, self.cursor_query_param)
+        else:
+            self.previous_link = None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.next_link,
+            'previous': self.previous_link,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
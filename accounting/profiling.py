@@ -0,0 +1,213 @@
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+import os
+import threading
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.db import connections
+
+from .models import ProcessingLog
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+class QueryTimer:
+    """execute_wrapper: SQL 실행 횟수와 시간 누적"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+def _current_rss_bytes():
+    """현재 상주 메모리 (Linux /proc/self/statm, 읽을 수 없으면 None)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class RssSampler:
+    """실행 구간의 상주 메모리를 주기적으로 읽어 시작값과 최대값 기록
+
+    ru_maxrss는 프로세스 수명 전체의 최대값이라 같은 프로세스의 이전 실행(작업자 등)에 가려지므로
+    이번 실행 동안 관측한 값만 사용합니다. 샘플 간격(IMPORT_RSS_SAMPLE_INTERVAL)보다 짧은 순간 최대값은 놓칠 수 있습니다.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.start_bytes = _current_rss_bytes()
+        self.peak_bytes = self.start_bytes
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='rss-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        if self.start_bytes is not None:
+            self._thread.start()
+        return self
+
+    def sample(self):
+        """현재 값을 읽어 최대값 갱신 (종료 후에는 무시)"""
+        if self._stopped.is_set() or self.start_bytes is None:
+            return
+        current = _current_rss_bytes()
+        if current is not None and current > self.peak_bytes:
+            self.peak_bytes = current
+
+    def stop(self):
+        self.sample()
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+
+class PipelineProfiler:
+    """처리 단계별 소요 시간/SQL 시간, 전체 SQL 시간, 실행 구간 최대 메모리 측정
+
+    with profiler.track(): 안에서 with profiler.stage('insert'): 처럼 단계를 감싸면
+    같은 단계는 여러 번 호출해도 누적됩니다. 메모리는 track() 구간에서 관측한 최대 상주 메모리와
+    시작 시점 대비 증가량이며, IMPORT_TRACE_MEMORY가 True이면 tracemalloc으로 같은 구간의
+    최대 Python 할당량도 기록합니다 (추적 비용 있음).
+    """
+
+    def __init__(self, trace_memory=None):
+        if trace_memory is None:
+            trace_memory = getattr(settings, 'IMPORT_TRACE_MEMORY', False)
+        self.trace_memory = trace_memory
+        self.queries = QueryTimer()
+        self.stages = defaultdict(lambda: {'seconds': 0.0, 'db_seconds': 0.0, 'calls': 0})
+        self.rss = None
+        self.peak_traced_bytes = None
+        self._tracing = False
+
+    @contextmanager
+    def track(self):
+        """모든 DB 연결에 SQL 측정을 설치하고 메모리 관측 시작"""
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            # 이미 추적 중이면 최대값만 초기화하여 이번 구간의 최대값을 기록
+            tracemalloc.reset_peak()
+        self._tracing = self.trace_memory
+        self.rss = RssSampler(getattr(settings, 'IMPORT_RSS_SAMPLE_INTERVAL', 0.05)).start()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self.queries))
+                yield self
+        finally:
+            self.rss.stop()
+            self._update_traced_peak()
+            self._tracing = False
+            if started_tracing:
+                tracemalloc.stop()
+
+    def _update_traced_peak(self):
+        if self._tracing and tracemalloc.is_tracing():
+            self.peak_traced_bytes = tracemalloc.get_traced_memory()[1]
+
+    @contextmanager
+    def stage(self, name):
+        stats = self.stages[name]
+        started = time.perf_counter()
+        db_started = self.queries.seconds
+        try:
+            yield
+        finally:
+            stats['seconds'] += time.perf_counter() - started
+            stats['db_seconds'] += self.queries.seconds - db_started
+            stats['calls'] += 1
+
+    def add_stage(self, name, seconds, calls=1):
+        """다른 프로세스에서 측정한 단계 시간 합산 (SQL 시간 없음)"""
+        stats = self.stages[name]
+        stats['seconds'] += seconds
+        stats['calls'] += calls
+
+    def as_metrics(self, rows):
+        """처리 로그 metrics에 저장할 딕셔너리 (rows: 처리 행 수, 단계별 행/초 계산용, 단계는 실행 순서)
+
+        track() 안에서 호출하면 메모리 값은 호출 시점까지의 최대값입니다.
+        """
+        run_peak_rss_bytes = run_rss_growth_bytes = None
+        if self.rss is not None and self.rss.start_bytes is not None:
+            self.rss.sample()
+            run_peak_rss_bytes = self.rss.peak_bytes
+            run_rss_growth_bytes = self.rss.peak_bytes - self.rss.start_bytes
+        self._update_traced_peak()
+        stages = {}
+        for name, stats in self.stages.items():
+            stages[name] = {
+                'seconds': round(stats['seconds'], 6),
+                'db_seconds': round(stats['db_seconds'], 6),
+                'calls': stats['calls'],
+                'rows_per_second': round(rows / stats['seconds'], 1) if rows and stats['seconds'] > 0 else None,
+            }
+        return {
+            'stages': stages,
+            'db_seconds': round(self.queries.seconds, 6),
+            'db_queries': self.queries.count,
+            'run_peak_rss_bytes': run_peak_rss_bytes,
+            'run_rss_growth_bytes': run_rss_growth_bytes,
+            'run_peak_traced_bytes': self.peak_traced_bytes,
+        }
+
+    def save(self, log):
+        """처리 로그 metrics에 현재까지의 측정값 기록 (기존 키는 유지)"""
+        log.metrics = {**(log.metrics or {}), **self.as_metrics(log.records_processed)}
+        log.save(update_fields=['metrics'])
+
+
+def throughput_trends(process_type='import', limit=50):
+    """최근 완료된 처리 로그의 처리량/단계별 시간 추이 (오래된 순)
+
+    반환값: {'runs': [...], 'baseline': {...}}. baseline은 마지막 실행을 제외한
+    이전 실행들의 중앙값이며, 마지막 실행의 행/초가 중앙값 대비 얼마인지(ratio)를 함께 돌려줍니다.
+    """
+    logs = list(
+        ProcessingLog.objects.filter(process_type=process_type, status='completed', rows_per_second__isnull=False)
+        .order_by('-created_at', '-log_id')
+        .values(
+            'log_id', 'created_at', 'file_name', 'records_processed', 'duration_seconds',
+            'rows_per_second', 'metrics'
+        )[:limit]
+    )
+    logs.reverse()
+
+    runs = []
+    for log in logs:
+        metrics = log.pop('metrics') or {}
+        log['stages'] = {name: stats['seconds'] for name, stats in metrics.get('stages', {}).items()}
+        log['db_seconds'] = metrics.get('db_seconds')
+        log['run_peak_rss_bytes'] = metrics.get('run_peak_rss_bytes')
+        log['run_rss_growth_bytes'] = metrics.get('run_rss_growth_bytes')
+        log['run_peak_traced_bytes'] = metrics.get('run_peak_traced_bytes')
+        runs.append(log)
+
+    baseline = None
+    if len(runs) >= 2:
+        previous = sorted(run['rows_per_second'] for run in runs[:-1])
+        middle = len(previous) // 2
+        median = previous[middle] if len(previous) % 2 else (previous[middle - 1] + previous[middle]) / 2
+        baseline = {
+            'median_rows_per_second': median,
+            'latest_rows_per_second': runs[-1]['rows_per_second'],
+            'ratio': runs[-1]['rows_per_second'] / median if median else None,
+        }
+    return {'runs': runs, 'baseline': baseline}
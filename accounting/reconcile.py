@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+from .models import Transaction
+
+# 금액 비교 허용 오차 (원 단위 이하 반올림 차이)
+BALANCE_TOLERANCE = 0.005
+
+REASON_DUPLICATE = '잔액 연속성 오류: 직전 행과 중복'
+REASON_REORDERED = '잔액 연속성 오류: 거래일시 역순'
+REASON_GAP = '잔액 연속성 오류: 누락 의심'
+
+
+def _previous_transaction(before):
+    """지정 시각 이전의 마지막 거래 (거래일시, 거래후잔액, 중복 판별 키)"""
+    return Transaction.objects.filter(transaction_date__lt=before).order_by(
+        '-transaction_date', '-transaction_id'
+    ).values_list('transaction_date', 'balance_after', 'fingerprint').first()
+
+
+class BalanceChainChecker:
+    """직전 잔액 + 입금액 - 출금액 = 거래후잔액 관계를 배열 연산으로 검사
+
+    청크를 순서대로 넘기면 마지막 행을 다음 청크로 이어받아 전체 연속성을 검사합니다.
+    오류 행 다음부터는 실제 거래후잔액을 기준으로 다시 이어가므로 누락 한 번은 한 행만 표시됩니다.
+    """
+
+    def __init__(self, previous=None, seed_from_ledger=False):
+        # previous: (거래일시, 거래후잔액, 중복 판별 키) 또는 None
+        self.previous = previous
+        self.seed_from_ledger = seed_from_ledger
+        self.checked = 0
+        self.flagged = 0
+
+    def check(self, frame):
+        """frame 컬럼: transaction_date, income_amount, expense_amount, balance_after[, fingerprint]
+
+        반환값: [(행 인덱스, 사유), ...]
+        """
+        if frame.empty:
+            return []
+        
+        dates = pd.DatetimeIndex(frame['transaction_date']).asi8
+        if self.previous is None and self.seed_from_ledger:
+            # 첫 행은 원장에 이미 있는 직전 거래와 비교
+            self.previous = _previous_transaction(frame['transaction_date'].iloc[0])
+        self.seed_from_ledger = False
+        
+        balance = frame['balance_after'].to_numpy(dtype=float)
+        income = frame['income_amount'].to_numpy(dtype=float)
+        expense = frame['expense_amount'].to_numpy(dtype=float)
+        fingerprints = frame['fingerprint'].to_numpy(dtype=object) if 'fingerprint' in frame else None
+        
+        # 한 칸씩 밀어 직전 행 값 구성 (첫 행은 이전 청크/원장의 마지막 행)
+        previous_balance = np.empty_like(balance)
+        previous_balance[1:] = balance[:-1]
+        previous_dates = np.empty_like(dates)
+        previous_dates[1:] = dates[:-1]
+        if self.previous is not None:
+            previous_dates[0] = pd.Timestamp(self.previous[0]).value
+            previous_balance[0] = float(self.previous[1])
+        else:
+            previous_dates[0] = dates[0]
+            previous_balance[0] = np.nan
+        
+        expected = previous_balance + income - expense
+        gap = np.abs(expected - balance) > BALANCE_TOLERANCE
+        reordered = dates < previous_dates
+        duplicate = np.zeros(len(frame), dtype=bool)
+        if fingerprints is not None:
+            previous_fingerprints = np.empty_like(fingerprints)
+            previous_fingerprints[1:] = fingerprints[:-1]
+            previous_fingerprints[0] = self.previous[2] if self.previous is not None else None
+            duplicate = fingerprints == previous_fingerprints
+        
+        issues = []
+        for position in np.flatnonzero(gap | reordered | duplicate):
+            if duplicate[position]:
+                reason = REASON_DUPLICATE
+            elif reordered[position]:
+                reason = REASON_REORDERED
+            else:
+                reason = (
+                    f'{REASON_GAP} (예상 잔액 {expected[position]:,.0f}, '
+                    f'거래후잔액 {balance[position]:,.0f}, 차이 {balance[position] - expected[position]:,.0f})'
+                )
+            issues.append((frame.index[position], reason))
+        
+        last = len(frame) - 1
+        self.previous = (
+            frame['transaction_date'].iloc[last],
+            balance[last],
+            fingerprints[last] if fingerprints is not None else None,
+        )
+        self.checked += len(frame)
+        self.flagged += len(issues)
+        return issues
+
+
+def iter_ledger_frames(chunk_size=50000):
+    """저장된 거래 내역을 (거래일시, 거래 ID) 순서의 DataFrame 청크로 읽기"""
+    columns = ['transaction_id', 'transaction_date', 'income_amount', 'expense_amount', 'balance_after', 'fingerprint']
+    rows = Transaction.objects.order_by('transaction_date', 'transaction_id').values_list(*columns)
+    
+    batch = []
+    for row in rows.iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            yield pd.DataFrame.from_records(batch, columns=columns, index='transaction_id')
+            batch = []
+    if batch:
+        yield pd.DataFrame.from_records(batch, columns=columns, index='transaction_id')
+
+
+def check_ledger_balances(chunk_size=50000):
+    """전체 원장의 잔액 연속성 검사
+
+    반환값: (검사기, [(거래 ID, 사유), ...])
+    """
+    checker = BalanceChainChecker()
+    issues = []
+    for frame in iter_ledger_frames(chunk_size):
+        issues.extend(checker.check(frame))
+    return checker, issues
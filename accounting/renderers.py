@@ -0,0 +1,32 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 설치되어 있지 않으면 기본 JSONRenderer로 동작
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """orjson이 설치되어 있으면 orjson으로 직렬화하는 JSON 렌더러 (뷰의 renderer_classes로 선택 사용)
+
+    기본 JSONRenderer(압축 구분자, UTF-8, U+2028/U+2029 이스케이프)와 같은 바이트를 내도록
+    날짜/시간·Decimal 등은 기본 인코더에 맡깁니다. 다른 점: NaN/Infinity는 오류 대신 null,
+    지수 표기 실수는 '1e16'처럼 '+' 없이 출력됩니다.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # 들여쓰기 요청(?indent 등)이나 ASCII/비압축 설정은 기본 렌더러에 맡김
+        if (orjson is None or data is None or not self.compact or self.ensure_ascii
+                or self.get_indent(accepted_media_type, renderer_context or {})):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            )
+        except orjson.JSONEncodeError:
+            # 64비트를 넘는 정수 등 orjson이 처리하지 못하는 값 (인코더 오류도 기본 렌더러에서 그대로 발생)
+            return super().render(data, accepted_media_type, renderer_context)
+        # 기본 렌더러와 같이 JavaScript에서 줄바꿈으로 해석되는 문자 이스케이프
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
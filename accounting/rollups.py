@@ -0,0 +1,182 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import connections, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from .models import Transaction, DailyRollup, MonthlyRollup
+from .cache import bump_data_version
+
+ROLLUP_MODELS = [
+    (DailyRollup, TruncDate, lambda day: day),
+    (MonthlyRollup, TruncMonth, lambda day: day.replace(day=1)),
+]
+
+
+class RollupDeltas:
+    """(일자, 회사, 계정과목, 거래유형)별 금액/건수 증감 누적"""
+
+    def __init__(self):
+        self.entries = defaultdict(lambda: [Decimal('0'), 0])
+
+    def add(self, day, company_id, category_id, transaction_type, amount, count=1):
+        entry = self.entries[(day, company_id or '', category_id or '', transaction_type)]
+        entry[0] += amount
+        entry[1] += count
+
+    def move(self, day, transaction_type, amount, old_key, new_key):
+        """거래 한 건의 (회사, 계정과목) 귀속 변경"""
+        old_key = tuple(value or '' for value in old_key)
+        new_key = tuple(value or '' for value in new_key)
+        if old_key == new_key:
+            return
+        self.add(day, *old_key, transaction_type, -amount, -1)
+        self.add(day, *new_key, transaction_type, amount, 1)
+
+    def merge(self, entries):
+        """다른 프로세스에서 계산한 증감(entries 딕셔너리) 합치기"""
+        for key, (amount, count) in entries.items():
+            entry = self.entries[key]
+            entry[0] += amount
+            entry[1] += count
+
+    def __bool__(self):
+        return bool(self.entries)
+
+
+def deltas_from_frame(normalized):
+    """정규화된 청크(새로 저장된 행)의 일자·유형별 증감 (미분류 상태)"""
+    deltas = RollupDeltas()
+    if normalized.empty:
+        return deltas
+    
+    grouped = normalized.groupby(
+        [normalized['transaction_date'].dt.date, 'transaction_type']
+    )['amount'].agg(['sum', 'count'])
+    for (day, transaction_type), (amount, count) in grouped.iterrows():
+        deltas.add(day, '', '', transaction_type, Decimal(f'{amount:.2f}'), int(count))
+    return deltas
+
+
+def local_date(value):
+    """저장된 거래일시를 현재 시간대 기준 날짜로 변환"""
+    return timezone.localtime(value).date()
+
+
+def apply_rollup_deltas(deltas):
+    """증감을 일별/월별 집계에 반영
+
+    INSERT ... ON CONFLICT DO UPDATE로 기존 행에 증감을 더하므로 (SQLite 3.24+, PostgreSQL)
+    여러 작업자가 동시에 반영해도 읽은 뒤 덮어쓰는 과정에서 증감이 사라지지 않습니다.
+    """
+    if not deltas:
+        return
+    
+    connection = connections[DailyRollup.objects.db]
+    quote = connection.ops.quote_name
+    updated_at = connection.ops.adapt_datetimefield_value(timezone.now())
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for model, _, to_period in ROLLUP_MODELS:
+            merged = defaultdict(lambda: [Decimal('0'), 0])
+            for (day, company_id, category_id, transaction_type), (amount, count) in deltas.entries.items():
+                entry = merged[(to_period(day), company_id, category_id, transaction_type)]
+                entry[0] += amount
+                entry[1] += count
+            
+            params = [
+                (connection.ops.adapt_datefield_value(period), company_id, category_id, transaction_type,
+                 connection.ops.adapt_decimalfield_value(amount), count, updated_at)
+                for (period, company_id, category_id, transaction_type), (amount, count) in merged.items()
+                if amount or count
+            ]
+            if not params:
+                continue
+            table = quote(model._meta.db_table)
+            cursor.executemany(
+                f'INSERT INTO {table} (period, company_id, category_id, transaction_type, '
+                f'total_amount, transaction_count, updated_at) VALUES (%s, %s, %s, %s, %s, %s, %s) '
+                f'ON CONFLICT (period, company_id, category_id, transaction_type) DO UPDATE SET '
+                f'total_amount = {table}.total_amount + excluded.total_amount, '
+                f'transaction_count = {table}.transaction_count + excluded.transaction_count, '
+                f'updated_at = excluded.updated_at',
+                params
+            )
+
+
+def deltas_for_transaction(instance, sign=1):
+    """거래 한 건의 집계 증감 (sign=-1이면 제거)"""
+    deltas = RollupDeltas()
+    deltas.add(
+        local_date(instance.transaction_date), instance.company_id, instance.category_id,
+        instance.transaction_type, sign * Decimal(str(instance.amount)), sign
+    )
+    return deltas
+
+
+def clear_rollups():
+    """집계 전체 삭제 (거래 내역 전체 교체 시)"""
+    for model, _, _ in ROLLUP_MODELS:
+        model.objects.all().delete()
+
+
+def compute_source_rollups(model):
+    """원본 거래 내역에서 집계를 GROUP BY로 직접 계산"""
+    trunc = next(trunc for rollup_model, trunc, _ in ROLLUP_MODELS if rollup_model is model)
+    rows = Transaction.objects.annotate(
+        period=trunc('transaction_date', tzinfo=timezone.get_current_timezone())
+    ).values('period', 'company_id', 'category_id', 'transaction_type').annotate(
+        total_amount=Sum('amount'),
+        transaction_count=Count('transaction_id')
+    ).order_by()
+    
+    result = defaultdict(lambda: [Decimal('0'), 0])
+    for row in rows:
+        period = row['period']
+        if hasattr(period, 'date'):
+            period = period.date()
+        entry = result[(period, row['company_id'] or '', row['category_id'] or '', row['transaction_type'])]
+        entry[0] += row['total_amount'] or Decimal('0')
+        entry[1] += row['transaction_count']
+    return result
+
+
+def rebuild_rollups():
+    """집계를 원본 거래 내역으로부터 다시 생성"""
+    with transaction.atomic():
+        for model, _, _ in ROLLUP_MODELS:
+            model.objects.all().delete()
+            model.objects.bulk_create([
+                model(
+                    period=period,
+                    company_id=company_id,
+                    category_id=category_id,
+                    transaction_type=transaction_type,
+                    total_amount=amount,
+                    transaction_count=count
+                )
+                for (period, company_id, category_id, transaction_type), (amount, count)
+                in compute_source_rollups(model).items()
+            ], batch_size=500)
+        bump_data_version()
+
+
+def check_rollups():
+    """저장된 집계와 원본 거래 내역 비교 -> {모델명: [(키, 저장값, 원본값), ...]}"""
+    mismatches = {}
+    for model, _, _ in ROLLUP_MODELS:
+        expected = compute_source_rollups(model)
+        stored = {
+            (row.period, row.company_id, row.category_id, row.transaction_type):
+                [row.total_amount, row.transaction_count]
+            for row in model.objects.all()
+        }
+        problems = []
+        for key in sorted(set(expected) | set(stored), key=str):
+            stored_value = stored.get(key, [Decimal('0'), 0])
+            expected_value = expected.get(key, [Decimal('0'), 0])
+            if stored_value != expected_value:
+                problems.append((key, stored_value, expected_value))
+        mismatches[model.__name__] = problems
+    return mismatches
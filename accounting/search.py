@@ -0,0 +1,147 @@
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# 적요 전문 검색 인덱스 (SQLite FTS5 trigram, 마이그레이션 0012에서 생성)
+FTS_TABLE = 'transactions_fts'
+# 적요 메모 검색 인덱스 (마이그레이션 0019에서 메모 해시 기준으로 재생성, 키워드 변경 시 메모 무효화용)
+MEMO_FTS_TABLE = 'description_memos_fts'
+# trigram 토크나이저는 3글자 이상부터 인덱스 사용
+FTS_MIN_LENGTH = 3
+
+_fts_available = {}
+
+
+def fts_available(using=connection, table=FTS_TABLE):
+    """현재 DB에 전문 검색 인덱스가 있는지 (연결 별칭·인덱스마다 한 번만 확인)"""
+    key = (using.alias, table)
+    if key not in _fts_available:
+        available = False
+        if using.vendor == 'sqlite':
+            with using.cursor() as cursor:
+                available = table in using.introspection.table_names(cursor)
+        _fts_available[key] = available
+    return _fts_available[key]
+
+
+def _fts_phrase(term):
+    """검색어 전체를 하나의 구문으로 (큰따옴표는 두 번 써서 이스케이프)"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def description_search_q(term):
+    """적요 부분 문자열 검색 조건 (FTS 인덱스가 있으면 사용, 짧은 검색어나 다른 DB는 LIKE)"""
+    term = term.strip()
+    if len(term) >= FTS_MIN_LENGTH and fts_available():
+        return Q(transaction_id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [_fts_phrase(term)]
+        ))
+    return Q(description__icontains=term)
+
+
+def memo_description_q(term):
+    """적요 메모 부분 문자열 조건 (키워드 변경 시 무효화 대상)
+
+    SQLite에서 메모 인덱스가 있으면 trigram 인덱스로 후보(대소문자 무시)를 좁힌 뒤 LIKE로 확인하고,
+    PostgreSQL은 pg_trgm 인덱스가 있는 LIKE를 그대로 사용합니다. 3글자 미만은 인덱스 없이 LIKE로 검색합니다.
+    """
+    condition = Q(description__contains=term)
+    if len(term) >= FTS_MIN_LENGTH and fts_available(table=MEMO_FTS_TABLE):
+        condition &= Q(description_hash__in=RawSQL(
+            f'SELECT description_hash FROM {MEMO_FTS_TABLE} WHERE {MEMO_FTS_TABLE} MATCH %s',
+            ['description : ' + _fts_phrase(term)]
+        ))
+    return condition
+
+
+def search_transactions(queryset, term):
+    """적요 검색 (검색어가 비어 있으면 그대로 반환)"""
+    if not term or not term.strip():
+        return queryset
+    return queryset.filter(description_search_q(term))
+
+
+def _fts_triggers(table, content, rowid):
+    """외부 콘텐츠 FTS 인덱스를 원본 테이블과 맞추는 트리거"""
+    return {
+        f'{table}_ai': f"""
+            CREATE TRIGGER {table}_ai AFTER INSERT ON {content} BEGIN
+                INSERT INTO {table}(rowid, description) VALUES (new.{rowid}, new.description);
+            END
+        """,
+        f'{table}_ad': f"""
+            CREATE TRIGGER {table}_ad AFTER DELETE ON {content} BEGIN
+                INSERT INTO {table}({table}, rowid, description) VALUES ('delete', old.{rowid}, old.description);
+            END
+        """,
+        f'{table}_au': f"""
+            CREATE TRIGGER {table}_au AFTER UPDATE OF description ON {content} BEGIN
+                INSERT INTO {table}({table}, rowid, description) VALUES ('delete', old.{rowid}, old.description);
+                INSERT INTO {table}(rowid, description) VALUES (new.{rowid}, new.description);
+            END
+        """,
+    }
+
+
+def _memo_fts_triggers(table, content):
+    """메모 해시로 연결한 독립 FTS 인덱스를 메모 테이블과 맞추는 트리거
+
+    메모 테이블은 문자열 기본 키라 암시적 rowid가 VACUUM 등으로 바뀔 수 있어 rowid 대신 해시 열로 찾습니다.
+    """
+    delete_old = f"""
+                DELETE FROM {table} WHERE rowid IN (
+                    SELECT rowid FROM {table} WHERE {table} MATCH 'description_hash : "' || old.description_hash || '"'
+                );"""
+    insert_new = f"""
+                INSERT INTO {table}(description_hash, description) VALUES (new.description_hash, new.description);"""
+    return {
+        f'{table}_ai': f"""
+            CREATE TRIGGER {table}_ai AFTER INSERT ON {content} BEGIN{insert_new}
+            END
+        """,
+        f'{table}_ad': f"""
+            CREATE TRIGGER {table}_ad AFTER DELETE ON {content} BEGIN{delete_old}
+            END
+        """,
+        f'{table}_au': f"""
+            CREATE TRIGGER {table}_au AFTER UPDATE OF description_hash, description ON {content} BEGIN{delete_old}{insert_new}
+            END
+        """,
+    }
+
+
+FTS_TRIGGERS = _fts_triggers(FTS_TABLE, 'transactions', 'transaction_id')
+MEMO_FTS_TRIGGERS = _memo_fts_triggers(MEMO_FTS_TABLE, 'description_memos')
+# (인덱스, 원본 테이블, 트리거, 인덱스 재구성 SQL)
+FTS_INDEXES = [
+    (FTS_TABLE, 'transactions', FTS_TRIGGERS, [f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"]),
+    (MEMO_FTS_TABLE, 'description_memos', MEMO_FTS_TRIGGERS, [
+        f'DELETE FROM {MEMO_FTS_TABLE}',
+        f'INSERT INTO {MEMO_FTS_TABLE}(description_hash, description) '
+        f'SELECT description_hash, description FROM description_memos',
+    ]),
+]
+
+
+def ensure_fts_triggers(using=connection):
+    """동기화 트리거가 빠졌으면 다시 만들고 인덱스 재구성 (하나라도 다시 만들었으면 True)
+
+    SQLite 스키마 변경(테이블 재생성) 마이그레이션은 원본 테이블의 트리거를 함께 삭제합니다.
+    """
+    restored = False
+    for table, content, triggers, rebuild in FTS_INDEXES:
+        _fts_available.pop((using.alias, table), None)
+        if not fts_available(using, table):
+            continue
+        with using.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [content])
+            existing = {row[0] for row in cursor.fetchall()}
+            missing = [name for name in triggers if name not in existing]
+            if not missing:
+                continue
+            for name in missing:
+                cursor.execute(triggers[name])
+            for statement in rebuild:
+                cursor.execute(statement)
+        restored = True
+    return restored
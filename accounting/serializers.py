@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from django.utils import timezone
 from .models import Company, Category, ClassificationKeyword, Transaction, ProcessingLog
 
 class CompanySerializer(serializers.ModelSerializer):
@@ -49,7 +51,67 @@ class TransactionSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Transaction
-        fields = '__all__'
+        # 중복 판별/분류 메모/재분류용 내부 컬럼은 응답에서 제외 (목록 빠른 경로도 이 필드 구성을 따름)
+        exclude = ['fingerprint', 'description_hash', 'matched_keyword']
+
+def _int_amount(value):
+    return int(value) if value else 0
+
+def _datetime_formatter(tz):
+    """DateTimeField와 동일한 형식 (현재 시간대, UTC는 Z 표기)"""
+    def format_datetime(value):
+        text = value.astimezone(tz).isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    return format_datetime
+
+_RAW_FIELD_TYPES = (
+    serializers.CharField, serializers.BooleanField, serializers.IntegerField,
+    serializers.ChoiceField, PrimaryKeyRelatedField,
+)
+_transaction_list_plan = None
+
+def _get_transaction_list_plan():
+    """TransactionSerializer 필드 구성으로부터 (응답 키, 조회 컬럼, 변환 함수, None이면 생략) 목록 생성"""
+    global _transaction_list_plan
+    if _transaction_list_plan is None:
+        plan = []
+        for name, field in TransactionSerializer().fields.items():
+            if isinstance(field, serializers.SerializerMethodField):
+                plan.append((name, name, _int_amount, False))
+            elif '.' in field.source:
+                # 관계 필드 경유 값은 관계가 없으면 응답에서 생략 (기존 동작과 동일)
+                plan.append((name, field.source.replace('.', '__'), None, True))
+            elif isinstance(field, serializers.DateTimeField):
+                plan.append((name, field.source, _datetime_formatter, False))
+            elif isinstance(field, _RAW_FIELD_TYPES):
+                plan.append((name, field.source, None, False))
+            else:
+                plan.append((name, field.source, field.to_representation, False))
+        _transaction_list_plan = plan
+    return _transaction_list_plan
+
+def transaction_list_values(queryset):
+    """목록 응답에 필요한 컬럼만 JOIN하여 값(dict)으로 조회"""
+    return queryset.values(*{column for _, column, _, _ in _get_transaction_list_plan()})
+
+def serialize_transaction_values(rows):
+    """값 조회 결과로 TransactionSerializer와 같은 응답을 직접 구성 (필드별 디스패치 생략)"""
+    # 시간대는 호출마다 한 번만 조회
+    format_datetime = _datetime_formatter(timezone.get_current_timezone())
+    plan = [
+        (name, column, format_datetime if convert is _datetime_formatter else convert, omit_none)
+        for name, column, convert, omit_none in _get_transaction_list_plan()
+    ]
+    results = []
+    for row in rows:
+        item = {}
+        for name, column, convert, omit_none in plan:
+            value = row[column]
+            if value is None and omit_none:
+                continue
+            item[name] = convert(value) if convert is not None and value is not None else value
+        results.append(item)
+    return results
 
 class ProcessingLogSerializer(serializers.ModelSerializer):
     class Meta:
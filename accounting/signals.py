@@ -0,0 +1,158 @@
+from django.conf import settings
+from django.db import transaction
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate, post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Company, Category, ClassificationKeyword, Transaction
+from .classifier import invalidate_keyword_matcher, reclassify_transactions, unassign_transactions
+from .memo import clear_description_lru, invalidate_memos_for_keyword
+from .cache import bump_data_version
+from .rollups import apply_rollup_deltas, deltas_for_transaction
+from .search import ensure_fts_triggers
+from .versions import DELETES_VERSION, RULES_VERSION, bump_version
+
+
+@receiver(post_save, sender=ClassificationKeyword)
+@receiver(post_delete, sender=ClassificationKeyword)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def keyword_rules_changed(sender, **kwargs):
+    """분류 규칙 변경 시 키워드 매처 재생성 및 프로세스 내 적요 메모 LRU 비우기
+
+    DB의 분류 규칙 버전도 올려 다른 프로세스(가져오기 작업자 등)가 다음 분류 때 매처를 다시 만들게 합니다.
+    """
+    bump_version(RULES_VERSION)
+    invalidate_keyword_matcher()
+    clear_description_lru()
+
+
+def _reclassify_on_commit(transaction_ids=(), description_hashes=(), trigger=None):
+    """규칙 변경이 커밋된 뒤 영향받는 거래만 다시 분류"""
+    if not getattr(settings, 'CLASSIFICATION_RECLASSIFY_ON_CHANGE', True):
+        return
+    if not transaction_ids and not description_hashes:
+        return
+    transaction.on_commit(
+        lambda: reclassify_transactions(transaction_ids, description_hashes, trigger=trigger)
+    )
+
+
+@receiver(post_save, sender=ClassificationKeyword)
+def keyword_saved(sender, instance, created, **kwargs):
+    """키워드 추가/수정 시 결과가 바뀔 수 있는 적요 메모만 삭제하고 해당 거래만 다시 분류
+
+    추가: 적요에 키워드가 포함된 거래 (적요 메모 -> 적요 해시 인덱스로 조회)
+    수정: 위 거래와 이 키워드로 분류되어 있던 거래
+    """
+    description_hashes = invalidate_memos_for_keyword(instance)
+    transaction_ids = []
+    if not created:
+        transaction_ids = list(instance.matched_transactions.values_list('transaction_id', flat=True))
+    _reclassify_on_commit(transaction_ids, description_hashes, trigger=f'keyword_saved:{instance.pk}')
+
+
+@receiver(pre_delete, sender=ClassificationKeyword)
+def keyword_deleting(sender, instance, **kwargs):
+    """키워드 삭제 전 이 키워드로 분류된 거래 기억 (삭제 시 matched_keyword는 NULL이 됨)"""
+    instance._matched_transaction_ids = list(
+        instance.matched_transactions.values_list('transaction_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=ClassificationKeyword)
+def keyword_deleted(sender, instance, **kwargs):
+    """키워드 삭제 시 이 키워드로 분류되어 있던 거래만 다시 분류 (적요 메모는 CASCADE로 삭제)"""
+    _reclassify_on_commit(
+        getattr(instance, '_matched_transaction_ids', []), trigger=f'keyword_deleted:{instance.pk}'
+    )
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created, **kwargs):
+    """계정과목 수정 시 (회사 변경 등) 해당 계정과목 거래만 다시 분류"""
+    if created:
+        return
+    _reclassify_on_commit(
+        list(instance.transactions.values_list('transaction_id', flat=True)),
+        trigger=f'category_saved:{instance.pk}'
+    )
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleting(sender, instance, **kwargs):
+    """계정과목 삭제 전 해당 거래를 미분류로 옮겨 집계 유지 (FK SET_NULL은 집계를 거치지 않음)"""
+    instance._transaction_ids = list(instance.transactions.values_list('transaction_id', flat=True))
+    unassign_transactions(instance._transaction_ids)
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    """계정과목 삭제 후 해당 거래를 남은 키워드로 다시 분류"""
+    _reclassify_on_commit(getattr(instance, '_transaction_ids', []), trigger=f'category_deleted:{instance.pk}')
+
+
+@receiver(pre_save, sender=Transaction)
+def transaction_saving(sender, instance, raw, **kwargs):
+    """수정 전 거래를 기억하여 저장 후 집계에서 이전 값을 빼도록 함"""
+    instance._rollup_previous = None
+    if instance.pk and not raw:
+        instance._rollup_previous = Transaction.objects.filter(pk=instance.pk).only(
+            'transaction_date', 'transaction_type', 'amount', 'company_id', 'category_id'
+        ).first()
+
+
+@receiver(post_save, sender=Transaction)
+def transaction_saved(sender, instance, raw, **kwargs):
+    """API/관리자 화면의 개별 추가/수정을 일별/월별 집계에 반영 (대량 저장 경로는 직접 반영)"""
+    if raw:
+        return
+    deltas = deltas_for_transaction(instance)
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous is not None:
+        deltas.merge(deltas_for_transaction(previous, sign=-1).entries)
+    apply_rollup_deltas(deltas)
+
+
+@receiver(post_delete, sender=Transaction)
+def transaction_deleted(sender, instance, **kwargs):
+    """개별 삭제(API/관리자 화면)를 일별/월별 집계에 반영하고 삭제 카운터 증가 (분석 스냅샷 재생성 기준)"""
+    apply_rollup_deltas(deltas_for_transaction(instance, sign=-1))
+    bump_version(DELETES_VERSION)
+
+
+@receiver(post_delete, sender=Company)
+@receiver(post_delete, sender=Category)
+def ledger_owner_deleted(sender, **kwargs):
+    """회사/계정과목 삭제 시 삭제 카운터 증가 (거래의 FK가 updated_at 변경 없이 NULL이 되므로 분석 스냅샷 재생성)"""
+    bump_version(DELETES_VERSION)
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def ledger_changed(sender, **kwargs):
+    """API/관리자 화면 등에서 개별 추가/수정/삭제 시 요약 캐시 무효화"""
+    bump_data_version()
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    """마이그레이션 후 적요 전문 검색 트리거 확인 (테이블 재생성 시 삭제되므로)"""
+    if sender.label == 'accounting':
+        ensure_fts_triggers(connections[using])
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """새 SQLite 연결에 PRAGMA 적용 (운영 프로필: WAL, synchronous, cache_size, mmap_size 등)"""
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,220 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+import glob
+import hashlib
+from itertools import islice
+import logging
+import os
+import pickle
+import tempfile
+import time
+
+from django.conf import settings
+from django.db import connections
+
+from .models import ProcessingLog
+from .classifier import classify_transactions, _init_worker
+from .importer import import_normalized, parse_statement
+from .profiling import PipelineProfiler
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_statement_paths(sources):
+    """디렉터리(바로 아래 *.csv), glob 패턴, 파일 경로를 이름순 파일 목록으로 변환 (중복 제거)"""
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            matches = glob.glob(os.path.join(source, '*.csv'))
+        else:
+            matches = glob.glob(source) if glob.has_magic(source) else [source]
+        for path in sorted(matches):
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f'파일을 찾을 수 없습니다: {path}')
+            path = os.path.abspath(path)
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def file_checksum(path, block_size=1024 * 1024):
+    """파일 내용의 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _spill_chunk(spill_dir, piece):
+    """정규화된 청크를 임시 파일로 내보내고 경로 반환"""
+    fd, path = tempfile.mkstemp(suffix='.pkl', dir=spill_dir)
+    with os.fdopen(fd, 'wb') as target:
+        pickle.dump(piece, target, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _load_spilled(paths):
+    """임시 파일의 청크를 하나씩 읽고 삭제 (import_normalized 입력)"""
+    for path in paths:
+        with open(path, 'rb') as source:
+            piece = pickle.load(source)
+        os.remove(path)
+        yield piece
+
+
+def _parse_statement_file(path, spill_dir):
+    """작업 프로세스: CSV 파일 하나 파싱/정규화 (실패해도 다른 파일은 계속 처리하도록 예외를 결과로 반환)
+
+    정규화된 청크는 spill_dir의 임시 파일로 내보내고 경로만 돌려주므로
+    작업 프로세스와 부모 프로세스 모두 파일 크기와 무관하게 청크 하나 분량의 메모리만 사용합니다.
+    """
+    try:
+        with open(path, 'rb') as source:
+            return parse_statement(source, sink=lambda piece: _spill_chunk(spill_dir, piece)), None
+    except Exception as e:
+        return None, f'{type(e).__name__}: {e}'
+
+
+def _iter_parsed(paths, workers, spill_dir):
+    """파일 순서대로 파싱 결과 반환
+
+    workers가 2 이상이면 프로세스 풀에서 미리 파싱하되, 제출해 둔 파일은 최대 workers * 2개로 제한하여
+    저장이 파싱보다 느려도 내보낸 임시 파일과 대기 중인 결과가 입력 전체 크기만큼 쌓이지 않게 합니다.
+    """
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield _parse_statement_file(path, spill_dir)
+        return
+
+    # 작업 프로세스가 부모의 DB 연결을 물려받지 않도록 먼저 닫음
+    connections.close_all()
+    remaining = iter(paths)
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths)), initializer=_init_worker) as executor:
+        pending = deque(
+            executor.submit(_parse_statement_file, path, spill_dir) for path in islice(remaining, workers * 2)
+        )
+        try:
+            while pending:
+                result = pending.popleft().result()
+                # 결과를 저장하는 동안 작업 프로세스가 쉬지 않도록 다음 파일을 먼저 제출
+                for path in islice(remaining, 1):
+                    pending.append(executor.submit(_parse_statement_file, path, spill_dir))
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def import_statements(sources, workers=None, force=False, classify=True, stdout=None):
+    """여러 거래 내역 CSV 파일을 한 번에 가져오기
+
+    파일 파싱/정규화는 프로세스 풀에서 병렬로, 저장은 파일 순서대로 청크 단위 일괄 저장합니다.
+    정규화된 청크는 임시 디렉터리를 거쳐 하나씩 저장하므로 메모리는 파일 수/크기와 무관합니다.
+    파일마다 처리 로그(가져오기)를 남기고, 같은 체크섬으로 이미 완료된 파일은 건너뛰므로
+    중단된 실행은 같은 명령으로 이어서 처리할 수 있습니다. 자동 분류는 마지막에 한 번만 실행합니다.
+
+    반환값: 요약 처리 로그 (일괄 가져오기)
+    """
+    workers = workers or getattr(settings, 'IMPORT_PARSE_WORKERS', 4)
+    paths = resolve_statement_paths(sources)
+
+    summary = ProcessingLog.objects.create(
+        process_type='batch_import',
+        file_name=', '.join(sources)[:200],
+        status='running'
+    )
+    started = time.perf_counter()
+    profiler = PipelineProfiler()
+    files = []
+
+    # 이미 완료된 파일 건너뛰기 (같은 실행 안의 동일 파일 포함)
+    checksums = {path: file_checksum(path) for path in paths}
+    completed = set()
+    if not force:
+        completed.update(
+            ProcessingLog.objects.filter(
+                process_type='import', status='completed', file_checksum__in=set(checksums.values())
+            ).values_list('file_checksum', flat=True)
+        )
+    pending = []
+    for path in paths:
+        if checksums[path] in completed:
+            files.append({'file': path, 'status': 'skipped'})
+            continue
+        completed.add(checksums[path])
+        pending.append(path)
+
+    try:
+        with profiler.track(), tempfile.TemporaryDirectory(prefix='import-') as spill_dir, \
+                closing(_iter_parsed(pending, workers, spill_dir)) as parsed_files:
+            for path in pending:
+                with profiler.stage('parse'):
+                    parsed, error = next(parsed_files)
+
+                log = ProcessingLog.objects.create(
+                    process_type='import',
+                    file_name=os.path.basename(path)[:200],
+                    file_checksum=checksums[path],
+                    status='running'
+                )
+                if error:
+                    log.status = 'failed'
+                    log.error_message = error
+                    log.save(update_fields=['status', 'error_message'])
+                    logger.warning("파일 가져오기 실패: %s (%s)", path, error)
+                    files.append({'file': path, 'status': 'failed', 'log_id': log.log_id, 'error': error})
+                    continue
+
+                spilled, parse_seconds, normalize_seconds = parsed
+                file_profiler = PipelineProfiler(trace_memory=False)
+                file_profiler.add_stage('parse', parse_seconds)
+                file_profiler.add_stage('normalize', normalize_seconds)
+                try:
+                    with profiler.stage('insert'), file_profiler.track():
+                        import_normalized(_load_spilled(spilled), log, profiler=file_profiler)
+                except Exception as e:
+                    # 저장된 청크는 다음 실행에서 중복으로 건너뛰므로 파일 전체를 다시 가져오면 됨
+                    log.status = 'failed'
+                    log.error_message = str(e)
+                    log.save(update_fields=['status', 'error_message'])
+                    raise
+                log.status = 'completed'
+                log.save(update_fields=['status'])
+
+                for name in ('records_processed', 'records_successful', 'records_failed', 'records_skipped', 'records_flagged'):
+                    setattr(summary, name, getattr(summary, name) + getattr(log, name))
+                files.append({'file': path, 'status': 'completed', 'log_id': log.log_id, 'rows': log.records_processed})
+                logger.info(
+                    "파일 가져오기 완료: %s (성공 %d건, 실패 %d건, 중복 %d건)",
+                    path, log.records_successful, log.records_failed, log.records_skipped
+                )
+                if stdout:
+                    stdout.write(
+                        f'  {os.path.basename(path)}: 성공 {log.records_successful}건, '
+                        f'실패 {log.records_failed}건, 중복 {log.records_skipped}건'
+                    )
+
+            # 모든 파일 저장 후 자동 분류 한 번만 실행
+            if classify and summary.records_successful:
+                with profiler.stage('classify'):
+                    classify_transactions()
+
+        failed_files = sum(1 for item in files if item['status'] == 'failed')
+        summary.status = 'failed' if failed_files else 'completed'
+        if failed_files:
+            summary.error_message = f'{failed_files}개 파일 가져오기 실패'
+    except Exception as e:
+        logger.exception("일괄 가져오기 실패: %s", e)
+        summary.status = 'failed'
+        summary.error_message = str(e)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        summary.duration_seconds = elapsed
+        summary.rows_per_second = summary.records_processed / elapsed if elapsed > 0 else None
+        summary.metrics = {'files': files, 'workers': workers}
+        summary.save()
+        profiler.save(summary)
+    return summary
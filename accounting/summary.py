@@ -0,0 +1,119 @@
+from django.conf import settings
+from django.db.models import Count, Q, Sum
+
+from .models import Company, Category, Transaction, DailyRollup, MonthlyRollup
+
+
+def _period_filter(prefix, date_from, date_to):
+    """거래일자(현재 시간대 기준) 기간 조건"""
+    condition = Q()
+    if date_from:
+        condition &= Q(**{f'{prefix}transaction_date__date__gte': date_from})
+    if date_to:
+        condition &= Q(**{f'{prefix}transaction_date__date__lte': date_to})
+    return condition
+
+
+def _aggregates(prefix='', period=Q()):
+    """건수와 입금/출금 합계를 조건부 집계로 한 번에 계산"""
+    return {
+        'transaction_count': Count(f'{prefix}transaction_id', filter=period),
+        'income': Sum(f'{prefix}amount', filter=period & Q(**{f'{prefix}transaction_type': 'income'})),
+        'expense': Sum(f'{prefix}amount', filter=period & Q(**{f'{prefix}transaction_type': 'expense'})),
+    }
+
+
+def _rollup_aggregates():
+    """집계 테이블의 건수와 입금/출금 합계"""
+    return {
+        'transaction_count': Sum('transaction_count'),
+        'income': Sum('total_amount', filter=Q(transaction_type='income')),
+        'expense': Sum('total_amount', filter=Q(transaction_type='expense')),
+    }
+
+
+def _summary_row(name_field, name, transaction_count, income, expense):
+    income = income or 0
+    expense = expense or 0
+    return {
+        name_field: name,
+        'transaction_count': transaction_count or 0,
+        'income': int(income),
+        'expense': int(expense),
+        'net': int(income - expense),
+    }
+
+
+def _build_ledger_summary(date_from, date_to):
+    """거래 내역 원본에서 요약 (쿼리 3회)"""
+    # 전체 요약
+    totals = Transaction.objects.aggregate(**_aggregates(period=_period_filter('', date_from, date_to)))
+    
+    # 회사별/계정과목별 요약 (GROUP BY)
+    related_period = _period_filter('transactions__', date_from, date_to)
+    companies = Company.objects.annotate(**_aggregates('transactions__', related_period)).order_by('pk').values_list(
+        'company_name', 'transaction_count', 'income', 'expense'
+    )
+    categories = Category.objects.annotate(**_aggregates('transactions__', related_period)).order_by('pk').values_list(
+        'category_name', 'transaction_count', 'income', 'expense'
+    )
+    return totals, list(companies), list(categories)
+
+
+def _build_rollup_summary(date_from, date_to):
+    """일별/월별 집계에서 요약 (원장 크기와 무관, 쿼리 5회)"""
+    if date_from or date_to:
+        rollups = DailyRollup.objects.all()
+        if date_from:
+            rollups = rollups.filter(period__gte=date_from)
+        if date_to:
+            rollups = rollups.filter(period__lte=date_to)
+    else:
+        rollups = MonthlyRollup.objects.all()
+    
+    totals = rollups.aggregate(**_rollup_aggregates())
+    by_company = {
+        row['company_id']: row
+        for row in rollups.values('company_id').annotate(**_rollup_aggregates()).order_by()
+    }
+    by_category = {
+        row['category_id']: row
+        for row in rollups.values('category_id').annotate(**_rollup_aggregates()).order_by()
+    }
+    
+    empty = {'transaction_count': 0, 'income': 0, 'expense': 0}
+    companies = [
+        (company_name, *(by_company.get(company_id, empty)[key] for key in empty))
+        for company_id, company_name in Company.objects.order_by('pk').values_list('company_id', 'company_name')
+    ]
+    categories = [
+        (category_name, *(by_category.get(category_id, empty)[key] for key in empty))
+        for category_id, category_name in Category.objects.order_by('pk').values_list('category_id', 'category_name')
+    ]
+    return totals, companies, categories
+
+
+def build_summary(date_from=None, date_to=None, use_rollups=None):
+    """전체/회사별/계정과목별 요약 (회사·계정과목 수와 무관하게 쿼리 수 고정)
+
+    기본적으로 일별/월별 집계 테이블을 읽으며(SUMMARY_USE_ROLLUPS),
+    use_rollups=False이면 거래 내역 원본을 직접 집계합니다.
+    """
+    if use_rollups is None:
+        use_rollups = getattr(settings, 'SUMMARY_USE_ROLLUPS', True)
+    
+    if use_rollups:
+        totals, companies, categories = _build_rollup_summary(date_from, date_to)
+    else:
+        totals, companies, categories = _build_ledger_summary(date_from, date_to)
+    
+    total_income = int(totals['income'] or 0)
+    total_expense = int(totals['expense'] or 0)
+    return {
+        'total_transactions': totals['transaction_count'] or 0,
+        'total_income': total_income,
+        'total_expense': total_expense,
+        'net_profit': total_income - total_expense,
+        'companies': [_summary_row('company_name', *row) for row in companies],
+        'categories': [_summary_row('category_name', *row) for row in categories],
+    }
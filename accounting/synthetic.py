@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+from .models import ClassificationKeyword
+from .importer import CSV_COLUMNS, DATE_FORMAT
+
+# 키워드 앞뒤에 붙여 실제 적요처럼 만드는 변형
+DESCRIPTION_PREFIXES = ['', '(주)']
+DESCRIPTION_SUFFIXES = ['', ' 강남2호점', ' 역삼점', ' 선릉점', ' 판교점', '(등기)', ' 온라인결제']
+BRANCH_NAMES = ['강남지점', '역삼지점', '판교지점', '온라인', '모바일']
+
+# 어떤 키워드에도 매칭되지 않는 적요 (미분류 거래)
+UNMATCHED_DESCRIPTIONS = [
+    ('개인용도 이체', False), ('ATM 출금', False), ('카드대금 결제', False), ('관리비 납부', False),
+    ('보험료 자동이체', False), ('국세 납부', False), ('예금이자', True), ('외부 입금', True),
+]
+
+
+def parse_scale(value):
+    """'10k', '1m', '10M', '2500' 형식의 행 수 파싱"""
+    text = str(value).strip().lower().replace('_', '')
+    multiplier = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    number = text[:-1] if multiplier > 1 else text
+    try:
+        rows = int(float(number) * multiplier)
+    except ValueError:
+        raise ValueError(f'행 수 형식 오류: {value} (예: 10k, 1m, 10m)')
+    if rows <= 0:
+        raise ValueError(f'행 수는 0보다 커야 합니다: {value}')
+    return rows
+
+
+def _description_pools():
+    """(키워드가 포함된 적요, 입금 여부) 목록과 매칭되지 않는 적요 목록"""
+    keywords = list(ClassificationKeyword.objects.select_related('category').values_list(
+        'keyword', 'category__category_type'
+    ))
+    if not keywords:
+        raise ValueError('분류 키워드가 없습니다. 먼저 python manage.py init_data 를 실행하세요.')
+    
+    matched = [
+        (f'{prefix}{keyword}{suffix}', category_type == 'income')
+        for keyword, category_type in keywords
+        for prefix in DESCRIPTION_PREFIXES
+        for suffix in DESCRIPTION_SUFFIXES
+    ]
+    unmatched = [
+        (f'{description}{suffix}', is_income)
+        for description, is_income in UNMATCHED_DESCRIPTIONS
+        for suffix in ['', ' ' + BRANCH_NAMES[0]]
+        if not any(keyword in f'{description}{suffix}' for keyword, _ in keywords)
+    ]
+    return matched, unmatched
+
+
+def generate_ledger_chunks(rows, hit_rate=0.8, seed=42, start='2024-01-01 09:00:00',
+                           opening_balance=10000000, chunk_size=100000):
+    """은행 CSV 형식(거래일시, 적요, 입금액, 출금액, 거래후잔액, 거래점)의 합성 거래 내역을 청크로 생성
+
+    hit_rate 비율의 행은 분류 키워드가 포함된 적요를 사용하며, 거래후잔액은 항상 연속적입니다.
+    """
+    matched, unmatched = _description_pools()
+    matched_descriptions = np.array([description for description, _ in matched], dtype=object)
+    matched_income = np.array([is_income for _, is_income in matched])
+    unmatched_descriptions = np.array([description for description, _ in unmatched], dtype=object)
+    unmatched_income = np.array([is_income for _, is_income in unmatched])
+    branches = np.array(BRANCH_NAMES, dtype=object)
+    
+    rng = np.random.default_rng(seed)
+    current_time = pd.Timestamp(start)
+    balance = float(opening_balance)
+    
+    for offset in range(0, rows, chunk_size):
+        size = min(chunk_size, rows - offset)
+        hit = rng.random(size) < hit_rate
+        matched_index = rng.integers(0, len(matched_descriptions), size)
+        unmatched_index = rng.integers(0, len(unmatched_descriptions), size)
+        
+        descriptions = np.where(hit, matched_descriptions[matched_index], unmatched_descriptions[unmatched_index])
+        is_income = np.where(hit, matched_income[matched_index], unmatched_income[unmatched_index])
+        
+        # 금액: 100원 단위, 입금은 출금보다 크게
+        amounts = np.maximum(np.round(rng.lognormal(mean=10, sigma=1, size=size) / 100) * 100, 100)
+        amounts = np.where(is_income, amounts * 5, amounts)
+        income = np.where(is_income, amounts, 0).astype(np.int64)
+        expense = np.where(is_income, 0, amounts).astype(np.int64)
+        balances = balance + np.cumsum(income - expense)
+        
+        # 거래 간격 30초 ~ 1시간
+        seconds = np.cumsum(rng.integers(30, 3600, size))
+        times = current_time + pd.to_timedelta(seconds, unit='s')
+        
+        yield pd.DataFrame({
+            CSV_COLUMNS[0]: times.strftime(DATE_FORMAT),
+            CSV_COLUMNS[1]: descriptions,
+            CSV_COLUMNS[2]: income,
+            CSV_COLUMNS[3]: expense,
+            CSV_COLUMNS[4]: balances.astype(np.int64),
+            CSV_COLUMNS[5]: branches[rng.integers(0, len(branches), size)],
+        })
+        
+        current_time = times[-1]
+        balance = float(balances[-1])
+
+
+def write_ledger_csv(path, rows, **options):
+    """합성 거래 내역을 CSV 파일로 저장 (청크 단위로 써서 메모리 일정), 저장한 행 수 반환"""
+    written = 0
+    with open(path, 'w', encoding='utf-8', newline='') as output:
+        for chunk in generate_ledger_chunks(rows, **options):
+            chunk.to_csv(output, header=written == 0, index=False)
+            written += len(chunk)
+    return written
@@ -1,3 +1,1575 @@
-from django.test import TestCase
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+import importlib
+import importlib.util
+import io
+import json
+import os
+import pickle
+import re
+import sys
+import tempfile
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+
+from django.apps import apps as django_apps
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.core.signals import request_finished
+from django.db import close_old_connections, connection, connections
+from django.db.models import F, Min
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from django.utils import timezone
+
+from . import analytics, benchmarks, classifier, exports, jobs, renderers, statements
+from .cache import bump_data_version, get_data_version, get_or_build
+from .classifier import KeywordMatcher, classify_transactions, get_keyword_matcher, invalidate_keyword_matcher
+from .exports import create_export_log, stream_export
+from .importer import import_transactions, iter_csv_chunks, normalize_chunk
+from .log_format import JSONFormatter
+from .memo import NO_MATCH, clear_description_lru, get_description_lru
+from .metrics import request_metrics
+from .models import (
+    Category, ChangeCounter, ClassificationKeyword, Company, DailyRollup, DescriptionMemo, ImportJob, MonthlyRollup,
+    ProcessingLog, StagedTransaction, Transaction, description_hash
+)
+from .profiling import PipelineProfiler, throughput_trends
+from .renderers import FastJSONRenderer
+from .rollups import RollupDeltas, apply_rollup_deltas, check_rollups, clear_rollups
+from .search import FTS_TABLE, MEMO_FTS_TABLE, fts_available
+from .summary import build_summary
+from .synthetic import generate_ledger_chunks, parse_scale, write_ledger_csv
+from .timeseries import cash_flow_series
+from .versions import DATA_VERSION
+
+CSV_HEADER = '거래일시,적요,입금액,출금액,거래후잔액,거래점\n'
+
+
+def make_csv(rows, opening_balance=1000000):
+    """(거래일시, 적요, 입금액, 출금액) 목록으로 거래후잔액이 이어지는 CSV 문자열 생성"""
+    lines = [CSV_HEADER]
+    balance = opening_balance
+    for date, description, income, expense in rows:
+        balance += income - expense
+        lines.append(f'{date},{description},{income},{expense},{balance},강남지점\n')
+    return ''.join(lines)
+
+
+def run_import(text, mode='incremental'):
+    log = ProcessingLog.objects.create(process_type='import', file_name='test.csv')
+    return import_transactions(iter_csv_chunks(io.StringIO(text)), log, mode=mode)
+
+
+def transaction_inserts(queries):
+    """캡처한 쿼리 중 거래 테이블 INSERT (executemany는 'N times: ' 접두어로 기록됨)"""
+    return [query for query in queries.captured_queries
+            if re.match(r'(\d+ times: )?INSERT .*INTO "?transactions"? ', query['sql'])]
+
+
+class AccountingDataMixin:
+    """초기 회사/계정과목/키워드를 만들고 요약 캐시와 프로세스 내 분류 캐시를 비운 상태에서 시작"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        call_command('init_data', stdout=io.StringIO())
+        invalidate_keyword_matcher()
+        clear_description_lru()
+
+
+class AccountingTestCase(AccountingDataMixin, TestCase):
+    pass
+
+
+class ClassificationWriteBackTests(AccountingTestCase):
+
+    DESCRIPTIONS = ['스타벅스 강남점', '(주)배달의민족', '쿠팡 정산', '이디야 커피']
+
+    def setUp(self):
+        super().setUp()
+        Transaction.objects.bulk_create([
+            Transaction(transaction_date=timezone.now(), description=description, balance_after=0,
+                        transaction_type='expense', amount=1000)
+            for description in self.DESCRIPTIONS * 5
+        ])
+
+    def _transaction_updates(self, queries):
+        return [query for query in queries.captured_queries if query['sql'].startswith('UPDATE "transactions"')]
+
+    def test_results_are_written_per_category_and_batch(self):
+        with CaptureQueriesContext(connection) as queries:
+            log = classify_transactions(batch_size=8)
+
+        # 배치 3개 × 계정과목 3개 (행 수와 무관)
+        self.assertEqual(len(self._transaction_updates(queries)), 9)
+        self.assertEqual((log.records_processed, log.records_successful, log.records_failed), (20, 15, 5))
+        self.assertGreater(log.rows_per_second, 0)
+        self.assertEqual(
+            dict(Transaction.objects.values_list('description', 'category_id').distinct()),
+            {'스타벅스 강남점': 'cat_204', '(주)배달의민족': 'cat_102', '쿠팡 정산': 'cat_101', '이디야 커피': None}
+        )
+
+    def test_failed_batch_rolls_back_all_batches(self):
+        write_assignments = classifier._write_assignments
+        calls = []
+
+        def fail_on_second_batch(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError('쓰기 실패')
+            return write_assignments(*args, **kwargs)
+
+        with mock.patch.object(classifier, '_write_assignments', side_effect=fail_on_second_batch), \
+                self.assertRaises(RuntimeError), self.assertLogs('accounting.classifier', 'ERROR'):
+            classify_transactions(batch_size=8)
+        self.assertEqual(len(calls), 2)
+        self.assertFalse(Transaction.objects.filter(is_classified=True).exists())
+
+
+
+class KeywordMatcherTests(TestCase):
+
+    def test_lowest_rank_keyword_wins(self):
+        matcher = KeywordMatcher([('스타', 'first'), ('스타벅스', 'second'), ('벅스', 'third')])
+        self.assertEqual(matcher.match('스타벅스 강남점'), 'first')
+        self.assertEqual(matcher.match('벅스 뮤직'), 'third')
+        self.assertIsNone(matcher.match('이디야'))
+
+
+class StaleMatcherTests(AccountingTestCase):
+    """다른 프로세스에서 키워드가 바뀐 경우 (이 프로세스에는 신호가 오지 않음)"""
+
+    def _simulate_other_process_change(self, change):
+        stale_matcher = classifier._matcher
+        stale_lru = dict(get_description_lru()._items)
+        change()
+        # 이 프로세스는 변경 신호를 받지 못한 것처럼 이전 매처와 LRU를 되돌림
+        classifier._matcher = stale_matcher
+        for key, value in stale_lru.items():
+            get_description_lru().put(key, value)
+
+    def test_rebuilds_matcher_when_rules_version_changes(self):
+        run_import(make_csv([('2025-07-20 13:45:11', '스타벅스 강남점', 0, 5500),
+                             ('2025-07-20 14:00:00', '편의점 GS25', 0, 3000)]))
+        classify_transactions()
+        self.assertIn('스타벅스', [keyword for keyword, _ in get_keyword_matcher().entries])
+
+        def change():
+            ClassificationKeyword.objects.filter(keyword='스타벅스').delete()
+            ClassificationKeyword.objects.create(category=Category.objects.get(pk='cat_204'), keyword='편의점')
+        self._simulate_other_process_change(change)
+        self.assertEqual(get_description_lru().get(description_hash('편의점 GS25')), NO_MATCH)
+
+        run_import(make_csv([('2025-07-21 13:45:11', '스타벅스 역삼점', 0, 4500),
+                             ('2025-07-21 14:00:00', '편의점 GS25', 0, 2000)], opening_balance=991500))
+        log = classify_transactions()
+
+        self.assertEqual(log.status, 'completed')
+        self.assertNotIn('스타벅스', [keyword for keyword, _ in get_keyword_matcher().entries])
+        new_rows = Transaction.objects.filter(transaction_date__date='2025-07-21')
+        self.assertEqual(
+            dict(new_rows.values_list('description', 'category_id')),
+            {'스타벅스 역삼점': None, '편의점 GS25': 'cat_204'}
+        )
+
+    def test_failure_is_raised_and_logged(self):
+        run_import(make_csv([('2025-07-20 13:45:11', '스타벅스 강남점', 0, 5500)]))
+        with mock.patch.object(classifier, '_write_assignments', side_effect=RuntimeError('쓰기 실패')):
+            with self.assertRaises(RuntimeError), self.assertLogs('accounting.classifier', 'ERROR'):
+                classify_transactions()
+        log = ProcessingLog.objects.filter(process_type='classification').latest('log_id')
+        self.assertEqual(log.status, 'failed')
+        self.assertEqual(log.error_message, '쓰기 실패')
+        self.assertFalse(Transaction.objects.filter(is_classified=True).exists())
+
+class ChunkedImportTests(AccountingTestCase):
+
+    ROWS = [(f'2025-07-20 10:{minute:02d}:00', f'거래 {minute}', 0, 1000) for minute in range(5)]
+
+    @override_settings(IMPORT_CHUNK_SIZE=2)
+    def test_progress_is_saved_after_each_chunk(self):
+        log = ProcessingLog.objects.create(process_type='import', file_name='test.csv')
+        progress = []
+
+        def observed(chunks):
+            for chunk in chunks:
+                yield chunk
+                progress.append(ProcessingLog.objects.get(pk=log.pk).records_processed)
+
+        with CaptureQueriesContext(connection) as queries:
+            import_transactions(observed(iter_csv_chunks(io.StringIO(make_csv(self.ROWS)))), log)
+
+        self.assertEqual(progress, [2, 4, 5])
+        self.assertEqual(len(transaction_inserts(queries)), 3)
+        self.assertEqual((log.records_processed, log.records_successful, log.records_failed), (5, 5, 0))
+        self.assertEqual(Transaction.objects.count(), 5)
+        self.assertGreater(log.rows_per_second, 0)
+
+    def test_rows_are_stored_with_type_and_amount(self):
+        run_import(make_csv([('2025-07-20 13:45:11', '스타벅스 강남점', 0, 5500),
+                             ('2025-07-21 09:00:00', '급여 입금', 3000000, 0)]))
+        self.assertEqual(
+            list(Transaction.objects.order_by('transaction_date').values_list(
+                'description', 'transaction_type', 'amount', 'balance_after'
+            )),
+            [('스타벅스 강남점', 'expense', 5500, 994500), ('급여 입금', 'income', 3000000, 3994500)]
+        )
+        self.assertEqual(
+            timezone.localtime(Transaction.objects.get(description='급여 입금').transaction_date).hour, 9
+        )
+
+
+class NormalizeChunkTests(TestCase):
+
+    def _chunk(self, rows, start=0):
+        return pd.DataFrame(rows, columns=['거래일시', '적요', '입금액', '출금액', '거래후잔액', '거래점'],
+                            index=range(start, start + len(rows)))
+
+    def test_rows_are_typed_and_invalid_rows_get_reasons(self):
+        chunk = self._chunk([
+            ('2025-07-20 13:45:11', '스타벅스 강남점', 0, 5500, 994500, '강남지점'),
+            ('2025-07-21 09:00:00', '급여 입금', 3000000, 0, 3994500, None),
+            ('2025/07/21 10:00', '날짜 오류', 0, 100, 3994400, '강남지점'),
+            ('2025-07-21 11:00:00', None, 0, 100, 3994300, '강남지점'),
+            ('2025-07-21 12:00:00', '금액 오류', 'abc', 100, 3994200, '강남지점'),
+            ('2025-07-21 13:00:00', '잔액 누락', 0, 100, None, '강남지점'),
+            ('2025-07-21 14:00:00', '가' * 201, 0, 100, 3994000, '강남지점'),
+        ], start=10)
+        normalized, errors = normalize_chunk(chunk)
+
+        self.assertEqual(list(normalized.index), [10, 11])
+        self.assertEqual(list(normalized['transaction_type']), ['expense', 'income'])
+        self.assertEqual(list(normalized['amount']), [5500, 3000000])
+        self.assertEqual(list(normalized['branch_name']), ['강남지점', None])
+        self.assertEqual(
+            [value.isoformat() for value in normalized['transaction_date']],
+            ['2025-07-20T13:45:11+09:00', '2025-07-21T09:00:00+09:00']
+        )
+        self.assertEqual(errors, [
+            (12, '거래일시 형식 오류'), (13, '적요 누락'), (14, '입출금액 형식 오류'),
+            (15, '거래후잔액 형식 오류'), (16, '적요 길이 초과'),
+        ])
+
+    def test_missing_column_fails_every_row(self):
+        chunk = self._chunk([('2025-07-20 13:45:11', '스타벅스 강남점', 0, 5500, 994500, '강남지점')])
+        normalized, errors = normalize_chunk(chunk.drop(columns=['거래후잔액']))
+        self.assertTrue(normalized.empty)
+        self.assertEqual(errors, [(0, '필수 컬럼 누락: 거래후잔액')])
+
+
+class ImportErrorDetailsTests(AccountingTestCase):
+
+    @override_settings(IMPORT_CHUNK_SIZE=2, IMPORT_MAX_ERROR_DETAILS=2)
+    def test_failed_rows_are_logged_up_to_limit(self):
+        text = make_csv([('2025-07-20 10:00:00', '정상', 0, 1000)])
+        text += '잘못된 날짜,오류 1,0,1000,0,강남지점\n' * 3
+        log = run_import(text)
+
+        log.refresh_from_db()
+        self.assertEqual((log.records_processed, log.records_successful, log.records_failed), (4, 1, 3))
+        self.assertEqual(log.error_details, [{'row': 1, 'reason': '거래일시 형식 오류'},
+                                             {'row': 2, 'reason': '거래일시 형식 오류'}])
+
+
+class IncrementalImportTests(AccountingTestCase):
+
+    ROWS = [('2025-07-20 13:45:11', '스타벅스 강남점', 0, 5500),
+            ('2025-07-21 09:00:00', '급여 입금', 3000000, 0)]
+
+    def test_reimport_skips_existing_rows_and_keeps_classification(self):
+        run_import(make_csv(self.ROWS))
+        classify_transactions()
+        log = run_import(make_csv(self.ROWS + [('2025-07-22 10:00:00', '(주)배달의민족', 0, 25000)]))
+
+        self.assertEqual((log.records_successful, log.records_skipped), (1, 2))
+        self.assertEqual(Transaction.objects.count(), 3)
+        self.assertEqual(Transaction.objects.get(description='스타벅스 강남점').category_id, 'cat_204')
+        self.assertFalse(Transaction.objects.get(description='(주)배달의민족').is_classified)
+
+    def test_replace_mode_deletes_existing_rows(self):
+        run_import(make_csv(self.ROWS))
+        log = run_import(make_csv(self.ROWS[:1]), mode='replace')
+        self.assertEqual((log.records_successful, log.records_skipped), (1, 0))
+        self.assertEqual(list(Transaction.objects.values_list('description', flat=True)), ['스타벅스 강남점'])
+
+
+
+class ReplaceImportVisibilityTests(AccountingDataMixin, TransactionTestCase):
+    """전체 교체 중에도 청크별 진행 상황은 커밋되고, 다른 연결에는 교체 전 거래 내역이 보임"""
+
+    @override_settings(IMPORT_CHUNK_SIZE=1)
+    def test_progress_is_committed_while_old_ledger_stays_visible(self):
+        run_import(make_csv(IncrementalImportTests.ROWS))
+        other = connections.create_connection('default')
+        self.addCleanup(other.close)
+        observed = []
+
+        def observe(log):
+            with other.cursor() as cursor:
+                cursor.execute('SELECT records_processed FROM processing_logs WHERE log_id = %s', [log.pk])
+                processed = cursor.fetchone()[0]
+                cursor.execute('SELECT description FROM transactions ORDER BY transaction_id')
+                observed.append((processed, [row[0] for row in cursor.fetchall()]))
+
+        log = ProcessingLog.objects.create(process_type='import', file_name='replace.csv')
+        text = make_csv([('2025-08-01 10:00:00', '이디야 커피', 0, 4000),
+                         ('2025-08-01 11:00:00', '편의점 GS25', 0, 3000)])
+        import_transactions(iter_csv_chunks(io.StringIO(text)), log, mode='replace', on_chunk=observe)
+
+        old = ['스타벅스 강남점', '급여 입금']
+        self.assertEqual(observed, [(1, old), (2, old)])
+        self.assertEqual((log.records_successful, log.records_flagged), (2, 0))
+        self.assertEqual(list(Transaction.objects.order_by('pk').values_list('description', flat=True)),
+                         ['이디야 커피', '편의점 GS25'])
+        self.assertFalse(StagedTransaction.objects.exists())
+        self.assertEqual(check_rollups(), {'DailyRollup': [], 'MonthlyRollup': []})
+
+class SummaryServiceTests(AccountingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        run_import(make_csv([('2025-07-20 13:45:11', '스타벅스 강남점', 0, 5500),
+                             ('2025-07-20 15:12:30', '(주)배달의민족', 0, 25000),
+                             ('2025-07-21 09:00:00', '쿠팡 정산', 3000000, 0)]))
+        classify_transactions()
+
+    def test_query_count_does_not_grow_with_companies_and_categories(self):
+        # 거래 내역 원본 3회, 일별/월별 집계 5회
+        for use_rollups, queries in ((False, 3), (True, 5)):
+            with self.subTest(use_rollups=use_rollups):
+                with self.assertNumQueries(queries):
+                    build_summary(use_rollups=use_rollups)
+                for number in range(5):
+                    company = Company.objects.create(company_id=f'com_{use_rollups:d}{number}', company_name='회사')
+                    Category.objects.create(category_id=f'cat_{use_rollups:d}{number}', company=company)
+                with self.assertNumQueries(queries):
+                    build_summary(use_rollups=use_rollups)
+
+    def test_rollup_summary_matches_ledger(self):
+        for date_from, date_to in ((None, None), ('2025-07-21', None), (None, '2025-07-20')):
+            with self.subTest(date_from=date_from, date_to=date_to):
+                self.assertEqual(build_summary(date_from, date_to, use_rollups=True),
+                                 build_summary(date_from, date_to, use_rollups=False))
+
+    def test_api_summary_groups_by_company_and_category(self):
+        data = self.client.get(reverse('api_summary')).json()['data']
+        self.assertEqual((data['total_transactions'], data['total_income'], data['total_expense']),
+                         (3, 3000000, 30500))
+        companies = {row['company_name']: row for row in data['companies']}
+        self.assertEqual((companies['A 커머스']['income'], companies['A 커머스']['expense']), (3000000, 25000))
+        self.assertEqual(companies['B 커머스']['transaction_count'], 1)
+        categories = {row['category_name']: row for row in data['categories']}
+        self.assertEqual(categories['복리후생비']['net'], -5500)
+        self.assertEqual(categories['통신비']['transaction_count'], 0)
+
+
+class TransactionPaginationTests(AccountingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # 같은 거래일시가 페이지 경계에 걸치도록 일부 행은 시각을 겹침
+        rows = []
+        for number in range(11):
+            rows.append((f'2025-07-{number // 3 + 1:02d} 10:00:00', f'스타벅스 {number}호점', 0, 1000 + number))
+        rows.append(('2025-07-05 09:00:00', '급여 입금', 3000000, 0))
+        run_import(make_csv(rows))
+        self.url = reverse('transaction-list')
+        self.ordered_ids = list(
+            Transaction.objects.order_by('transaction_date', 'transaction_id').values_list('transaction_id', flat=True)
+        )
+
+    def _walk(self, url, params=None, direction='next'):
+        pages = []
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            pages.append([item['transaction_id'] for item in data['results']])
+            url, params = data[direction], None
+        return pages
+
+    def test_next_links_cover_every_row_once_in_order(self):
+        pages = self._walk(self.url, {'page_size': 5})
+        self.assertEqual([len(page) for page in pages], [5, 5, 2])
+        self.assertEqual(sum(pages, []), self.ordered_ids)
+
+    def test_previous_links_walk_back(self):
+        data = self.client.get(self.url, {'page_size': 5}).json()
+        while data['next']:
+            data = self.client.get(data['next']).json()
+        pages = self._walk(data['previous'], direction='previous')
+        self.assertEqual(sum(reversed(pages), []), self.ordered_ids[:10])
+
+    def test_pages_do_not_count_or_offset(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'page_size': 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+        sql = queries.captured_queries[0]['sql'].upper()
+        self.assertNotIn('COUNT(', sql)
+        self.assertNotIn('OFFSET', sql)
+
+    def test_filters_apply_across_pages(self):
+        pages = self._walk(self.url, {'page_size': 2, 'transaction_type': 'expense', 'date_from': '2025-07-02'})
+        expected = list(
+            Transaction.objects.filter(transaction_type='expense', transaction_date__date__gte='2025-07-02')
+            .order_by('transaction_date', 'transaction_id').values_list('transaction_id', flat=True)
+        )
+        self.assertEqual(sum(pages, []), expected)
+        self.assertEqual(len(expected), 8)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'not-a-cursor'}).status_code, 404)
+        self.assertEqual(self.client.get(self.url, {'date_from': '2025-13-01'}).status_code, 400)
+
+    def test_internal_columns_are_not_exposed(self):
+        internal = {'fingerprint', 'description_hash', 'matched_keyword'}
+        item = self.client.get(self.url).json()['results'][0]
+        self.assertFalse(internal & set(item))
+        detail = self.client.get(reverse('transaction-detail', args=[item['transaction_id']])).json()
+        self.assertFalse(internal & set(detail))
+        self.assertEqual(set(detail), set(item))
+
+    def test_list_response_matches_default_renderer(self):
+        response = self.client.get(self.url, {'page_size': 5})
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+        # 다른 뷰는 기본 JSONRenderer
+        response = self.client.get(reverse('processinglog-list'))
+        self.assertIs(type(response.accepted_renderer), JSONRenderer)
+
+
+@skipUnless(renderers.orjson is not None, 'orjson 미설치')
+class FastJSONRendererTests(SimpleTestCase):
+
+    def _assert_same_bytes(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_matches_default_renderer(self):
+        self._assert_same_bytes({
+            'description': '스타벅스 강남점\u2028줄\u2029바꿈 "따옴표"',
+            'transaction_date': datetime(2025, 7, 20, 4, 45, 11, 123456, tzinfo=dt_timezone.utc),
+            'local_date': datetime(2025, 7, 20, 13, 45, 11, tzinfo=timezone.get_current_timezone()),
+            'date': date(2025, 7, 20),
+            'amount': Decimal('5500.50'),
+            'count': 3, 'ratio': 0.25, 'flag': True, 'missing': None,
+            'nested': [{1: 'a', 'b': [1, 2.5, '다']}],
+        })
+
+    def test_falls_back_for_values_orjson_cannot_encode(self):
+        self._assert_same_bytes({'big': 2 ** 70})
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({'value': object()})
+
+
+class ExportTests(AccountingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        run_import(make_csv([('2025-07-20 13:45:11', '스타벅스 강남점', 0, 5500),
+                             ('2025-07-20 15:12:30', '(주)배달의민족', 0, 25000),
+                             ('2025-07-21 09:00:00', '쿠팡 정산', 3000000, 0)]))
+        classify_transactions()
+        self.url = reverse('api_export')
+
+    def _export_log(self):
+        return ProcessingLog.objects.filter(process_type='export').latest('log_id')
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_csv_export_streams_every_row(self):
+        response = self.client.get(self.url, {'format': 'csv'})
+        self.assertTrue(response.streaming)
+        chunks = [chunk.decode('utf-8') for chunk in response.streaming_content]
+        # 헤더 + 2행 + 1행
+        self.assertEqual(len(chunks), 3)
+        lines = ''.join(chunks).splitlines()
+        self.assertEqual(lines[0], '\ufeff거래일시,적요,입금액,출금액,거래후잔액,거래점,거래ID,거래유형,회사,계정과목,분류여부')
+        self.assertEqual(lines[1].split(',')[:6], ['2025-07-20 13:45:11', '스타벅스 강남점', '0', '5500', '994500', '강남지점'])
+        self.assertEqual(len(lines), 4)
+
+        log = self._export_log()
+        self.assertEqual((log.status, log.records_processed, log.records_successful), ('completed', 3, 3))
+        self.assertIn(log.file_name, response['Content-Disposition'])
+
+    def test_jsonl_export_applies_filters(self):
+        response = self.client.get(self.url, {'format': 'jsonl', 'company': 'com_1', 'date_from': '2025-07-21'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode('utf-8').splitlines()]
+        self.assertEqual(
+            [(row['description'], row['company_name'], row['category_name']) for row in rows],
+            [('쿠팡 정산', 'A 커머스', '매출')]
+        )
+        self.assertEqual(self._export_log().records_processed, 1)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url, {'format': 'xlsx'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'date_from': '2025-13-01'}).status_code, 400)
+        self.assertFalse(ProcessingLog.objects.filter(process_type='export').exists())
+
+    def test_closed_stream_is_logged_as_failed(self):
+        log = create_export_log('csv')
+        stream = stream_export(Transaction.objects.all(), 'csv', log, chunk_size=1)
+        # 헤더, 1행, 2행
+        for _ in range(3):
+            next(stream)
+        stream.close()
+        log.refresh_from_db()
+        self.assertEqual((log.status, log.records_processed), ('failed', 1))
+
+    def test_stream_closed_before_first_chunk_is_logged_as_failed(self):
+        log = create_export_log('jsonl')
+        stream_export(Transaction.objects.all(), 'jsonl', log).close()
+        log.refresh_from_db()
+        self.assertEqual((log.status, log.records_processed), ('failed', 0))
+
+        # 본문을 읽지 않고 응답을 닫은 경우 (클라이언트가 바로 연결을 끊음)
+        response = self.client.get(self.url, {'format': 'csv'})
+        # 응답 종료 신호의 연결 정리가 테스트 트랜잭션의 연결을 닫지 않도록 함 (테스트 클라이언트와 동일)
+        request_finished.disconnect(close_old_connections)
+        try:
+            response.close()
+        finally:
+            request_finished.connect(close_old_connections)
+        log = self._export_log()
+        self.assertEqual(log.status, 'failed')
+        self.assertIn('시작하기 전', log.error_message)
+
+    def test_error_while_streaming_is_logged_as_failed(self):
+        iter_rows = exports._iter_rows
+
+        def failing_rows(queryset, chunk_size):
+            yield from list(iter_rows(queryset, chunk_size))[:1]
+            raise RuntimeError('조회 실패')
+
+        log = create_export_log('jsonl')
+        with mock.patch.object(exports, '_iter_rows', failing_rows):
+            with self.assertRaises(RuntimeError):
+                list(stream_export(Transaction.objects.all(), 'jsonl', log, chunk_size=1))
+        log.refresh_from_db()
+        self.assertEqual((log.status, log.records_processed), ('failed', 1))
+        self.assertIn('조회 실패', log.error_message)
+
+
+class CashFlowSeriesTests(AccountingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        run_import(make_csv([('2025-07-01 10:00:00', '스타벅스 강남점', 0, 1000),
+                             ('2025-07-03 10:00:00', '쿠팡 정산', 5000, 0),
+                             ('2025-08-15 10:00:00', '(주)배달의민족', 0, 2000),
+                             ('2025-10-02 10:00:00', '스타벅스 역삼점', 0, 500)]))
+        classify_transactions()
+
+    def test_monthly_buckets_are_zero_filled_with_running_balance(self):
+        data = cash_flow_series({}, bucket='month')
+        self.assertEqual((data['date_from'], data['date_to']), ('2025-07-01', '2025-10-02'))
+        self.assertIsNone(data['opening_balance'])
+        points = data['series'][0]['points']
+        self.assertEqual(
+            [(point['period'], point['income'], point['expense'], point['cumulative_net'], point['closing_balance'])
+             for point in points],
+            [('2025-07-01', 5000, 1000, 4000, 1004000),
+             ('2025-08-01', 0, 2000, 2000, 1002000),
+             ('2025-09-01', 0, 0, 2000, 1002000),
+             ('2025-10-01', 0, 500, 1500, 1001500)]
+        )
+
+    def test_closing_balance_uses_the_same_lower_bound_as_flows(self):
+        # 버킷 중간부터 조회: 7/1 거래는 입출금 합계와 기간 말 잔액 모두에서 빠지고 기초 잔액으로 이어짐
+        data = cash_flow_series({'date_from': '2025-07-02', 'date_to': '2025-08-31'}, bucket='month')
+        self.assertEqual(data['opening_balance'], 999000)
+        self.assertEqual(
+            [(point['income'], point['expense'], point['closing_balance']) for point in data['series'][0]['points']],
+            [(5000, 0, 1004000), (0, 2000, 1002000)]
+        )
+
+    def test_empty_range_returns_zero_filled_buckets(self):
+        data = cash_flow_series({'date_from': '2025-09-01', 'date_to': '2025-09-30'}, bucket='week')
+        self.assertEqual(data['opening_balance'], 1002000)
+        [series] = data['series']
+        self.assertEqual(series['name'], '전체')
+        self.assertEqual([point['period'] for point in series['points']],
+                         ['2025-09-01', '2025-09-08', '2025-09-15', '2025-09-22', '2025-09-29'])
+        self.assertTrue(all(
+            (point['income'], point['expense'], point['transaction_count'], point['closing_balance']) == (0, 0, 0, 1002000)
+            for point in series['points']
+        ))
+
+    def test_query_count_does_not_grow_with_buckets(self):
+        for bucket in ('day', 'week', 'month'):
+            with self.subTest(bucket=bucket), self.assertNumQueries(4):
+                cash_flow_series({}, bucket=bucket)
+
+    def test_group_by_category(self):
+        data = cash_flow_series({'date_from': '2025-07-01', 'date_to': '2025-08-31'}, bucket='month', group_by='category')
+        series = {item['name']: [point['net'] for point in item['points']] for item in data['series']}
+        self.assertEqual(series, {'매출': [5000, 0], '식비': [0, -2000], '복리후생비': [-1000, 0]})
+
+    def test_invalid_parameters(self):
+        url = reverse('api_cashflow')
+        self.assertEqual(self.client.get(url, {'bucket': 'hour'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'group_by': 'branch'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'date_from': '2025-08-01', 'date_to': '2025-07-01'}).status_code, 400)
+
+
+class BalanceChainTests(AccountingTestCase):
+
+    ROWS = (
+        '2025-07-20 10:00:00,정상 1,0,1000,999000,강남지점\n'
+        '2025-07-20 11:00:00,정상 2,0,1000,998000,강남지점\n'
+        '2025-07-20 12:00:00,누락 다음,0,1000,996000,강남지점\n'
+        '2025-07-20 11:30:00,역순,0,1000,995000,강남지점\n'
+        '2025-07-20 13:00:00,중복,0,1000,994000,강남지점\n'
+        '2025-07-20 13:00:00,중복,0,1000,994000,강남지점\n'
+        '2025-07-20 14:00:00,정상 3,0,1000,993000,강남지점\n'
+    )
+
+    @override_settings(IMPORT_CHUNK_SIZE=2)
+    def test_import_flags_gaps_reorderings_and_duplicates_across_chunks(self):
+        log = run_import(CSV_HEADER + self.ROWS)
+        log.refresh_from_db()
+        self.assertEqual((log.records_successful, log.records_skipped, log.records_flagged), (6, 1, 3))
+        self.assertEqual([(detail['row'], detail['reason'].split(' (')[0]) for detail in log.error_details], [
+            (2, '잔액 연속성 오류: 누락 의심'),
+            (3, '잔액 연속성 오류: 거래일시 역순'),
+            (5, '잔액 연속성 오류: 직전 행과 중복'),
+        ])
+
+    def test_next_import_continues_from_ledger_balance(self):
+        run_import(make_csv([('2025-07-20 10:00:00', '정상 1', 0, 1000)]))
+        log = run_import(make_csv([('2025-07-21 10:00:00', '정상 2', 0, 1000)], opening_balance=999000))
+        self.assertEqual(log.records_flagged, 0)
+        log = run_import(make_csv([('2025-07-22 10:00:00', '누락 다음', 0, 1000)], opening_balance=990000))
+        self.assertEqual(log.records_flagged, 1)
+
+    def test_check_balances_command(self):
+        run_import(make_csv([('2025-07-20 10:00:00', '정상 1', 0, 1000),
+                             ('2025-07-20 11:00:00', '정상 2', 3000, 0)]))
+        call_command('check_balances', stdout=io.StringIO())
+
+        Transaction.objects.filter(description='정상 2').update(balance_after=0)
+        with self.assertRaises(CommandError):
+            call_command('check_balances', '--log', stdout=io.StringIO())
+        log = ProcessingLog.objects.get(process_type='reconciliation')
+        self.assertEqual((log.records_processed, log.records_flagged), (2, 1))
+        self.assertEqual(len(log.error_details), 1)
+
+
+class ParallelClassificationTests(AccountingDataMixin, TransactionTestCase):
+    """작업 프로세스는 각자의 DB 연결로 커밋된 데이터를 읽으므로 TransactionTestCase"""
+
+    DESCRIPTIONS = ['스타벅스 강남점', '(주)배달의민족', '이디야 커피', '카카오 T 택시', '쿠팡 정산', 'KT 통신요금']
+
+    def setUp(self):
+        super().setUp()
+        rows = [
+            (f'2025-07-{number % 28 + 1:02d} 10:{number % 60:02d}:00', self.DESCRIPTIONS[number % 6], 0, 1000 + number)
+            for number in range(40)
+        ]
+        run_import(make_csv(rows))
+        matcher = get_keyword_matcher()
+        self.expected = {}
+        for transaction_id, description in Transaction.objects.values_list('transaction_id', 'description'):
+            keyword_obj = matcher.match(description)
+            self.expected[transaction_id] = keyword_obj.category_id if keyword_obj else None
+        self.matched = sum(1 for category_id in self.expected.values() if category_id)
+
+    def test_process_pool_matches_serial_result(self):
+        log = classify_transactions(batch_size=4, workers=3, shard_size=7)
+
+        self.assertEqual(log.records_processed, 40)
+        self.assertEqual((log.records_successful, log.records_failed), (self.matched, 40 - self.matched))
+        self.assertEqual(dict(Transaction.objects.values_list('transaction_id', 'category_id')), self.expected)
+        self.assertEqual(Transaction.objects.filter(is_classified=True).count(), self.matched)
+        self.assertEqual(check_rollups(), {'DailyRollup': [], 'MonthlyRollup': []})
+        # 작업 프로세스에서 계산한 적요 메모도 부모 프로세스에서 저장됨
+        self.assertEqual(DescriptionMemo.objects.count(), len(self.DESCRIPTIONS))
+
+    def test_shard_result_survives_pickling(self):
+        first = Transaction.objects.aggregate(first=Min('transaction_id'))['first']
+        result = pickle.loads(pickle.dumps(classifier._classify_shard((first, first + 9, False, 4))))
+        assignments, delta_entries, matched, unmatched, pending, stats = result
+
+        self.assertEqual((matched, unmatched), (8, 2))
+        self.assertEqual(
+            {transaction_id: category_id
+             for (_, category_id, _), transaction_ids in assignments.items() for transaction_id in transaction_ids},
+            {transaction_id: category_id for transaction_id, category_id in self.expected.items()
+             if category_id and transaction_id <= first + 9}
+        )
+        self.assertEqual(sum(count for _, count in delta_entries.values()), 0)
+        # 새로 계산한 적요 메모는 부모 프로세스가 저장하도록 돌려줌
+        self.assertEqual({description for description, _ in pending.values()}, set(self.DESCRIPTIONS))
+        self.assertEqual(stats['matched'] + stats['lru_hits'] + stats['memo_hits'], 10)
+        self.assertFalse(DescriptionMemo.objects.exists())
+        # 작업 프로세스는 쓰지 않음
+        self.assertFalse(Transaction.objects.filter(is_classified=True).exists())
+
+
+class DescriptionMemoTests(AccountingTestCase):
+
+    DESCRIPTIONS = ['스타벅스 강남점', '(주)배달의민족', '쿠팡 정산', '이디야 커피']
+
+    def _import(self, day):
+        run_import(make_csv([(f'2025-07-{day:02d} 10:{minute:02d}:00', self.DESCRIPTIONS[minute % 4], 0, 1000)
+                             for minute in range(20)]))
+
+    def _memo_metrics(self, **kwargs):
+        return classify_transactions(**kwargs).metrics['description_memo']
+
+    def test_repeated_descriptions_hit_lru_and_memo_table(self):
+        self._import(20)
+        metrics = self._memo_metrics(batch_size=8)
+        # 첫 배치의 적요 4종만 매처로 계산, 나머지 12행은 LRU 적중
+        self.assertEqual((metrics['matched'], metrics['lru_hits'], metrics['memo_hits']), (8, 12, 0))
+        self.assertEqual(metrics['hit_rate'], 0.6)
+        self.assertEqual((metrics['lru_size'], metrics['memo_size']), (4, 4))
+
+        # 다른 프로세스(빈 LRU)는 메모 테이블에서 읽음
+        # 대상: 새 20행 + 미분류로 남은 이디야 5행, 첫 배치(8행)의 적요 4종만 메모 테이블 조회
+        clear_description_lru()
+        self._import(21)
+        metrics = self._memo_metrics(batch_size=8)
+        self.assertEqual((metrics['matched'], metrics['memo_hits'], metrics['lru_hits']), (0, 8, 17))
+        self.assertEqual(metrics['hit_rate'], 1.0)
+        self.assertEqual(
+            dict(Transaction.objects.values_list('description', 'category_id').distinct()),
+            {'스타벅스 강남점': 'cat_204', '(주)배달의민족': 'cat_102', '쿠팡 정산': 'cat_101', '이디야 커피': None}
+        )
+
+    def test_keyword_change_invalidates_only_affected_memos(self):
+        self._import(20)
+        classify_transactions()
+        self.assertEqual(len(get_description_lru()), 4)
+
+        ClassificationKeyword.objects.create(category=Category.objects.get(pk='cat_204'), keyword='이디야')
+        self.assertEqual(len(get_description_lru()), 0)
+        self.assertEqual(
+            set(DescriptionMemo.objects.values_list('description', flat=True)),
+            {'스타벅스 강남점', '(주)배달의민족', '쿠팡 정산'}
+        )
+
+        self._import(21)
+        metrics = self._memo_metrics()
+        # 새 키워드와 관련된 이디야 적요(미분류로 남은 5행 + 새 5행)만 다시 매칭
+        self.assertEqual((metrics['matched'], metrics['memo_hits']), (10, 15))
+        self.assertEqual(DescriptionMemo.objects.get(description_hash=description_hash('이디야 커피')).keyword.keyword,
+                         '이디야')
+
+    def test_backfill_restores_memos_and_matched_keywords(self):
+        # 메모와 매칭 키워드가 생기기 전에 분류된 거래
+        self._import(20)
+        classify_transactions()
+        DescriptionMemo.objects.all().delete()
+        Transaction.objects.update(matched_keyword=None)
+
+        migration = importlib.import_module('accounting.migrations.0020_backfill_memos_and_matched_keywords')
+        migration.backfill_memos_and_matched_keywords(django_apps, None)
+
+        self.assertEqual(
+            dict(DescriptionMemo.objects.values_list('description', 'keyword__keyword')),
+            {'스타벅스 강남점': '스타벅스', '(주)배달의민족': '배달의민족', '쿠팡 정산': '쿠팡', '이디야 커피': None}
+        )
+        self.assertFalse(Transaction.objects.filter(is_classified=True, matched_keyword__isnull=True).exists())
+
+        # 키워드 변경 시 기존 거래도 다시 분류 대상에 포함
+        with self.captureOnCommitCallbacks(execute=True):
+            ClassificationKeyword.objects.create(category=Category.objects.get(pk='cat_204'), keyword='이디야')
+        self.assertEqual(set(Transaction.objects.filter(description='이디야 커피').values_list('category_id', flat=True)),
+                         {'cat_204'})
+        with self.captureOnCommitCallbacks(execute=True):
+            ClassificationKeyword.objects.filter(keyword='스타벅스').delete()
+        self.assertFalse(Transaction.objects.filter(description='스타벅스 강남점', is_classified=True).exists())
+
+
+class DescriptionSearchTests(AccountingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        run_import(make_csv([('2025-07-20 13:45:11', '스타벅스 강남2호점', 0, 5500),
+                             ('2025-07-20 15:12:30', '(주)배달의민족', 0, 25000),
+                             ('2025-07-21 09:00:00', '스타벅스 역삼점', 0, 4500),
+                             ('2025-07-21 10:00:00', '벅스뮤직 정기결제', 0, 8000)]))
+        self.url = reverse('transaction-list')
+
+    def _search(self, term):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'q': term})
+        self.assertEqual(response.status_code, 200)
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        return sorted(item['description'] for item in response.json()['results']), sql
+
+    def test_substring_search_uses_trigram_index(self):
+        self.assertTrue(fts_available())
+        descriptions, sql = self._search('벅스 강남')
+        self.assertEqual(descriptions, ['스타벅스 강남2호점'])
+        self.assertIn(FTS_TABLE, sql)
+
+        descriptions, _ = self._search('배달의')
+        self.assertEqual(descriptions, ['(주)배달의민족'])
+
+    def test_short_term_falls_back_to_like(self):
+        descriptions, sql = self._search('벅스')
+        self.assertEqual(descriptions, ['벅스뮤직 정기결제', '스타벅스 강남2호점', '스타벅스 역삼점'])
+        self.assertNotIn(FTS_TABLE, sql)
+
+    def test_index_follows_updates_and_deletes(self):
+        transaction = Transaction.objects.get(description='스타벅스 역삼점')
+        transaction.description = '이디야 역삼점'
+        transaction.save()
+        Transaction.objects.filter(description='(주)배달의민족').delete()
+
+        self.assertEqual(self._search('스타벅스')[0], ['스타벅스 강남2호점'])
+        self.assertEqual(self._search('이디야 역삼')[0], ['이디야 역삼점'])
+        self.assertEqual(self._search('배달의')[0], [])
+
+    def test_admin_search_covers_description_company_and_category(self):
+        classify_transactions()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        url = reverse('admin:accounting_transaction_changelist')
+        for term, count in (('스타벅스', 2), ('B 커머스', 2), ('식비', 1), ('없는 적요', 0)):
+            with self.subTest(term=term):
+                self.assertEqual(self.client.get(url, {'q': term}).context['cl'].result_count, count)
+
+
+class SqliteProfileTests(SimpleTestCase):
+
+    def _load_settings(self, **environ):
+        """환경 변수를 바꿔 설정 모듈을 새로 실행 (현재 설정에는 영향 없음)"""
+        spec = importlib.util.spec_from_file_location('profile_settings', sys.modules[settings.SETTINGS_MODULE].__file__)
+        module = importlib.util.module_from_spec(spec)
+        with mock.patch.dict(os.environ, environ):
+            spec.loader.exec_module(module)
+        return module
+
+    def test_production_profile_enables_wal_and_persistent_connections(self):
+        development = self._load_settings(DJANGO_DB_PROFILE='development')
+        self.assertEqual(development.SQLITE_PRAGMAS, {})
+        self.assertNotIn('CONN_MAX_AGE', development.DATABASES['default'])
+
+        production = self._load_settings(DJANGO_DB_PROFILE='production', DJANGO_SQLITE_TIMEOUT='7')
+        database = production.DATABASES['default']
+        self.assertEqual((database['CONN_MAX_AGE'], database['OPTIONS']['timeout']), (600, 7.0))
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertEqual(production.SQLITE_PRAGMAS['journal_mode'], 'WAL')
+        self.assertEqual(production.SQLITE_PRAGMAS['busy_timeout'], 7000)
+
+    def test_pragmas_are_applied_to_new_connections(self):
+        production = self._load_settings(DJANGO_DB_PROFILE='production')
+        with tempfile.TemporaryDirectory() as directory, override_settings(SQLITE_PRAGMAS=production.SQLITE_PRAGMAS):
+            default = connections['default']
+            wrapper = type(default)({**default.settings_dict, 'NAME': os.path.join(directory, 'db.sqlite3')},
+                                    alias='profile')
+            try:
+                with wrapper.cursor() as cursor:
+                    values = {}
+                    for name in ('journal_mode', 'synchronous', 'cache_size', 'temp_store', 'busy_timeout'):
+                        cursor.execute(f'PRAGMA {name}')
+                        values[name] = cursor.fetchone()[0]
+            finally:
+                wrapper.close()
+        # synchronous NORMAL = 1, temp_store MEMORY = 2
+        self.assertEqual(values, {
+            'journal_mode': 'wal', 'synchronous': 1, 'cache_size': production.SQLITE_PRAGMAS['cache_size'],
+            'temp_store': 2, 'busy_timeout': production.SQLITE_PRAGMAS['busy_timeout'],
+        })
+
+
+class BulkInsertTests(AccountingTestCase):
+
+    ROWS = [('2025-07-20 13:45:11', '스타벅스 강남점', 0, 5500),
+            ('2025-07-20 13:45:11', '스타벅스 강남점', 0, 5500),
+            ('2025-07-21 09:00:00', '급여 입금', 3000000, 0)]
+    FIELDS = ['transaction_date', 'description', 'income_amount', 'expense_amount', 'balance_after',
+              'branch_name', 'transaction_type', 'amount', 'fingerprint', 'description_hash', 'is_classified']
+
+    def _import_rows(self):
+        run_import(make_csv(self.ROWS))
+        return list(Transaction.objects.order_by('transaction_date', 'balance_after').values_list(*self.FIELDS))
+
+    def test_executemany_matches_bulk_create(self):
+        with override_settings(IMPORT_USE_EXECUTEMANY=True):
+            executemany_rows = self._import_rows()
+        Transaction.objects.all().delete()
+        with override_settings(IMPORT_USE_EXECUTEMANY=False):
+            bulk_create_rows = self._import_rows()
+        self.assertEqual(len(executemany_rows), 3)
+        self.assertEqual(executemany_rows, bulk_create_rows)
+
+    def test_reimport_skips_existing_rows(self):
+        for use_executemany in (True, False):
+            with self.subTest(use_executemany=use_executemany), \
+                    override_settings(IMPORT_USE_EXECUTEMANY=use_executemany):
+                Transaction.objects.all().delete()
+                clear_rollups()
+                first = run_import(make_csv(self.ROWS))
+                second = run_import(make_csv(self.ROWS))
+                self.assertEqual((first.records_successful, first.records_skipped), (3, 0))
+                self.assertEqual((second.records_successful, second.records_skipped), (0, 3))
+                self.assertEqual(Transaction.objects.count(), 3)
+                self.assertEqual(check_rollups(), {'DailyRollup': [], 'MonthlyRollup': []})
+
+    def test_rows_stored_by_another_process_are_not_counted(self):
+        # 중복 조회 이후 다른 프로세스가 같은 거래를 먼저 저장한 경우 (조회가 기존 행을 놓친 것처럼 만듦)
+        def exclude_nothing(normalized, batch_size):
+            return normalized.drop_duplicates('fingerprint')
+
+        for use_executemany in (True, False):
+            with self.subTest(use_executemany=use_executemany), \
+                    override_settings(IMPORT_USE_EXECUTEMANY=use_executemany):
+                Transaction.objects.all().delete()
+                clear_rollups()
+                run_import(make_csv(self.ROWS[:1]))
+                with mock.patch('accounting.importer._exclude_existing', side_effect=exclude_nothing):
+                    log = run_import(make_csv(self.ROWS))
+                self.assertEqual((log.records_successful, log.records_skipped), (2, 1))
+                self.assertEqual(Transaction.objects.count(), 3)
+                self.assertEqual(check_rollups(), {'DailyRollup': [], 'MonthlyRollup': []})
+
+    @skipUnless(connection.vendor == 'postgresql', 'COPY는 PostgreSQL 전용')
+    @override_settings(IMPORT_USE_COPY=True)
+    def test_copy_reimport_skips_existing_rows(self):
+        first = run_import(make_csv(self.ROWS))
+        second = run_import(make_csv(self.ROWS))
+        self.assertEqual((first.records_successful, first.records_skipped), (3, 0))
+        self.assertEqual((second.records_successful, second.records_skipped), (0, 3))
+        self.assertEqual(Transaction.objects.count(), 3)
+        self.assertEqual(check_rollups(), {'DailyRollup': [], 'MonthlyRollup': []})
+
+
+
+class SyntheticLedgerTests(AccountingTestCase):
+
+    def test_parse_scale(self):
+        self.assertEqual([parse_scale(value) for value in ('2500', '10k', '1m', '1.5M', '10_000')],
+                         [2500, 10000, 1000000, 1500000, 10000])
+        for value in ('abc', '0', '-1k'):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_scale(value)
+
+    def test_generated_csv_imports_with_continuous_balances(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ledger.csv')
+            written = write_ledger_csv(path, 250, hit_rate=0.8, seed=7, chunk_size=100)
+            with open(path, encoding='utf-8') as source:
+                text = source.read()
+            with open(path, encoding='utf-8') as source:
+                self.assertEqual(next(source), CSV_HEADER)
+            log = run_import(text)
+            again = os.path.join(directory, 'again.csv')
+            write_ledger_csv(again, 250, hit_rate=0.8, seed=7, chunk_size=100)
+            with open(again, encoding='utf-8') as source:
+                self.assertEqual(source.read(), text)
+
+        self.assertEqual(written, 250)
+        self.assertEqual((log.records_successful, log.records_failed, log.records_flagged), (250, 0, 0))
+        classification = classify_transactions()
+        hit_rate = classification.records_successful / 250
+        self.assertGreater(hit_rate, 0.65)
+        self.assertLess(hit_rate, 0.95)
+
+    def test_generation_requires_keywords(self):
+        ClassificationKeyword.objects.all().delete()
+        with self.assertRaises(ValueError):
+            next(generate_ledger_chunks(10))
+
+
+class BenchmarkTests(AccountingDataMixin, TransactionTestCase):
+
+    def test_benchmark_scale_reports_every_stage(self):
+        with tempfile.TemporaryDirectory() as directory:
+            result = benchmarks.benchmark_scale(300, directory, repeat=1, pages=2)
+            self.assertEqual(os.listdir(directory), [])
+
+        self.assertEqual(result['stored_rows'], 300)
+        self.assertEqual((result['import']['successful'], result['import']['failed']), (300, 0))
+        self.assertEqual(result['classify']['successful'] + result['classify']['failed'], 300)
+        self.assertIsNotNone(result['classify']['memo_hit_rate'])
+        for name in ('api_summary', 'api_summary_ledger', 'dashboard'):
+            with self.subTest(name=name):
+                self.assertEqual(result[name]['status'], 200)
+                self.assertLessEqual(result[name]['warm_queries'], result[name]['cold_queries'])
+        self.assertEqual((result['transactions_list']['status'], result['transactions_list']['pages']), (200, 2))
+        json.dumps(result)
+
+
+class PerformanceMetricsTests(AccountingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        request_metrics.reset()
+        self.addCleanup(request_metrics.reset)
+
+    def test_histogram_buckets_are_cumulative(self):
+        request_metrics.record('api_summary', 'GET', 200, 0.03, 3, 0.002)
+        request_metrics.record('api_summary', 'GET', 500, 20.0, 1, 0.001)
+        text = request_metrics.render_prometheus()
+        labels = 'view="api_summary",method="GET"'
+        self.assertIn(f'accounting_request_duration_seconds_bucket{{{labels},le="0.025"}} 0\n', text)
+        self.assertIn(f'accounting_request_duration_seconds_bucket{{{labels},le="0.05"}} 1\n', text)
+        self.assertIn(f'accounting_request_duration_seconds_bucket{{{labels},le="10.0"}} 1\n', text)
+        self.assertIn(f'accounting_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2\n', text)
+        self.assertIn(f'accounting_request_duration_seconds_count{{{labels}}} 2\n', text)
+        self.assertIn(f'accounting_requests_total{{{labels},status="2xx"}} 1\n', text)
+        self.assertIn(f'accounting_requests_total{{{labels},status="5xx"}} 1\n', text)
+        self.assertIn(f'accounting_db_queries_total{{{labels}}} 4\n', text)
+
+    def test_middleware_records_latency_and_queries_per_view(self):
+        # CaptureQueriesContext는 request_started 시 초기화되므로 별도 execute_wrapper로 센다
+        queries = []
+        with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+            response = self.client.get(reverse('api_summary'))
+        self.assertGreater(len(queries), 0)
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['Server-Timing'], r'^app;dur=[\d.]+, db;dur=[\d.]+$')
+
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        text = response.content.decode()
+        labels = 'view="api_summary",method="GET"'
+        self.assertIn(f'accounting_request_duration_seconds_count{{{labels}}} 1\n', text)
+        self.assertIn(f'accounting_requests_total{{{labels},status="2xx"}} 1\n', text)
+        self.assertIn(f'accounting_db_queries_total{{{labels}}} {len(queries)}\n', text)
+        # /metrics 요청 자신은 응답을 만든 뒤에 기록됨
+        self.assertNotIn('view="metrics"', text)
+
+        self.client.get('/no-such-page/')
+        self.assertIn('view="unmatched",method="GET",status="4xx"', request_metrics.render_prometheus())
+
+    def test_exposition_format(self):
+        self.client.get(reverse('api_summary'))
+        text = self.client.get(reverse('metrics')).content.decode()
+        self.assertTrue(text.endswith('\n'))
+        sample = re.compile(r'^[a-z_]+\{[a-z_]+="[^"]*"(,[a-z_]+="[^"]*")*\} -?[\d.]+(e[+-]?\d+)?$')
+        types = {}
+        for line in text.splitlines():
+            if line.startswith('# TYPE '):
+                _, _, name, metric_type = line.split(' ')
+                types[name] = metric_type
+            elif not line.startswith('# HELP '):
+                self.assertRegex(line, sample)
+        self.assertEqual(types, {
+            'accounting_request_duration_seconds': 'histogram',
+            'accounting_requests_total': 'counter',
+            'accounting_db_queries_total': 'counter',
+            'accounting_db_query_seconds_total': 'counter',
+        })
+
+    @override_settings(SLOW_REQUEST_THRESHOLD=0)
+    def test_slow_request_is_logged_with_fields(self):
+        with self.assertLogs('accounting.middleware', 'WARNING') as logs:
+            self.client.get(reverse('api_summary'))
+        record = logs.records[0]
+        self.assertEqual((record.view, record.status), ('api_summary', 200))
+        payload = json.loads(JSONFormatter().format(record))
+        self.assertEqual(payload['level'], 'WARNING')
+        self.assertEqual(payload['db_queries'], record.db_queries)
+        self.assertIn('/api/summary/', payload['message'])
+
+
+class PipelineProfilerTests(AccountingTestCase):
+
+    ROWS = [(f'2025-07-20 10:{minute:02d}:00', f'스타벅스 {minute}', 0, 1000) for minute in range(5)]
+
+    @override_settings(IMPORT_CHUNK_SIZE=2)
+    def test_import_records_stage_timings(self):
+        log = run_import(make_csv(self.ROWS), mode='replace')
+        metrics = ProcessingLog.objects.get(pk=log.pk).metrics
+        self.assertEqual(list(metrics['stages']),
+                         ['parse', 'normalize', 'reconcile', 'insert', 'replace', 'cache'])
+        self.assertEqual(metrics['stages']['insert']['calls'], 3)
+        self.assertEqual(metrics['stages']['parse']['calls'], 4)
+        for name, stats in metrics['stages'].items():
+            with self.subTest(stage=name):
+                self.assertLessEqual(stats['db_seconds'], stats['seconds'])
+        self.assertGreater(metrics['stages']['insert']['db_seconds'], 0)
+        self.assertGreater(metrics['db_queries'], 0)
+        self.assertGreater(metrics['run_peak_rss_bytes'], 0)
+        self.assertIsNone(metrics['run_peak_traced_bytes'])
+
+    def test_classification_records_stages(self):
+        run_import(make_csv(self.ROWS))
+        log = classify_transactions()
+        stages = ProcessingLog.objects.get(pk=log.pk).metrics['stages']
+        self.assertIn('classify', stages)
+        self.assertIn('cache', stages)
+
+    def _allocate(self, size):
+        profiler = PipelineProfiler(trace_memory=True)
+        with profiler.track():
+            with profiler.stage('allocate'):
+                block = np.ones(size, dtype=np.uint8)
+        del block
+        return profiler.as_metrics(0)
+
+    def test_memory_is_measured_per_run(self):
+        size = 64 * 1024 * 1024
+        large = self._allocate(size)
+        small = self._allocate(1024)
+        self.assertGreaterEqual(large['run_peak_traced_bytes'], size)
+        self.assertLess(small['run_peak_traced_bytes'], size // 2)
+        if large['run_rss_growth_bytes'] is not None:
+            self.assertGreaterEqual(large['run_rss_growth_bytes'], size * 0.9)
+            self.assertLess(small['run_rss_growth_bytes'], size // 2)
+        self.assertEqual(list(large['stages']), ['allocate'])
+
+    def test_throughput_trends_compare_latest_with_median(self):
+        for rows_per_second in (100, 300, 200, 150):
+            ProcessingLog.objects.create(process_type='import', status='completed', records_processed=1000,
+                                         rows_per_second=rows_per_second, metrics={'stages': {'insert': {'seconds': 1.5}}})
+        ProcessingLog.objects.create(process_type='import', status='failed', rows_per_second=1)
+
+        response = self.client.get(reverse('api_throughput'))
+        data = response.json()['data']
+        self.assertEqual([run['rows_per_second'] for run in data['runs']], [100, 300, 200, 150])
+        self.assertEqual(data['runs'][0]['stages'], {'insert': 1.5})
+        self.assertEqual(data['baseline'], {
+            'median_rows_per_second': 200, 'latest_rows_per_second': 150, 'ratio': 0.75,
+        })
+        self.assertEqual(len(throughput_trends(limit=1)['runs']), 1)
+        self.assertEqual(self.client.get(reverse('api_throughput'), {'process_type': 'nope'}).status_code, 400)
+
+
+
+def write_statements(directory, count, rows_per_file=3):
+    """이어지는 잔액으로 statement-NN.csv 파일 count개 생성 -> 경로 목록"""
+    paths = []
+    balance = 1000000
+    for number in range(count):
+        rows = [(f'2025-07-{number + 1:02d} 10:{minute:02d}:00', f'거래 {number}-{minute}', 0, 1000)
+                for minute in range(rows_per_file)]
+        path = os.path.join(directory, f'statement-{number:02d}.csv')
+        with open(path, 'w', encoding='utf-8') as target:
+            target.write(make_csv(rows, opening_balance=balance))
+        balance -= 1000 * rows_per_file
+        paths.append(path)
+    return paths
+
+
+class ImportStatementsTests(AccountingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    @override_settings(IMPORT_CHUNK_SIZE=2)
+    def test_imports_files_in_chunks_and_skips_completed(self):
+        write_statements(self.directory, 3)
+        open(os.path.join(self.directory, 'statement-99.csv'), 'w').close()
+
+        with self.assertLogs('accounting.statements', 'WARNING'):
+            summary = statements.import_statements([self.directory], workers=1, classify=False)
+        self.assertEqual(summary.status, 'failed')
+        self.assertEqual([item['status'] for item in summary.metrics['files']],
+                         ['completed', 'completed', 'completed', 'failed'])
+        self.assertEqual(Transaction.objects.count(), 9)
+        self.assertEqual(check_rollups(), {'DailyRollup': [], 'MonthlyRollup': []})
+
+        with self.assertLogs('accounting.statements', 'WARNING'):
+            summary = statements.import_statements([self.directory], workers=1, classify=False)
+        self.assertEqual([item['status'] for item in summary.metrics['files']],
+                         ['skipped', 'skipped', 'skipped', 'failed'])
+        self.assertEqual(Transaction.objects.count(), 9)
+
+
+class ImportJobTests(AccountingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.upload_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.upload_dir.cleanup)
+        settings_override = override_settings(IMPORT_UPLOAD_DIR=self.upload_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _enqueue(self):
+        text = make_csv([('2025-07-20 13:45:11', '스타벅스 강남점', 0, 5500),
+                         ('2025-07-20 15:12:30', '(주)배달의민족', 0, 25000)])
+        return jobs.enqueue_import(SimpleUploadedFile('statement.csv', text.encode('utf-8')))
+
+    def test_completed_job_classifies_and_removes_upload(self):
+        job = self._enqueue()
+        job = jobs.run_job(jobs.claim_next_job('worker-1'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.log.status, 'completed')
+        self.assertEqual(Transaction.objects.filter(is_classified=True).count(), 2)
+        self.assertFalse(os.path.exists(job.file_path))
+
+    def test_classification_failure_fails_job_and_keeps_upload(self):
+        self._enqueue()
+        with mock.patch.object(jobs, 'classify_transactions', side_effect=RuntimeError('분류 실패')):
+            with self.assertLogs('accounting.jobs', 'ERROR'):
+                job = jobs.run_job(jobs.claim_next_job('worker-1'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.log.status, 'failed')
+        self.assertEqual(job.log.error_message, '분류 실패')
+        self.assertTrue(os.path.exists(job.file_path))
+
+        self.assertEqual(jobs.retry_failed_jobs(), 1)
+        job = jobs.run_job(jobs.claim_next_job('worker-2'))
+        self.assertEqual(job.status, 'completed')
+
+    def _record_heartbeats(self, before_call=None):
+        """jobs.heartbeat 호출을 기록 (before_call(호출 순번)은 실제 하트비트 직전에 실행)"""
+        calls = []
+        real_heartbeat = jobs.heartbeat
+
+        def recording_heartbeat(job):
+            calls.append(job.job_id)
+            if before_call is not None:
+                before_call(len(calls))
+            return real_heartbeat(job)
+
+        patcher = mock.patch.object(jobs, 'heartbeat', side_effect=recording_heartbeat)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return calls
+
+    @override_settings(CLASSIFICATION_BATCH_SIZE=1)
+    def test_classification_renews_heartbeat_per_batch(self):
+        self._enqueue()
+        calls = self._record_heartbeats()
+        job = jobs.run_job(jobs.claim_next_job('worker-1'))
+        # 청크 1개 + 분류 시작 전 1회 + 분류 배치 2개
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(job.status, 'completed')
+
+    @override_settings(CLASSIFICATION_BATCH_SIZE=1)
+    def test_lease_reclaimed_during_classification(self):
+        job = self._enqueue()
+
+        def reclaim(call):
+            # 첫 분류 배치를 커밋한 뒤 다른 작업자가 응답 없는 작업으로 보고 가져감
+            if call == 3:
+                ImportJob.objects.filter(pk=job.pk).update(worker='worker-2', attempts=F('attempts') + 1)
+
+        self._record_heartbeats(reclaim)
+        with self.assertLogs('accounting', 'WARNING'):
+            jobs.run_job(jobs.claim_next_job('worker-1'))
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker), ('running', 'worker-2'))
+        self.assertNotEqual(job.log.status, 'completed')
+        self.assertTrue(os.path.exists(job.file_path))
+        # 커밋된 첫 배치만 분류된 채 남고 나머지는 다음 실행에서 분류
+        self.assertEqual(Transaction.objects.filter(is_classified=True).count(), 1)
+
+    def test_result_is_not_recorded_after_lease_is_lost(self):
+        job = self._enqueue()
+
+        def classify_then_lose_lease(**kwargs):
+            ImportJob.objects.filter(pk=job.pk).update(worker='worker-2')
+
+        with mock.patch.object(jobs, 'classify_transactions', side_effect=classify_then_lose_lease), \
+                self.assertLogs('accounting.jobs', 'WARNING'):
+            result = jobs.run_job(jobs.claim_next_job('worker-1'))
+
+        self.assertEqual((result.status, result.worker, result.finished_at), ('running', 'worker-2', None))
+        job.refresh_from_db()
+        self.assertEqual(job.log.status, 'running')
+        self.assertTrue(os.path.exists(job.file_path))
+
+    def test_stale_running_job_is_reclaimed(self):
+        self._enqueue()
+        job = jobs.claim_next_job('crashed-worker')
+        ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+
+        reclaimed = jobs.claim_next_job('worker-2')
+        self.assertEqual(reclaimed.pk, job.pk)
+        self.assertEqual(reclaimed.worker, 'worker-2')
+        self.assertEqual(reclaimed.attempts, 2)
+
+        # 이전 작업자는 하트비트에서 점유를 잃었음을 알게 됨
+        with self.assertRaises(jobs.JobLeaseLost):
+            jobs.heartbeat(job)
+
+    def test_job_exceeding_max_attempts_fails(self):
+        self._enqueue()
+        job = jobs.claim_next_job('crashed-worker')
+        ImportJob.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now() - timedelta(hours=1), attempts=3
+        )
+        self.assertIsNone(jobs.claim_next_job('worker-2'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.log.status, 'failed')
+
+
+class RollupConsistencyTests(AccountingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        run_import(make_csv([('2025-07-20 13:45:11', '스타벅스 강남점', 0, 5500),
+                             ('2025-07-20 15:12:30', '(주)배달의민족', 0, 25000),
+                             ('2025-07-21 09:00:00', '급여 입금', 3000000, 0)]))
+        classify_transactions()
+
+    def assertRollupsConsistent(self):
+        self.assertEqual(check_rollups(), {'DailyRollup': [], 'MonthlyRollup': []})
+
+    def test_import_and_classification_keep_rollups(self):
+        self.assertRollupsConsistent()
+
+    def test_api_update_and_delete_keep_rollups(self):
+        transaction = Transaction.objects.get(description='스타벅스 강남점')
+        url = reverse('transaction-detail', args=[transaction.pk])
+
+        response = self.client.patch(url, {'category': 'cat_204'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertRollupsConsistent()
+
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, 204)
+        self.assertRollupsConsistent()
+
+    def test_model_save_and_queryset_delete_keep_rollups(self):
+        transaction = Transaction.objects.get(description='급여 입금')
+        transaction.pk = None
+        transaction.fingerprint = None
+        transaction.transaction_date = transaction.transaction_date + timedelta(days=40)
+        transaction.save()
+        self.assertRollupsConsistent()
+
+        Transaction.objects.filter(transaction_date__date='2025-07-20').delete()
+        self.assertRollupsConsistent()
+
+    def test_replace_import_clears_rollups(self):
+        run_import(make_csv([('2025-08-01 10:00:00', '이디야 커피', 0, 4000)]), mode='replace')
+        self.assertEqual(Transaction.objects.count(), 1)
+        self.assertRollupsConsistent()
+
+    @override_settings(IMPORT_CHUNK_SIZE=1)
+    def test_failed_replace_import_keeps_existing_ledger(self):
+        before = list(Transaction.objects.order_by('pk').values_list('pk', 'description'))
+
+        def fail_after_first_chunk(log):
+            if log.records_processed >= 1:
+                raise RuntimeError('저장 중단')
+
+        log = ProcessingLog.objects.create(process_type='import', file_name='replace.csv')
+        text = make_csv([('2025-08-01 10:00:00', '이디야 커피', 0, 4000),
+                         ('2025-08-01 11:00:00', '편의점 GS25', 0, 3000)])
+        with self.assertRaises(RuntimeError):
+            import_transactions(iter_csv_chunks(io.StringIO(text)), log, mode='replace',
+                                on_chunk=fail_after_first_chunk)
+        self.assertEqual(list(Transaction.objects.order_by('pk').values_list('pk', 'description')), before)
+        self.assertFalse(StagedTransaction.objects.exists())
+        self.assertRollupsConsistent()
+        self.assertTrue(DailyRollup.objects.filter(period='2025-07-20').exists())
+
+    def test_deltas_are_added_to_existing_rows(self):
+        before = DailyRollup.objects.get(period='2025-07-21', transaction_type='income')
+        deltas = RollupDeltas()
+        deltas.add(before.period, before.company_id, before.category_id, 'income', before.total_amount, 1)
+        apply_rollup_deltas(deltas)
+        apply_rollup_deltas(deltas)
+
+        after = DailyRollup.objects.get(pk=before.pk)
+        self.assertEqual(after.total_amount, before.total_amount * 3)
+        self.assertEqual(after.transaction_count, before.transaction_count + 2)
+        month = MonthlyRollup.objects.get(
+            period='2025-07-01', company_id=before.company_id, category_id=before.category_id, transaction_type='income'
+        )
+        self.assertEqual(month.total_amount, before.total_amount * 3)
+
+
+class DataVersionTests(AccountingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        run_import(make_csv([('2025-07-20 13:45:11', '스타벅스 강남점', 0, 5500)]))
+
+    def _count(self):
+        return get_or_build('test_count', lambda: Transaction.objects.count())
+
+    def test_version_change_from_another_process_invalidates_cache(self):
+        self.assertEqual(self._count(), 1)
+        # 다른 프로세스의 저장: 이 프로세스 캐시에는 신호가 오지 않고 DB 카운터만 바뀜
+        Transaction.objects.bulk_create([Transaction(
+            transaction_date=timezone.now(), description='다른 프로세스', balance_after=0,
+            transaction_type='income', amount=1000
+        )])
+        self.assertEqual(self._count(), 1)
+        ChangeCounter.objects.filter(name=DATA_VERSION).update(value=get_data_version() + 1)
+        self.assertEqual(self._count(), 2)
+
+    def test_api_delete_bumps_version(self):
+        self.assertEqual(self._count(), 1)
+        version = get_data_version()
+        transaction = Transaction.objects.get()
+        response = self.client.delete(reverse('transaction-detail', args=[transaction.pk]))
+        self.assertEqual(response.status_code, 204)
+        self.assertGreater(get_data_version(), version)
+        self.assertEqual(self._count(), 0)
+
+
+class AnalyticsSnapshotTests(AccountingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        snapshot_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(snapshot_dir.cleanup)
+        settings_override = override_settings(ANALYTICS_SNAPSHOT_DIR=snapshot_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        analytics._loaded = None
+        run_import(make_csv([('2025-07-20 13:45:11', '스타벅스 강남점', 0, 5500),
+                             ('2025-07-21 09:00:00', '급여 입금', 3000000, 0)]))
+
+    def _total(self, metric):
+        return analytics.pivot('type', 'month', metric=metric)['values']
+
+    def test_amount_metrics_are_split_by_type(self):
+        self.assertEqual(self._total('net'), [[3000000], [-5500]])
+        self.assertEqual(self._total('income'), [[3000000], [0]])
+        self.assertEqual(self._total('expense'), [[0], [5500]])
+        self.assertEqual(self._total('count'), [[1], [1]])
+        top = analytics.top_n('type', metric='expense')['items']
+        self.assertEqual(top, [{'label': 'expense', 'value': 5500}])
+
+    def test_refresh_appends_new_rows_in_place(self):
+        version = analytics.get_snapshot().meta['version']
+        run_import(make_csv([('2025-08-01 10:00:00', '이디야 커피', 0, 4000)], opening_balance=3994500))
+        Transaction.objects.filter(description='급여 입금').update(category_id='cat_101', updated_at=timezone.now())
+
+        snapshot = analytics.refresh_snapshot()
+        self.assertEqual(snapshot.meta['version'], version)
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual(
+            list(snapshot.columns['transaction_id']),
+            list(Transaction.objects.order_by('transaction_id').values_list('transaction_id', flat=True))
+        )
+        self.assertEqual(analytics.pivot('category', 'type', category='cat_101')['values'][0], [3000000, 0])
+        self.assertEqual(self._total('expense'), [[0, 0], [5500, 4000]])
+
+    def test_delete_rebuilds_snapshot(self):
+        version = analytics.get_snapshot().meta['version']
+        Transaction.objects.get(description='급여 입금').delete()
+        snapshot = analytics.refresh_snapshot()
+        self.assertNotEqual(snapshot.meta['version'], version)
+        self.assertEqual(len(snapshot), 1)
+
+    def test_unchanged_data_version_skips_refresh(self):
+        refreshed_at = analytics.get_snapshot().meta['refreshed_at']
+        with CaptureQueriesContext(connection) as queries:
+            snapshot = analytics.refresh_snapshot()
+        self.assertEqual(snapshot.meta['refreshed_at'], refreshed_at)
+        self.assertFalse([query for query in queries.captured_queries if 'transactions' in query['sql']])
+
+    def test_change_committed_after_previous_refresh_started_is_picked_up(self):
+        # 이전 갱신 시작 전에 updated_at이 기록되었지만 갱신 이후에 커밋된 변경
+        snapshot = analytics.get_snapshot()
+        stamped = datetime.fromisoformat(snapshot.meta['refreshed_at']) - timedelta(minutes=5)
+        Transaction.objects.filter(description='급여 입금').update(category_id='cat_101', updated_at=stamped)
+        bump_data_version()
+
+        snapshot = analytics.refresh_snapshot()
+        self.assertEqual(analytics.pivot('category', 'type', category='cat_101')['values'][0], [3000000, 0])
+
+    def test_row_committed_out_of_id_order_rebuilds_snapshot(self):
+        first, second = Transaction.objects.order_by('transaction_id')
+        Transaction.objects.filter(pk=second.pk).update(transaction_id=second.pk + 10)
+        version = analytics.get_snapshot().meta['version']
+
+        # 더 작은 ID를 먼저 받았지만 스냅샷 갱신 이후에 커밋된 거래
+        late = Transaction.objects.get(pk=first.pk)
+        late.pk = first.pk + 1
+        late.fingerprint = None
+        Transaction.objects.bulk_create([late])
+        bump_data_version()
+
+        snapshot = analytics.refresh_snapshot()
+        self.assertNotEqual(snapshot.meta['version'], version)
+        self.assertEqual(list(snapshot.columns['transaction_id']), [first.pk, first.pk + 1, second.pk + 10])
+
+    def test_deleting_company_rebuilds_snapshot(self):
+        # 계정과목 없이 회사만 지정된 거래 (회사 삭제 시 SET_NULL은 updated_at을 바꾸지 않음)
+        Transaction.objects.filter(description='급여 입금').update(company_id='com_2', updated_at=timezone.now())
+        bump_data_version()
+        self.assertEqual(analytics.refresh_snapshot().company_ids, ['com_2'])
+        version = analytics.get_snapshot().meta['version']
+
+        Company.objects.get(pk='com_2').delete()
+        snapshot = analytics.refresh_snapshot()
+        self.assertNotEqual(snapshot.meta['version'], version)
+        self.assertEqual(list(snapshot.columns['company']), [-1, -1])
+
+
+class ParseWindowTests(SimpleTestCase):
+
+    def test_in_flight_files_are_bounded(self):
+        submitted = []
+
+        class RecordingExecutor(statements.ProcessPoolExecutor):
+            def submit(self, fn, path, *args):
+                submitted.append(path)
+                return super().submit(fn, path, *args)
+
+        with tempfile.TemporaryDirectory() as directory, tempfile.TemporaryDirectory() as spill_dir:
+            paths = write_statements(directory, 8)
+            with mock.patch.object(statements, 'ProcessPoolExecutor', RecordingExecutor):
+                parsed = statements._iter_parsed(paths, 2, spill_dir)
+                spilled, _, _ = next(parsed)[0]
+                # 작업 프로세스 2개: 처음 4개 + 첫 결과를 받은 뒤 1개
+                self.assertEqual(len(submitted), 5)
+                self.assertEqual(len(list(statements._load_spilled(spilled))), 1)
+                results = [spilled] + [result[0][0] for result in parsed]
+            self.assertEqual(submitted, paths)
+            self.assertEqual(len(results), 8)
+            self.assertEqual(len(os.listdir(spill_dir)), 7)
+
+
+class KeywordInvalidationTests(AccountingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        run_import(make_csv([('2025-07-20 13:45:11', '편의점 GS25 역삼', 0, 3000),
+                             ('2025-07-20 14:00:00', '이디야 커피', 0, 4000)]))
+        classify_transactions()
+
+    def _add_keyword(self, keyword):
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            ClassificationKeyword.objects.create(category=Category.objects.get(pk='cat_204'), keyword=keyword)
+        return ' '.join(query['sql'] for query in queries.captured_queries)
+
+    def test_new_keyword_invalidates_matching_memos_through_index(self):
+        self.assertTrue(DescriptionMemo.objects.filter(description='편의점 GS25 역삼', keyword__isnull=True).exists())
+        sql = self._add_keyword('GS25')
+
+        self.assertTrue(fts_available(table=MEMO_FTS_TABLE))
+        self.assertIn(MEMO_FTS_TABLE, sql)
+        self.assertEqual(Transaction.objects.get(description='편의점 GS25 역삼').category_id, 'cat_204')
+        self.assertEqual(DescriptionMemo.objects.get(description='편의점 GS25 역삼').keyword.keyword, 'GS25')
+        self.assertIsNone(Transaction.objects.get(description='이디야 커피').category_id)
+
+    def test_index_does_not_depend_on_memo_rowid(self):
+        # VACUUM 등으로 문자열 기본 키 테이블의 암시적 rowid가 다시 매겨져도 같은 메모를 찾아야 함
+        with connection.cursor() as cursor:
+            cursor.execute('UPDATE description_memos SET rowid = rowid + 1000')
+        self._add_keyword('GS25')
+        self.assertEqual(DescriptionMemo.objects.get(description='편의점 GS25 역삼').keyword.keyword, 'GS25')
+        self.assertEqual(Transaction.objects.get(description='편의점 GS25 역삼').category_id, 'cat_204')
+
+    def test_index_follows_memo_deletes(self):
+        DescriptionMemo.objects.filter(description='이디야 커피').delete()
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT description_hash, description FROM {MEMO_FTS_TABLE} ORDER BY description')
+            indexed = cursor.fetchall()
+        self.assertEqual(indexed, list(DescriptionMemo.objects.order_by('description')
+                                       .values_list('description_hash', 'description')))
+
+    def test_short_keyword_falls_back_to_like(self):
+        sql = self._add_keyword('역삼')
+        self.assertNotIn(MEMO_FTS_TABLE, sql)
+        self.assertEqual(Transaction.objects.get(description='편의점 GS25 역삼').category_id, 'cat_204')
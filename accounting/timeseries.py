@@ -0,0 +1,161 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db.models import Count, F, Max, Min, Q, Sum, Window
+from django.db.models.functions import RowNumber, TruncDay, TruncMonth, TruncQuarter, TruncWeek, TruncYear
+from django.utils import timezone
+
+from .models import Company, Category, Transaction
+from .filters import _local_day_start, filter_transactions, parse_date_param
+
+BUCKETS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+    'quarter': TruncQuarter,
+    'year': TruncYear,
+}
+GROUP_FIELDS = {
+    'company': ('company_id', Company, 'company_name'),
+    'category': ('category_id', Category, 'category_name'),
+}
+
+
+def bucket_start(day, bucket):
+    """날짜가 속한 버킷의 시작일"""
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    if bucket == 'quarter':
+        return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+    if bucket == 'year':
+        return day.replace(month=1, day=1)
+    return day
+
+
+def next_bucket(start, bucket):
+    if bucket == 'day':
+        return start + timedelta(days=1)
+    if bucket == 'week':
+        return start + timedelta(days=7)
+    months = {'month': 1, 'quarter': 3, 'year': 12}[bucket]
+    month_index = start.year * 12 + start.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def bucket_range(date_from, date_to, bucket):
+    """기간 안의 모든 버킷 시작일 (빈 버킷도 포함)"""
+    periods = []
+    current = bucket_start(date_from, bucket)
+    while current <= date_to:
+        periods.append(current)
+        current = next_bucket(current, bucket)
+    return periods
+
+
+def _period_key(value):
+    return value.date() if hasattr(value, 'date') else value
+
+
+def cash_flow_series(params, bucket='month', group_by=None):
+    """버킷별 입금/출금/순현금흐름과 누적 순액, 기간 말 잔액(거래후잔액) 계산
+
+    버킷 집계는 GROUP BY 한 번, 기간 말 잔액은 ROW_NUMBER() 윈도 함수 한 번으로 조회하며
+    버킷 수는 CASHFLOW_MAX_BUCKETS로 제한하여 응답 시간을 일정하게 유지합니다.
+    """
+    tz = timezone.get_current_timezone()
+    trunc = BUCKETS[bucket]
+    date_from = parse_date_param(params, 'date_from')
+    date_to = parse_date_param(params, 'date_to')
+    queryset = filter_transactions(Transaction.objects.all(), params)
+    
+    # 기간이 없으면 원장의 처음/마지막 거래일 사용
+    if date_from is None or date_to is None:
+        bounds = queryset.aggregate(first=Min('transaction_date'), last=Max('transaction_date'))
+        if bounds['first'] is None:
+            return {'bucket': bucket, 'date_from': None, 'date_to': None, 'opening_balance': None, 'series': []}
+        date_from = date_from or timezone.localtime(bounds['first'], tz).date()
+        date_to = date_to or timezone.localtime(bounds['last'], tz).date()
+    
+    if date_from > date_to:
+        raise ValueError('date_from은 date_to보다 이후일 수 없습니다.')
+    periods = bucket_range(date_from, date_to, bucket)
+    max_buckets = getattr(settings, 'CASHFLOW_MAX_BUCKETS', 2000)
+    if len(periods) > max_buckets:
+        raise ValueError(f'버킷 수({len(periods)})가 최대값({max_buckets})을 넘습니다. 기간을 줄이거나 더 큰 버킷을 사용하세요.')
+    
+    # 버킷(및 그룹)별 입금/출금 합계
+    group_fields = [GROUP_FIELDS[group_by][0]] if group_by else []
+    flows = queryset.annotate(period=trunc('transaction_date', tzinfo=tz)).values('period', *group_fields).annotate(
+        income=Sum('amount', filter=Q(transaction_type='income')),
+        expense=Sum('amount', filter=Q(transaction_type='expense')),
+        transaction_count=Count('transaction_id')
+    ).order_by()
+    
+    # 버킷별 마지막 거래의 거래후잔액 (계좌 전체 기준, 입출금 합계와 같은 기간 date_from부터)
+    # 첫 버킷의 date_from 이전 거래는 기초 잔액(opening)으로 이어짐
+    closing = Transaction.objects.filter(
+        transaction_date__gte=_local_day_start(date_from),
+        transaction_date__lt=_local_day_start(date_to + timedelta(days=1))
+    ).annotate(
+        period=trunc('transaction_date', tzinfo=tz),
+        position=Window(
+            RowNumber(),
+            partition_by=[trunc('transaction_date', tzinfo=tz)],
+            order_by=[F('transaction_date').desc(), F('transaction_id').desc()]
+        )
+    ).filter(position=1).values_list('period', 'balance_after')
+    closing_balances = {_period_key(period): balance for period, balance in closing}
+    
+    # 기간 시작 전 마지막 잔액
+    opening = Transaction.objects.filter(
+        transaction_date__lt=_local_day_start(date_from)
+    ).order_by('-transaction_date', '-transaction_id').values_list('balance_after', flat=True).first()
+    
+    # 그룹 없이 조회하면 거래가 없는 기간도 0으로 채운 전체 계열 하나를 반환
+    series = {} if group_by else {None: {}}
+    for row in flows:
+        key = row[group_fields[0]] if group_fields else None
+        series.setdefault(key, {})[_period_key(row['period'])] = row
+    
+    names = {}
+    if group_by:
+        _, model, name_field = GROUP_FIELDS[group_by]
+        names = dict(model.objects.filter(pk__in=[key for key in series if key]).values_list('pk', name_field))
+    
+    result = []
+    for key in sorted(series, key=lambda value: (value is None, value or '')):
+        cumulative = 0
+        balance = opening
+        points = []
+        for period in periods:
+            row = series[key].get(period, {})
+            income = int(row.get('income') or 0)
+            expense = int(row.get('expense') or 0)
+            cumulative += income - expense
+            point = {
+                'period': period.isoformat(),
+                'income': income,
+                'expense': expense,
+                'net': income - expense,
+                'transaction_count': row.get('transaction_count', 0),
+                'cumulative_net': cumulative,
+            }
+            if not group_by:
+                balance = closing_balances.get(period, balance)
+                point['closing_balance'] = int(balance) if balance is not None else None
+            points.append(point)
+        result.append({
+            'key': key,
+            'name': names.get(key, '미분류') if group_by else '전체',
+            'points': points,
+        })
+    
+    return {
+        'bucket': bucket,
+        'date_from': date_from.isoformat(),
+        'date_to': date_to.isoformat(),
+        'opening_balance': int(opening) if opening is not None else None,
+        'series': result,
+    }
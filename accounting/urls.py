@@ -18,4 +18,14 @@ urlpatterns = [
     path('api/', include(router.urls)),
     path('api/summary/', views.api_summary, name='api_summary'),
     path('api/process/', views.api_process_accounting, name='api_process'),
+    path('api/export/', views.export_transactions, name='api_export'),
+    path('api/imports/', views.api_enqueue_import, name='api_import_jobs'),
+    path('api/analytics/pivot/', views.api_analytics_pivot, name='api_analytics_pivot'),
+    path('api/analytics/top/', views.api_analytics_top, name='api_analytics_top'),
+    path('api/cashflow/', views.api_cashflow, name='api_cashflow'),
+    path('api/cache/stats/', views.api_cache_stats, name='api_cache_stats'),
+    path('api/throughput/', views.api_throughput, name='api_throughput'),
+    
+    # 운영 지표 (Prometheus 수집용)
+    path('metrics', views.metrics, name='metrics'),
 ] 
\ No newline at end of file
@@ -0,0 +1,29 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import ChangeCounter
+
+# 분류 규칙(키워드/계정과목) 버전: 다른 프로세스의 키워드 매처/적요 LRU 무효화 기준
+RULES_VERSION = 'classification_rules'
+# 장부 데이터(거래/회사/계정과목/집계) 버전: 요약 캐시 키에 포함
+DATA_VERSION = 'ledger_data'
+# 거래/회사/계정과목 삭제 횟수: 분석 스냅샷 증분 갱신 가능 여부 (삭제가 있으면 전체 재생성)
+DELETES_VERSION = 'ledger_deletes'
+
+
+def get_version(name):
+    """카운터 현재 값 (행이 없으면 0)"""
+    value = ChangeCounter.objects.filter(name=name).values_list('value', flat=True).first()
+    return value or 0
+
+
+def bump_version(name):
+    """카운터 1 증가 (현재 트랜잭션과 함께 커밋되므로 변경 내용과 버전이 항상 같이 보임)"""
+    if ChangeCounter.objects.filter(name=name).update(value=F('value') + 1):
+        return
+    try:
+        with transaction.atomic():
+            ChangeCounter.objects.create(name=name, value=1)
+    except IntegrityError:
+        # 동시에 다른 프로세스가 먼저 만든 경우
+        ChangeCounter.objects.filter(name=name).update(value=F('value') + 1)
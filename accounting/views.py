@@ -1,22 +1,39 @@
+import logging
+from django.db import transaction
 from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.db.models import Sum
 from django.contrib import messages
 from django.urls import reverse
 from rest_framework import viewsets, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import api_view, action
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 import pandas as pd
-from django.utils import timezone
-from datetime import datetime
 
 from .models import Company, Category, ClassificationKeyword, Transaction, ProcessingLog
 from .serializers import (
     CompanySerializer, CategorySerializer, ClassificationKeywordSerializer,
-    TransactionSerializer, ProcessingLogSerializer, SummarySerializer
+    TransactionSerializer, ProcessingLogSerializer, SummarySerializer,
+    transaction_list_values, serialize_transaction_values
 )
 from .forms import TransactionUploadForm
+from .classifier import classify_transactions
+from .summary import build_summary
+from .cache import cache_stats, get_or_build
+from .importer import IMPORT_MODES, iter_csv_chunks, import_transactions
+from .jobs import enqueue_import
+from .filters import filter_transactions, parse_date_param
+from .pagination import TransactionKeysetPagination
+from .exports import EXPORT_FORMATS, create_export_log, stream_export
+from . import analytics
+from .timeseries import BUCKETS, GROUP_FIELDS, cash_flow_series
+from .metrics import request_metrics
+from .profiling import PipelineProfiler, throughput_trends
+from .renderers import FastJSONRenderer
+
+logger = logging.getLogger(__name__)
 
 def index(request):
     """홈 페이지"""
@@ -24,63 +41,19 @@ def index(request):
 
 def dashboard(request):
     """대시보드 페이지 (서버 사이드 렌더링)"""
-    # 전체 요약
-    total_transactions = Transaction.objects.count()
-    total_income = Transaction.objects.filter(transaction_type='income').aggregate(
-        total=Sum('amount')
-    )['total'] or 0
-    total_expense = Transaction.objects.filter(transaction_type='expense').aggregate(
-        total=Sum('amount')
-    )['total'] or 0
-    
-    # 회사별 요약
-    companies_summary = []
-    for company in Company.objects.all():
-        company_transactions = Transaction.objects.filter(company=company)
-        company_income = company_transactions.filter(transaction_type='income').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        company_expense = company_transactions.filter(transaction_type='expense').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        
-        companies_summary.append({
-            'company_name': company.company_name,
-            'transaction_count': company_transactions.count(),
-            'income': int(company_income),
-            'expense': int(company_expense),
-            'net': int(company_income - company_expense)
-        })
-    
-    # 계정과목별 요약
-    categories_summary = []
-    for category in Category.objects.all():
-        category_transactions = Transaction.objects.filter(category=category)
-        category_income = category_transactions.filter(transaction_type='income').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        category_expense = category_transactions.filter(transaction_type='expense').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        
-        categories_summary.append({
-            'category_name': category.category_name,
-            'transaction_count': category_transactions.count(),
-            'income': int(category_income),
-            'expense': int(category_expense),
-            'net': int(category_income - category_expense)
-        })
+    # 전체/회사별/계정과목별 요약 (데이터 버전 기반 캐시)
+    summary = get_or_build('summary', build_summary)
     
     # 거래 내역 (최근 20건)
     transactions = Transaction.objects.select_related('company', 'category').order_by('-transaction_date')[:20]
     
     context = {
-        'total_transactions': total_transactions,
-        'total_income': int(total_income),
-        'total_expense': int(total_expense),
-        'net_profit': int(total_income - total_expense),
-        'companies_summary': companies_summary,
-        'categories_summary': categories_summary,
+        'total_transactions': summary['total_transactions'],
+        'total_income': summary['total_income'],
+        'total_expense': summary['total_expense'],
+        'net_profit': summary['net_profit'],
+        'companies_summary': summary['companies'],
+        'categories_summary': summary['categories'],
         'transactions': transactions,
     }
     
@@ -99,6 +72,12 @@ def upload_file(request):
             try:
                 file = form.cleaned_data['file']
                 
+                # 백그라운드 처리: 파일 저장 후 작업 등록만 하고 바로 응답
+                if form.cleaned_data['run_async']:
+                    job = enqueue_import(file, form.cleaned_data['import_mode'])
+                    messages.info(request, f'가져오기 작업 {job.job_id}번이 등록되었습니다. 처리 로그 {job.log_id}번에서 진행 상황을 확인하세요.')
+                    return redirect('dashboard')
+                
                 # 처리 로그 시작
                 log = ProcessingLog.objects.create(
                     process_type='import',
@@ -106,68 +85,26 @@ def upload_file(request):
                     records_processed=0
                 )
                 
-                # CSV 파일 읽기
-                df = pd.read_csv(file)
-                print(f"[DEBUG] CSV 파일 읽기 완료: {len(df)}행")
-                
-                success_count = 0
-                failed_count = 0
-                
-                # 기존 거래 내역 삭제 (중복 방지)
-                existing_count = Transaction.objects.count()
-                print(f"[DEBUG] 기존 거래 내역 삭제 전: {existing_count}건")
-                Transaction.objects.all().delete()
-                print(f"[DEBUG] 기존 거래 내역 삭제 완료")
-                
-                for index, row in df.iterrows():
-                    try:
-                        # 거래 유형 결정
-                        if row['입금액'] > 0:
-                            transaction_type = 'income'
-                            amount = row['입금액']
-                        else:
-                            transaction_type = 'expense'
-                            amount = row['출금액']
-                        
-                        # 날짜 파싱
-                        date_str = row['거래일시']
-                        parsed_date = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-                        aware_date = timezone.make_aware(parsed_date, timezone=timezone.get_current_timezone())
-                        
-                        # 거래 내역 생성
-                        transaction = Transaction.objects.create(
-                            transaction_date=aware_date,
-                            description=row['적요'],
-                            income_amount=row['입금액'],
-                            expense_amount=row['출금액'],
-                            balance_after=row['거래후잔액'],
-                            branch_name=row['거래점'],
-                            transaction_type=transaction_type,
-                            amount=amount,
-                            is_classified=False
-                        )
-                        success_count += 1
-                        
-                    except Exception as e:
-                        print(f"[DEBUG] 행 {index} 처리 실패: {e}")
-                        failed_count += 1
-                
-                # 로그 업데이트
-                log.records_processed = len(df)
-                log.records_successful = success_count
-                log.records_failed = failed_count
-                log.save()
-                
-                print(f"[DEBUG] CSV 처리 완료: 성공 {success_count}건, 실패 {failed_count}건")
-                
-                # 자동 분류 실행
-                print(f"[DEBUG] 자동 분류 시작")
-                classify_transactions()
-                
-                final_count = Transaction.objects.count()
-                print(f"[DEBUG] 최종 거래 건수: {final_count}건")
+                profiler = PipelineProfiler()
+                with profiler.track():
+                    # CSV 파일을 청크 단위로 읽어 일괄 저장 (기본: 중복 거래는 건너뜀)
+                    import_transactions(
+                        iter_csv_chunks(file), log, mode=form.cleaned_data['import_mode'], profiler=profiler
+                    )
+                    success_count = log.records_successful
+                    failed_count = log.records_failed
+                    skipped_count = log.records_skipped
+                    
+                    logger.info("CSV 처리 완료: 성공 %d건, 실패 %d건, 중복 %d건", success_count, failed_count, skipped_count)
+                    
+                    # 자동 분류 실행 (소요 시간은 가져오기 로그의 classify 단계로 기록)
+                    with profiler.stage('classify'):
+                        classify_transactions()
+                profiler.save(log)
                 
-                messages.success(request, f'파일 업로드 완료: 성공 {success_count}건, 실패 {failed_count}건')
+                messages.success(request, f'파일 업로드 완료: 성공 {success_count}건, 실패 {failed_count}건, 중복 건너뜀 {skipped_count}건')
+                if log.records_flagged:
+                    messages.warning(request, f'거래후잔액 연속성 오류 {log.records_flagged}건이 있습니다. 처리 로그 {log.log_id}번에서 확인하세요.')
                 return redirect('dashboard')
                 
             except Exception as e:
@@ -180,114 +117,33 @@ def upload_file(request):
                     messages.error(request, f'{field}: {error}')
             return redirect('upload_file')
 
-def classify_transactions():
-    """거래 내역 자동 분류"""
-    try:
-        # 미분류 거래 조회
-        unclassified_transactions = Transaction.objects.filter(is_classified=False)
-        print(f"[DEBUG] 분류 시작: 미분류 거래 {unclassified_transactions.count()}건")
-        
-        # 처리 로그 시작
-        log = ProcessingLog.objects.create(
-            process_type='classification',
-            records_processed=unclassified_transactions.count()
-        )
-        
-        success_count = 0
-        failed_count = 0
-        
-        for transaction in unclassified_transactions:
-            try:
-                # 키워드 매칭으로 분류
-                keywords = ClassificationKeyword.objects.select_related('category', 'category__company')
-                
-                for keyword_obj in keywords:
-                    print(f"[DEBUG] 키워드 매칭 시도: '{keyword_obj.keyword}' in '{transaction.description}'")
-                    if keyword_obj.keyword in transaction.description:
-                        print(f"[DEBUG] 매칭 성공: {keyword_obj.keyword} -> {keyword_obj.category.company.company_name} - {keyword_obj.category.category_name}")
-                        # 업데이트만 수행 (새 레코드 생성 방지)
-                        Transaction.objects.filter(transaction_id=transaction.transaction_id).update(
-                            company=keyword_obj.category.company,
-                            category=keyword_obj.category,
-                            is_classified=True
-                        )
-                        success_count += 1
-                        break
-                else:
-                    print(f"[DEBUG] 매칭 실패: '{transaction.description}' - 키워드 없음")
-                    failed_count += 1
-                    
-            except Exception as e:
-                failed_count += 1
-        
-        # 로그 업데이트
-        log.records_successful = success_count
-        log.records_failed = failed_count
-        log.save()
-        
-        print(f"[DEBUG] 분류 완료: 성공 {success_count}건, 실패 {failed_count}건")
-        print(f"[DEBUG] 분류 후 총 거래 건수: {Transaction.objects.count()}건")
-        
-    except Exception as e:
-        print(f"[DEBUG] 분류 오류: {e}")
-
 @api_view(['GET'])
 def api_summary(request):
     """요약 정보 API"""
     try:
-        # 전체 요약
-        total_transactions = Transaction.objects.count()
-        total_income = Transaction.objects.filter(transaction_type='income').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        total_expense = Transaction.objects.filter(transaction_type='expense').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        
-        # 회사별 요약
-        companies_summary = []
-        for company in Company.objects.all():
-            company_transactions = Transaction.objects.filter(company=company)
-            company_income = company_transactions.filter(transaction_type='income').aggregate(
-                total=Sum('amount')
-            )['total'] or 0
-            company_expense = company_transactions.filter(transaction_type='expense').aggregate(
-                total=Sum('amount')
-            )['total'] or 0
-            
-            companies_summary.append({
-                'company_name': company.company_name,
-                'transaction_count': company_transactions.count(),
-                'income': int(company_income),
-                'expense': int(company_expense),
-                'net': int(company_income - company_expense)
-            })
+        # 조회 기간 (선택) 및 집계 원천 (rollup: 집계 테이블, ledger: 거래 내역 원본)
+        try:
+            date_from = parse_date_param(request.query_params, 'date_from')
+            date_to = parse_date_param(request.query_params, 'date_to')
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        source = request.query_params.get('source')
+        use_rollups = {'rollup': True, 'ledger': False}.get(source)
         
-        # 계정과목별 요약
-        categories_summary = []
-        for category in Category.objects.all():
-            category_transactions = Transaction.objects.filter(category=category)
-            category_income = category_transactions.filter(transaction_type='income').aggregate(
-                total=Sum('amount')
-            )['total'] or 0
-            category_expense = category_transactions.filter(transaction_type='expense').aggregate(
-                total=Sum('amount')
-            )['total'] or 0
-            
-            categories_summary.append({
-                'category_name': category.category_name,
-                'transaction_count': category_transactions.count(),
-                'income': int(category_income),
-                'expense': int(category_expense),
-                'net': int(category_income - category_expense)
-            })
+        # 전체/회사별/계정과목별 요약
+        summary = get_or_build(
+            'summary', build_summary, date_from=date_from, date_to=date_to, use_rollups=use_rollups
+        )
         
         summary_data = {
-            'total_transactions': total_transactions,
-            'total_income': int(total_income),
-            'total_expense': int(total_expense),
-            'companies': companies_summary,
-            'categories': categories_summary
+            'total_transactions': summary['total_transactions'],
+            'total_income': summary['total_income'],
+            'total_expense': summary['total_expense'],
+            'companies': summary['companies'],
+            'categories': summary['categories']
         }
         
         return Response({
@@ -301,6 +157,173 @@ def api_summary(request):
             'message': f'요약 정보 조회 오류: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def export_transactions(request):
+    """거래 내역 내보내기 (CSV / JSON Lines 스트리밍)
+
+    ?format=csv|jsonl 과 거래 목록 API와 같은 필터(date_from, date_to, company, category 등)를 지원합니다.
+    """
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse({
+            'success': False,
+            'message': f'지원하지 않는 형식입니다: {export_format} (csv, jsonl)'
+        }, status=400)
+    
+    try:
+        queryset = filter_transactions(Transaction.objects.all(), request.GET)
+    except ValueError as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        }, status=400)
+    
+    log = create_export_log(export_format)
+    response = StreamingHttpResponse(
+        stream_export(queryset, export_format, log),
+        content_type=EXPORT_FORMATS[export_format][0]
+    )
+    response['Content-Disposition'] = f'attachment; filename="{log.file_name}"'
+    return response
+
+@api_view(['POST'])
+def api_enqueue_import(request):
+    """비동기 가져오기 작업 등록 API (진행 상황은 /api/logs/{log_id}/ 에서 조회)"""
+    form = TransactionUploadForm(request.POST, request.FILES)
+    if not form.is_valid():
+        return Response({
+            'success': False,
+            'message': '파일 업로드 오류',
+            'errors': form.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    job = enqueue_import(form.cleaned_data['file'], form.cleaned_data['import_mode'])
+    return Response({
+        'success': True,
+        'job_id': job.job_id,
+        'log_id': job.log_id,
+        'status_url': reverse('processinglog-detail', args=[job.log_id])
+    }, status=status.HTTP_202_ACCEPTED)
+
+def _analytics_params(params):
+    """분석 API 공통 파라미터 검증"""
+    metric = params.get('metric', 'net')
+    if metric not in analytics.METRICS:
+        raise ValueError(f"metric 값은 {', '.join(analytics.METRICS)} 중 하나여야 합니다: {metric}")
+    transaction_type = params.get('transaction_type') or None
+    if transaction_type and transaction_type not in analytics.TYPE_CODES:
+        raise ValueError(f'transaction_type 값은 income 또는 expense 이어야 합니다: {transaction_type}')
+    return {
+        'metric': metric,
+        'date_from': parse_date_param(params, 'date_from'),
+        'date_to': parse_date_param(params, 'date_to'),
+        'company': params.get('company') or None,
+        'category': params.get('category') or None,
+        'transaction_type': transaction_type,
+    }
+
+def _analytics_dimension(params, name, default):
+    dimension = params.get(name, default)
+    if dimension not in analytics.DIMENSIONS:
+        raise ValueError(f"{name} 값은 {', '.join(analytics.DIMENSIONS)} 중 하나여야 합니다: {dimension}")
+    return dimension
+
+@api_view(['GET'])
+def api_analytics_pivot(request):
+    """회사 × 계정과목 × 월 등 피벗 API (컬럼형 스냅샷 기반)"""
+    try:
+        params = _analytics_params(request.query_params)
+        rows = _analytics_dimension(request.query_params, 'rows', 'company')
+        columns = _analytics_dimension(request.query_params, 'columns', 'month')
+    except ValueError as e:
+        return Response({
+            'success': False,
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'success': True,
+        'data': analytics.pivot(rows, columns, **params)
+    })
+
+@api_view(['GET'])
+def api_analytics_top(request):
+    """차원별 상위 N개 API (컬럼형 스냅샷 기반)"""
+    try:
+        params = _analytics_params(request.query_params)
+        by = _analytics_dimension(request.query_params, 'by', 'category')
+        n = int(request.query_params.get('n', 10))
+    except ValueError as e:
+        return Response({
+            'success': False,
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'success': True,
+        'data': analytics.top_n(by, n=max(1, n), **params)
+    })
+
+@api_view(['GET'])
+def api_cashflow(request):
+    """기간별 현금흐름 시계열 API (일/주/월/분기/연 버킷, 누적 순액 및 기간 말 잔액)"""
+    bucket = request.query_params.get('bucket', 'month')
+    group_by = request.query_params.get('group_by') or None
+    params = {
+        name: request.query_params.get(name)
+        for name in ('date_from', 'date_to', 'company', 'category')
+        if request.query_params.get(name)
+    }
+    try:
+        if bucket not in BUCKETS:
+            raise ValueError(f"bucket 값은 {', '.join(BUCKETS)} 중 하나여야 합니다: {bucket}")
+        if group_by and group_by not in GROUP_FIELDS:
+            raise ValueError(f'group_by 값은 company 또는 category 이어야 합니다: {group_by}')
+        data = get_or_build('cashflow', cash_flow_series, params=params, bucket=bucket, group_by=group_by)
+    except ValueError as e:
+        return Response({
+            'success': False,
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'success': True,
+        'data': data
+    })
+
+@api_view(['GET'])
+def api_throughput(request):
+    """최근 처리 로그의 처리량(행/초)·단계별 시간 추이 API (성능 회귀 확인용)"""
+    process_type = request.query_params.get('process_type', 'import')
+    try:
+        if process_type not in dict(ProcessingLog.PROCESS_TYPES):
+            raise ValueError(f"process_type 값은 {', '.join(dict(ProcessingLog.PROCESS_TYPES))} 중 하나여야 합니다: {process_type}")
+        limit = int(request.query_params.get('limit', 50))
+    except ValueError as e:
+        return Response({
+            'success': False,
+            'message': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'success': True,
+        'data': throughput_trends(process_type, limit=min(max(1, limit), 500))
+    })
+
+@api_view(['GET'])
+def api_cache_stats(request):
+    """요약 캐시 적중률 API"""
+    return Response({
+        'success': True,
+        'data': cache_stats()
+    })
+
+def metrics(request):
+    """요청 처리 시간/SQL 지표 (Prometheus 텍스트 형식)"""
+    return HttpResponse(
+        request_metrics.render_prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
 @api_view(['POST'])
 def api_process_accounting(request):
     """회계 처리 API"""
@@ -308,6 +331,13 @@ def api_process_accounting(request):
         data = request.data
         
         if 'csv_data' in data:
+            import_mode = data.get('import_mode', 'incremental')
+            if import_mode not in dict(IMPORT_MODES):
+                return Response({
+                    'success': False,
+                    'message': f'지원하지 않는 가져오기 방식입니다: {import_mode}'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
             # CSV 데이터를 임시 파일로 저장
             df = pd.DataFrame(data['csv_data'])
             
@@ -318,52 +348,19 @@ def api_process_accounting(request):
                 records_processed=len(df)
             )
             
-            success_count = 0
-            failed_count = 0
-            
-            for _, row in df.iterrows():
-                try:
-                    # 거래 유형 결정
-                    if row['입금액'] > 0:
-                        transaction_type = 'income'
-                        amount = row['입금액']
-                    else:
-                        transaction_type = 'expense'
-                        amount = row['출금액']
-                    
-                    # 날짜 파싱
-                    date_str = row['거래일시']
-                    parsed_date = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-                    aware_date = timezone.make_aware(parsed_date, timezone=timezone.get_current_timezone())
-                    
-                    # 거래 내역 생성
-                    transaction = Transaction.objects.create(
-                        transaction_date=aware_date,
-                        description=row['적요'],
-                        income_amount=row['입금액'],
-                        expense_amount=row['출금액'],
-                        balance_after=row['거래후잔액'],
-                        branch_name=row['거래점'],
-                        transaction_type=transaction_type,
-                        amount=amount,
-                        is_classified=False
-                    )
-                    success_count += 1
-                    
-                except Exception as e:
-                    failed_count += 1
-            
-            # 로그 업데이트
-            log.records_successful = success_count
-            log.records_failed = failed_count
-            log.save()
+            # 공통 정규화 단계를 거쳐 일괄 저장
+            import_transactions([df], log, mode=import_mode)
+            success_count = log.records_successful
+            failed_count = log.records_failed
+            skipped_count = log.records_skipped
             
             # 자동 분류 실행
             classify_transactions()
             
             return Response({
                 'success': True,
-                'message': f'회계 처리 완료: 성공 {success_count}건, 실패 {failed_count}건'
+                'message': f'회계 처리 완료: 성공 {success_count}건, 실패 {failed_count}건, 중복 건너뜀 {skipped_count}건',
+                'balance_warnings': log.records_flagged
             })
         
         return Response({
@@ -390,16 +387,57 @@ class CategoryViewSet(viewsets.ModelViewSet):
     serializer_class = CategorySerializer
 
 class TransactionViewSet(viewsets.ModelViewSet):
-    queryset = Transaction.objects.all()
+    queryset = Transaction.objects.select_related('company', 'category')
     serializer_class = TransactionSerializer
+    pagination_class = TransactionKeysetPagination
+    # 목록 응답이 커서 orjson 렌더러 사용 (설치되어 있지 않으면 기본 JSONRenderer와 동일)
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    
+    def _list_response(self, queryset):
+        """목록 빠른 경로: JOIN된 값만 조회하여 응답 dict를 직접 구성"""
+        page = self.paginate_queryset(transaction_list_values(queryset))
+        return self.get_paginated_response(serialize_transaction_values(page))
+    
+    def list(self, request, *args, **kwargs):
+        return self._list_response(self.filter_queryset(self.get_queryset()))
+    
+    def filter_queryset(self, queryset):
+        """기간(date_from, date_to), company, category, transaction_type, is_classified, 적요 검색(q) 필터"""
+        try:
+            return filter_transactions(super().filter_queryset(queryset), self.request.query_params)
+        except ValueError as e:
+            raise ValidationError({'detail': str(e)})
+    
+    # 저장/삭제와 집계 반영(Transaction 신호)을 한 트랜잭션으로 묶음
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            super().perform_create(serializer)
+    
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            super().perform_update(serializer)
+    
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            super().perform_destroy(instance)
     
     @action(detail=False, methods=['get'])
     def unclassified(self, request):
-        """미분류 거래 조회"""
-        unclassified = Transaction.objects.filter(is_classified=False)
-        serializer = self.get_serializer(unclassified, many=True)
-        return Response(serializer.data)
+        """미분류 거래 조회 (페이지네이션 적용)"""
+        unclassified = self.filter_queryset(self.get_queryset()).filter(is_classified=False)
+        return self._list_response(unclassified)
 
 class ProcessingLogViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = ProcessingLog.objects.all()
     serializer_class = ProcessingLogSerializer
+    
+    def get_queryset(self):
+        """처리 유형/상태로 필터링 (최신순)"""
+        queryset = ProcessingLog.objects.order_by('-log_id')
+        process_type = self.request.query_params.get('process_type')
+        if process_type:
+            queryset = queryset.filter(process_type=process_type)
+        log_status = self.request.query_params.get('status')
+        if log_status:
+            queryset = queryset.filter(status=log_status)
+        return queryset
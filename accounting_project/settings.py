@@ -45,6 +45,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # 요청별 처리 시간/SQL 측정 (가장 바깥에서 전체 처리 시간 측정)
+    'accounting.middleware.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -79,13 +81,58 @@ WSGI_APPLICATION = 'accounting_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# 데이터베이스 프로필 (DJANGO_DB_PROFILE: development(기본), production)
+# production: WAL 저널, 연결 재사용, 잠금 대기 시간 설정으로 가져오기 중에도 읽기 요청이 멈추지 않음
+DB_PROFILE = os.environ.get('DJANGO_DB_PROFILE', 'development')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('DJANGO_SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        # 테스트 DB도 파일로 생성 (병렬 분류 테스트의 작업 프로세스가 같은 DB를 읽도록)
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
+# 연결 생성 시 적용할 SQLite PRAGMA (accounting.signals.configure_sqlite_connection)
+SQLITE_PRAGMAS = {}
+
+if DB_PROFILE == 'production':
+    SQLITE_BUSY_TIMEOUT = float(os.environ.get('DJANGO_SQLITE_TIMEOUT', 20))
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # 쓰기 잠금 대기 시간 (초)
+            'timeout': SQLITE_BUSY_TIMEOUT,
+        },
+    })
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': int(os.environ.get('DJANGO_SQLITE_CACHE_KB', 65536)) * -1,
+        'mmap_size': int(os.environ.get('DJANGO_SQLITE_MMAP_MB', 256)) * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': int(SQLITE_BUSY_TIMEOUT * 1000),
+    }
+
+# 데이터베이스 엔진 (DJANGO_DB_ENGINE: sqlite(기본), postgresql)
+DB_ENGINE = os.environ.get('DJANGO_DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'accounting'),
+            'USER': os.environ.get('POSTGRES_USER', 'accounting'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', '127.0.0.1'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -135,6 +182,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # 거래 내역 목록 등 응답이 큰 뷰는 renderer_classes로 accounting.renderers.FastJSONRenderer(orjson) 선택
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
@@ -144,3 +192,115 @@ REST_FRAMEWORK = {
 # CORS 설정
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
+
+# 거래 내역 가져오기 설정
+IMPORT_CHUNK_SIZE = 5000
+IMPORT_BATCH_SIZE = 500
+IMPORT_MAX_ERROR_DETAILS = 1000
+# 가져오기 중 거래후잔액 연속성 검사 (python manage.py check_balances로 원장 전체 검사)
+IMPORT_CHECK_BALANCES = True
+# PostgreSQL에서는 COPY FROM STDIN -> 임시 테이블 -> INSERT ... SELECT 로 저장
+IMPORT_USE_COPY = True
+# SQLite에서는 컬럼 단위로 값 변환 후 executemany로 저장 (False면 bulk_create)
+IMPORT_USE_EXECUTEMANY = True
+# 여러 파일 가져오기 파싱 작업 프로세스 수 (python manage.py import_statements)
+IMPORT_PARSE_WORKERS = 4
+# 처리 로그에 tracemalloc 기준 실행 구간 최대 메모리 기록 (추적 비용이 있어 기본값은 상주 메모리 샘플링만 기록)
+IMPORT_TRACE_MEMORY = False
+# 실행 구간 최대 상주 메모리 샘플링 간격 (초)
+IMPORT_RSS_SAMPLE_INTERVAL = 0.05
+
+# 비동기 가져오기 작업 설정 (python manage.py run_import_worker)
+IMPORT_UPLOAD_DIR = os.path.join(BASE_DIR, 'media', 'imports')
+IMPORT_WORKER_POLL_INTERVAL = 2.0
+# 하트비트가 이 시간(초) 동안 없으면 작업자가 비정상 종료된 것으로 보고 다시 대기열로 (최대 시도 횟수 초과 시 실패)
+IMPORT_JOB_LEASE_SECONDS = 600
+IMPORT_JOB_MAX_ATTEMPTS = 3
+
+# 내보내기 설정 (서버 측 커서 조회 단위)
+EXPORT_CHUNK_SIZE = 2000
+
+# 분석 스냅샷 저장 위치 (python manage.py refresh_snapshot)
+ANALYTICS_SNAPSHOT_DIR = os.path.join(BASE_DIR, 'media', 'analytics')
+# 증분 갱신 시 이전 갱신 시각보다 앞당겨 다시 읽는 시간(초): 가장 긴 쓰기 트랜잭션보다 길게
+ANALYTICS_SNAPSHOT_SAFETY_MARGIN = 600
+
+# 현금흐름 시계열 API 최대 버킷 수 (요청당 응답 시간 상한)
+CASHFLOW_MAX_BUCKETS = 2000
+
+# 자동 분류 설정
+CLASSIFICATION_BATCH_SIZE = 500
+# 병렬 분류 작업 프로세스 수와 거래 ID 범위 크기 (python manage.py classify_transactions --workers 8)
+CLASSIFICATION_WORKERS = 1
+CLASSIFICATION_SHARD_SIZE = 50000
+# 적요 분류 메모 프로세스 내 LRU 크기 (영구 메모는 description_memos 테이블)
+CLASSIFICATION_MEMO_LRU_SIZE = 100000
+# 키워드/계정과목 변경 시 영향받는 거래만 자동 재분류
+CLASSIFICATION_RECLASSIFY_ON_CHANGE = True
+
+# 캐시 설정 (DJANGO_CACHE_BACKEND: locmem(기본), file, redis)
+# 요약 캐시 키의 데이터 버전은 DB(change_counters)에 있으므로 프로세스별 캐시에서도 다른 프로세스의 변경이 반영됨
+CACHE_BACKEND = os.environ.get('DJANGO_CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+            'TIMEOUT': 300,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': (
+                'django.core.cache.backends.filebased.FileBasedCache'
+                if CACHE_BACKEND == 'file'
+                else 'django.core.cache.backends.locmem.LocMemCache'
+            ),
+            'LOCATION': os.path.join(BASE_DIR, '.cache') if CACHE_BACKEND == 'file' else 'accounting',
+            'TIMEOUT': 300,
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000,
+                'CULL_FREQUENCY': 3,
+            },
+        }
+    }
+
+# 요약 정보 캐시 유효 시간 (초)
+SUMMARY_CACHE_TIMEOUT = 300
+
+# 요약 정보 설정 (True: 일별/월별 집계 테이블 사용, False: 거래 내역 원본 직접 집계)
+SUMMARY_USE_ROLLUPS = True
+
+# 느린 요청 경고 기준 (초, accounting.middleware.PerformanceMiddleware)
+SLOW_REQUEST_THRESHOLD = float(os.environ.get('DJANGO_SLOW_REQUEST_THRESHOLD', 1.0))
+
+# 로깅 설정 (DJANGO_LOG_LEVEL: DEBUG/INFO/WARNING, DJANGO_LOG_FORMAT: text/json)
+LOG_LEVEL = os.environ.get('DJANGO_LOG_LEVEL', 'INFO')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'text': {
+            'format': '%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+        },
+        'json': {
+            '()': 'accounting.log_format.JSONFormatter',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'json' if os.environ.get('DJANGO_LOG_FORMAT') == 'json' else 'text',
+        },
+    },
+    'loggers': {
+        'accounting': {
+            'handlers': ['console'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
+    },
+}